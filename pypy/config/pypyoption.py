@@ -186,6 +186,12 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
               cmdline="--soabi",
               default=None),
 
+    StrOption("frozenmodules",
+              "Comma-separated list of stdlib modules compiled at "
+              "translation time",
+              cmdline="--frozen-modules",
+              default=None),
+
     BoolOption("honor__builtins__",
                "Honor the __builtins__ key of a module dictionary",
                default=False),
@@ -227,10 +233,21 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
                    "use specialised tuples",
                    default=False),
 
+        BoolOption("withstrbuf", "use strings optimized for addition (ver 2)",
+                   default=False),
+
         BoolOption("withliststrategies",
                    "enable optimized ways to store lists of primitives ",
                    default=True),
 
+        BoolOption("withsmalldicts",
+                   "store dicts with few string keys in a flat list",
+                   default=False),
+
+        BoolOption("withunboxedattributes",
+                   "store int and float instance attributes unboxed",
+                   default=False),
+
         BoolOption("withmethodcachecounter",
                    "try to cache methods and provide a counter in __pypy__. "
                    "for testing purposes only.",
@@ -281,6 +298,7 @@ def set_pypy_opt_level(config, level):
     if level == 'mem':
         config.objspace.std.suggest(withprebuiltint=True)
         config.objspace.std.suggest(withliststrategies=True)
+        config.objspace.std.suggest(withsmalldicts=True)
         if not IS_64_BITS:
             config.objspace.std.suggest(withsmalllong=True)
 
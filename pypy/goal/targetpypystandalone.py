@@ -374,6 +374,12 @@ class PyPyTarget(object):
     def get_entry_point(self, config):
         self.space = make_objspace(config)
 
+        if config.objspace.frozenmodules:
+            from pypy.module.imp.importing import freeze_modules
+            freeze_modules(self.space,
+                           config.objspace.frozenmodules.split(','),
+                           os.path.dirname(pypydir))
+
         # manually imports app_main.py
         filename = os.path.join(pypydir, 'interpreter', 'app_main.py')
         app = gateway.applevel(open(filename).read(), 'app_main.py', 'app_main')
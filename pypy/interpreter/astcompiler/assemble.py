@@ -310,6 +310,93 @@ class PythonCodeMaker(ast.ASTVisitor):
             self.lineno = lineno
             self.lineno_set = False
 
+    def _thread_jumps(self, blocks):
+        """Retarget the jumps whose target is another jump.
+
+        An unconditional jump going to an unconditional jump can go
+        directly to the final target.  So can a conditional jump going to
+        a JUMP_FORWARD, but not to a JUMP_ABSOLUTE: the backward jumps must
+        stay JUMP_ABSOLUTEs, because that is where the JIT looks for loops
+        (and conversely, a forward jump must not become a JUMP_ABSOLUTE).
+        A JUMP_IF_*_OR_POP going to a jump on the same condition that pops
+        or keeps its argument can be replaced by that jump.
+        """
+        for block in blocks:
+            for instr in block.instructions:
+                if not instr.has_jump:
+                    continue
+                target, absolute = instr.jump
+                # a chain of jumps longer than the number of blocks
+                # has to be an infinite loop: leave it alone
+                for i in range(len(blocks)):
+                    # skip empty blocks, they are not in the bytecode
+                    while not target.instructions and target.next_block:
+                        target = target.next_block
+                    if not target.instructions:
+                        break
+                    op = instr.opcode
+                    target_instr = target.instructions[0]
+                    target_op = target_instr.opcode
+                    if op == ops.JUMP_ABSOLUTE or op == ops.JUMP_FORWARD:
+                        if target_op == ops.JUMP_ABSOLUTE:
+                            instr.opcode = ops.JUMP_ABSOLUTE
+                            target = target_instr.jump[0]
+                            absolute = True
+                            continue
+                        if (op == ops.JUMP_FORWARD and
+                                target_op == ops.JUMP_FORWARD):
+                            target = target_instr.jump[0]
+                            continue
+                    elif (op == ops.POP_JUMP_IF_FALSE or
+                            op == ops.POP_JUMP_IF_TRUE or
+                            op == ops.JUMP_IF_FALSE_OR_POP or
+                            op == ops.JUMP_IF_TRUE_OR_POP):
+                        if target_op == ops.JUMP_FORWARD:
+                            target = target_instr.jump[0]
+                            continue
+                    if op == ops.JUMP_IF_FALSE_OR_POP:
+                        if target_op == ops.JUMP_IF_FALSE_OR_POP:
+                            target = target_instr.jump[0]
+                            continue
+                        if target_op == ops.POP_JUMP_IF_FALSE:
+                            instr.opcode = target_op
+                            target = target_instr.jump[0]
+                            continue
+                    elif op == ops.JUMP_IF_TRUE_OR_POP:
+                        if target_op == ops.JUMP_IF_TRUE_OR_POP:
+                            target = target_instr.jump[0]
+                            continue
+                        if target_op == ops.POP_JUMP_IF_TRUE:
+                            instr.opcode = target_op
+                            target = target_instr.jump[0]
+                            continue
+                    break
+                instr.jump = (target, absolute)
+
+    def _remove_unreachable_blocks(self, blocks):
+        """Return the blocks that can still be reached.  After threading,
+        the jumps that all the other jumps now skip are often left dead.
+        """
+        reachable = {}
+        pending = [blocks[0]]
+        while pending:
+            block = pending.pop()
+            if block in reachable:
+                continue
+            reachable[block] = None
+            for instr in block.instructions:
+                if instr.has_jump:
+                    pending.append(instr.jump[0])
+            if block.instructions:
+                last_op = block.instructions[-1].opcode
+                if (last_op == ops.JUMP_ABSOLUTE or
+                        last_op == ops.JUMP_FORWARD or
+                        last_op == ops.RETURN_VALUE):
+                    continue
+            if block.next_block is not None:
+                pending.append(block.next_block)
+        return [block for block in blocks if block in reachable]
+
     def _resolve_block_targets(self, blocks):
         """Compute the arguments of jump instructions."""
         last_extended_arg_count = 0
@@ -333,16 +420,10 @@ class PythonCodeMaker(ast.ASTVisitor):
                     if instr.has_jump:
                         target, absolute = instr.jump
                         op = instr.opcode
-                        # Optimize an unconditional jump going to another
-                        # unconditional jump.
                         if op == ops.JUMP_ABSOLUTE or op == ops.JUMP_FORWARD:
                             if target.instructions:
                                 target_op = target.instructions[0].opcode
-                                if target_op == ops.JUMP_ABSOLUTE:
-                                    target = target.instructions[0].jump[0]
-                                    instr.opcode = ops.JUMP_ABSOLUTE
-                                    absolute = True
-                                elif target_op == ops.RETURN_VALUE:
+                                if target_op == ops.RETURN_VALUE:
                                     # Replace JUMP_* to a RETURN into
                                     # just a RETURN
                                     instr.opcode = ops.RETURN_VALUE
@@ -506,6 +587,8 @@ class PythonCodeMaker(ast.ASTVisitor):
             else:
                 self.first_lineno = 1
         blocks = self.first_block.post_order()
+        self._thread_jumps(blocks)
+        blocks = self._remove_unreachable_blocks(blocks)
         self._resolve_block_targets(blocks)
         lnotab = self._build_lnotab(blocks)
         stack_depth = self._stacksize(blocks)
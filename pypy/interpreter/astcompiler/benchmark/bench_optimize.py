@@ -0,0 +1,81 @@
+""" Benchmark for the AST optimizer and the jump threading of the
+assembler.  Reports the size of the bytecode produced for a directory of
+modules (by default the standard library), then times a few functions
+that the optimizations apply to.  Run it with two pypy-c to compare them,
+and with --jit off to time the interpreter alone:
+
+    pypy-c [--jit off] bench_optimize.py [directory]
+"""
+
+import os, sys, time, types
+
+def iter_code_objects(code):
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            for subcode in iter_code_objects(const):
+                yield subcode
+
+def bytecode_size(directory):
+    num_files = num_codes = size = 0
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if not filename.endswith('.py'):
+                continue
+            path = os.path.join(dirpath, filename)
+            with open(path) as f:
+                source = f.read()
+            try:
+                code = compile(source, path, 'exec')
+            except SyntaxError:
+                continue     # test data, python 3 files...
+            num_files += 1
+            for subcode in iter_code_objects(code):
+                num_codes += 1
+                size += len(subcode.co_code)
+    return num_files, num_codes, size
+
+# ____________________________________________________________
+
+def nested_conditions(n):
+    total = 0
+    for i in xrange(n):
+        if i & 1:
+            if i & 2:
+                total += 1
+            else:
+                total += 2
+        x = (i & 4 or i & 8) or i & 16
+        total += x
+    return total
+
+def membership(n):
+    total = 0
+    for i in xrange(n):
+        if i % 7 in [1, 2, 3]:
+            total += 1
+        total += 1 if 2 > 1 else 0
+    return total
+
+def timeit(func, n, runs):
+    best = None
+    for i in range(runs):
+        t0 = time.time()
+        func(n)
+        t = time.time() - t0
+        if best is None or t < best:
+            best = t
+    return best
+
+def main(directory=None, n=1000000, runs=5):
+    if directory is None:
+        directory = os.path.dirname(os.__file__)
+    num_files, num_codes, size = bytecode_size(directory)
+    print 'bytecode: %d bytes in %d code objects (%d files in %s)' % (
+        size, num_codes, num_files, directory)
+    for func in [nested_conditions, membership]:
+        print '%-20s %.3f s' % (func.__name__, timeit(func, n, runs))
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -853,8 +853,7 @@ class PythonCodeGenerator(assemble.PythonCodeMaker):
             if i < (ops_count - 1):
                 comp.comparators[i].walkabout(self)
         last_op, last_comparator = comp.ops[-1], comp.comparators[-1]
-        if not self._optimize_comparator(last_op, last_comparator):
-            last_comparator.walkabout(self)
+        last_comparator.walkabout(self)
         self.emit_op_arg(ops.COMPARE_OP, compare_operations(last_op))
         if ops_count > 1:
             end = self.new_block()
@@ -864,37 +863,6 @@ class PythonCodeGenerator(assemble.PythonCodeMaker):
             self.emit_op(ops.POP_TOP)
             self.use_next_block(end)
 
-    def _optimize_comparator(self, op, node):
-        """Fold lists/sets of constants in the context of "in"/"not in".
-
-        lists are folded into tuples, sets into frozensets, otherwise
-        returns False
-        """
-        if op in (ast.In, ast.NotIn):
-            is_list = isinstance(node, ast.List)
-            if is_list or isinstance(node, ast.Set):
-                w_const = self._tuple_of_consts(node.elts)
-                if w_const is not None:
-                    if not is_list:
-                        from pypy.objspace.std.setobject import (
-                            W_FrozensetObject)
-                        w_const = W_FrozensetObject(self.space, w_const)
-                    self.load_const(w_const)
-                    return True
-        return False
-
-    def _tuple_of_consts(self, elts):
-        """Return a tuple of consts from elts if possible, or None"""
-        count = len(elts) if elts is not None else 0
-        consts_w = [None] * count
-        for i in range(count):
-            w_value = elts[i].as_constant()
-            if w_value is None:
-                # Not all constants
-                return None
-            consts_w[i] = w_value
-        return self.space.newtuple(consts_w)
-
     def visit_IfExp(self, ifexp):
         self.update_position(ifexp.lineno)
         end = self.new_block()
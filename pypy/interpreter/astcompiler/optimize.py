@@ -159,6 +159,55 @@ opposite_compare_operations = misc.dict_to_switch({
 })
 
 
+def _is_simple_constant(space, w_obj):
+    """Return True if comparing w_obj with another simple constant cannot
+    have side-effects, so that the comparison can be done at compile time.
+    """
+    if space.is_w(w_obj, space.w_None):
+        return True
+    w_type = space.type(w_obj)
+    if (space.is_w(w_type, space.w_int) or
+            space.is_w(w_type, space.w_long) or
+            space.is_w(w_type, space.w_bool) or
+            space.is_w(w_type, space.w_float) or
+            space.is_w(w_type, space.w_bytes)):
+        return True
+    if (space.is_w(w_type, space.w_tuple) or
+            space.is_w(w_type, space.w_frozenset)):
+        for w_item in space.unpackiterable(w_obj):
+            if not _is_simple_constant(space, w_item):
+                return False
+        return True
+    return False
+
+def _fold_compare(space, op, w_left, w_right):
+    if op == ast.Eq:
+        return space.eq(w_left, w_right)
+    elif op == ast.NotEq:
+        return space.ne(w_left, w_right)
+    elif op == ast.Lt:
+        return space.lt(w_left, w_right)
+    elif op == ast.LtE:
+        return space.le(w_left, w_right)
+    elif op == ast.Gt:
+        return space.gt(w_left, w_right)
+    elif op == ast.GtE:
+        return space.ge(w_left, w_right)
+    elif op == ast.In:
+        return space.contains(w_right, w_left)
+    elif op == ast.NotIn:
+        return space.newbool(not space.is_true(
+            space.contains(w_right, w_left)))
+    # 'is' and 'is not' depend on which constants end up being shared;
+    # only 'None' is guaranteed to be a singleton
+    if space.is_w(w_right, space.w_None):
+        if op == ast.Is:
+            return space.newbool(space.is_w(w_left, w_right))
+        elif op == ast.IsNot:
+            return space.newbool(not space.is_w(w_left, w_right))
+    return None
+
+
 class OptimizingVisitor(ast.ASTVisitor):
     """Constant folds AST."""
 
@@ -274,6 +323,68 @@ class OptimizingVisitor(ast.ASTVisitor):
                                  name.col_offset)
         return name
 
+    def visit_IfExp(self, ifexp):
+        truth = ifexp.test.as_constant_truth(self.space)
+        if truth == CONST_TRUE:
+            return ifexp.body
+        elif truth == CONST_FALSE:
+            return ifexp.orelse
+        return ifexp
+
+    def visit_Compare(self, comp):
+        space = self.space
+        # Fold lists and sets of constants on the right of "in"/"not in":
+        # lists are folded into tuples, sets into frozensets.  Tuples are
+        # already constants, but cannot become frozensets: unlike tuples,
+        # frozensets need the item to be hashable.
+        for i in range(len(comp.ops)):
+            op = comp.ops[i]
+            if op == ast.In or op == ast.NotIn:
+                node = comp.comparators[i]
+                is_list = isinstance(node, ast.List)
+                if is_list or isinstance(node, ast.Set):
+                    w_const = self._tuple_of_consts(node.elts)
+                    if w_const is not None:
+                        if not is_list:
+                            from pypy.objspace.std.setobject import (
+                                W_FrozensetObject)
+                            w_const = W_FrozensetObject(space, w_const)
+                        comp.comparators[i] = ast.Const(w_const, node.lineno,
+                                                        node.col_offset)
+        # Fold the comparison itself if all the operands are constants
+        w_left = comp.left.as_constant()
+        if w_left is None or not _is_simple_constant(space, w_left):
+            return comp
+        w_result = None
+        for i in range(len(comp.ops)):
+            w_right = comp.comparators[i].as_constant()
+            if w_right is None or not _is_simple_constant(space, w_right):
+                return comp
+            try:
+                w_result = _fold_compare(space, comp.ops[i], w_left, w_right)
+            except OperationError:
+                return comp
+            if w_result is None:
+                return comp
+            if not space.is_true(w_result):
+                # a chained comparison stops at the first false result:
+                # the remaining operands are not evaluated
+                break
+            w_left = w_right
+        return ast.Const(w_result, comp.lineno, comp.col_offset)
+
+    def _tuple_of_consts(self, elts):
+        """Return a tuple of consts from elts if possible, or None"""
+        count = len(elts) if elts is not None else 0
+        consts_w = [None] * count
+        for i in range(count):
+            w_value = elts[i].as_constant()
+            if w_value is None:
+                # Not all constants
+                return None
+            consts_w[i] = w_value
+        return self.space.newtuple(consts_w)
+
     def visit_Tuple(self, tup):
         """Try to turn tuple building into a constant."""
         if tup.elts:
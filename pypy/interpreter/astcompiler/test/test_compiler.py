@@ -24,6 +24,8 @@ def generate_function_code(expr, space):
     generator = codegen.FunctionCodeGenerator(
         space, 'function', function_ast, 1, symbols, info)
     blocks = generator.first_block.post_order()
+    generator._thread_jumps(blocks)
+    blocks = generator._remove_unreachable_blocks(blocks)
     generator._resolve_block_targets(blocks)
     return generator, blocks
 
@@ -1033,6 +1035,50 @@ class AppTestCompiler:
             expected_length = 2
         assert len(d['u']) == expected_length
 
+    def test_local_constants_settrace(self):
+        import sys
+        def f():
+            N = 3
+            return N
+        def trace(frame, event, arg):
+            if event == 'line' and frame.f_code is f.__code__:
+                if frame.f_lineno == f.__code__.co_firstlineno + 2:
+                    frame.f_locals['N'] = 4
+            return trace
+        sys.settrace(trace)
+        try:
+            res = f()
+        finally:
+            sys.settrace(None)
+        assert res == 4
+
+    def test_constant_compare(self):
+        assert ('a' in ('a', 'b')) is True
+        assert (1 > 2 < undefined_name) is False
+        assert (1 < 2 <= 2) is True
+        assert (3 not in {1, 2}) is True
+        assert (1 if 0 else 2) == 2
+
+    def test_threaded_jumps(self):
+        def f(a, b, c):
+            return (a or b) or c, (a and b) and c
+        assert f(0, 0, 0) == (0, 0)
+        assert f(0, 2, 3) == (2, 0)
+        assert f(1, 0, 3) == (1, 0)
+        assert f(1, 2, 3) == (1, 3)
+        def g(a, b):
+            result = []
+            while a:
+                if b:
+                    if a > 2:
+                        result.append(a)
+                    else:
+                        result.append(-a)
+                a -= 1
+            return result
+        assert g(4, 1) == [4, 3, -2, -1]
+        assert g(4, 0) == []
+
 
 class TestOptimizations:
     def count_instructions(self, source):
@@ -1207,3 +1253,113 @@ class TestOptimizations:
             source = 'def f(): %s' % source
             counts = self.count_instructions(source)
             assert ops.BINARY_POWER not in counts
+
+    def test_fold_constant_ifexp(self):
+        source = """def f(x):
+            return x if 0 else -x
+        """
+        counts = self.count_instructions(source)
+        assert counts == {ops.LOAD_FAST: 1, ops.UNARY_NEGATIVE: 1,
+                          ops.RETURN_VALUE: 1}
+
+    def test_fold_constant_compare(self):
+        for source in (
+            "'a' in ('a', 'b')",
+            "3 not in {1, 2}",
+            "1 < 2 <= 2.5",
+            "(1, 2) == (1, 2)",
+            "None is None",
+            "1 is not None",
+            "1 > 2 < x",          # 'x' is never evaluated
+            ):
+            source = 'def f(): return %s' % source
+            counts = self.count_instructions(source)
+            assert counts == {ops.LOAD_CONST: 1, ops.RETURN_VALUE: 1}
+
+    def test_dont_fold_compare(self):
+        for source in (
+            "x in ('a', 'b')",
+            "1 < 2 < x",
+            "u'a' == 'a'",
+            "(1, 2) is (1, 2)",
+            "1 < (2, 1j)",
+            ):
+            source = 'def f(): return %s' % source
+            counts = self.count_instructions(source)
+            assert ops.COMPARE_OP in counts
+
+    def test_fold_constants_in_chained_compare(self):
+        source = "def f(a, b): return a in [1, 2] in b"
+        counts = self.count_instructions(source)
+        assert ops.BUILD_LIST not in counts
+
+    def test_dont_propagate_local_constants(self):
+        # a tracer can change the locals through frame.f_locals, so the
+        # loads must stay
+        source = """def f(x):
+            N = 3
+            return x + N
+        """
+        counts = self.count_instructions(source)
+        assert counts[ops.LOAD_FAST] == 2
+
+    def check_jumps_threaded(self, source):
+        code, blocks = generate_function_code(source, self.space)
+        for block in blocks:
+            for instr in block.instructions:
+                if instr.has_jump:
+                    target = instr.jump[0]
+                    while not target.instructions:
+                        target = target.next_block
+                    assert target.instructions[0].opcode != ops.JUMP_FORWARD
+        return blocks
+
+    def test_thread_jumps(self):
+        source = """def f(a, b, c):
+            if a:
+                if b:
+                    c = 1
+                else:
+                    c = 2
+            return c
+        """
+        self.check_jumps_threaded(source)
+        # the jump at the end of the outer 'if' is now dead
+        source = """def f(a, b, c):
+            if a:
+                if b:
+                    c = 1
+            return c
+        """
+        self.check_jumps_threaded(source)
+        counts = self.count_instructions(source)
+        assert counts[ops.JUMP_FORWARD] == 1
+
+    def test_thread_jump_if_or_pop(self):
+        source = """def f(a, b, c):
+            return (a or b) or c
+        """
+        blocks = self.check_jumps_threaded(source)
+        for block in blocks:
+            for instr in block.instructions:
+                if instr.opcode == ops.JUMP_IF_TRUE_OR_POP:
+                    target = instr.jump[0]
+                    assert target.instructions[0].opcode == ops.RETURN_VALUE
+
+    def test_dont_thread_jumps_to_loop_start(self):
+        # the JIT needs to see the JUMP_ABSOLUTE going back to the loop
+        source = """def f(x, y):
+            while x:
+                if y:
+                    x -= 1
+            return x
+        """
+        blocks = self.check_jumps_threaded(source)
+        target_ops = []
+        for block in blocks:
+            for instr in block.instructions:
+                if instr.opcode == ops.POP_JUMP_IF_FALSE:
+                    target = instr.jump[0]
+                    target_ops.append(target.instructions[0].opcode)
+        assert sorted(target_ops) == sorted([ops.POP_BLOCK,
+                                             ops.JUMP_ABSOLUTE])
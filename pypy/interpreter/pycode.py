@@ -57,16 +57,18 @@ class CodeHookCache(object):
 class PyCode(eval.Code):
     "CPython-style code objects."
     _immutable_fields_ = ["_signature", "co_argcount", "co_cellvars[*]",
-                          "co_code", "co_consts_w[*]", "co_filename",
+                          "co_code", "co_consts_w?[*]", "co_filename",
                           "co_firstlineno", "co_flags", "co_freevars[*]",
                           "co_lnotab", "co_names_w[*]", "co_nlocals",
                           "co_stacksize", "co_varnames[*]",
-                          "_args_as_cellvars[*]", "w_globals?"]
+                          "_args_as_cellvars[*]", "w_globals?",
+                          "_lazy_consts?"]
 
     def __init__(self, space,  argcount, nlocals, stacksize, flags,
                      code, consts, names, varnames, filename,
                      name, firstlineno, lnotab, freevars, cellvars,
-                     hidden_applevel=False, magic=default_magic):
+                     hidden_applevel=False, magic=default_magic,
+                     lazy_consts=None):
         """Initialize a new code object from parameters given by
         the pypy compiler"""
         self.space = space
@@ -92,6 +94,9 @@ class PyCode(eval.Code):
         self.w_globals = None
         self.hidden_applevel = hidden_applevel
         self.magic = magic
+        # if not None, 'consts' is empty and the real constants are still
+        # in marshalled form: see load_lazy_consts()
+        self._lazy_consts = lazy_consts
         self._signature = cpython_code_signature(self)
         self._initialize()
         self._init_ready()
@@ -105,6 +110,29 @@ class PyCode(eval.Code):
             return False
         return True
 
+    def load_lazy_consts(self):
+        """Unmarshal the constants of a code object that was loaded from
+        a .pyc file, if not done yet.  Called before the code object is
+        executed, and before anything else reads co_consts_w."""
+        if self._lazy_consts is not None:
+            self._load_lazy_consts()
+
+    @jit.dont_look_inside
+    def _load_lazy_consts(self):
+        space = self.space
+        lazy_consts = self._lazy_consts
+        self.co_consts_w = lazy_consts.load(space)
+        self._lazy_consts = None
+        if self.co_filename != lazy_consts.filename:
+            # renamed by update_code_filenames(): rename the nested code
+            # objects too
+            for w_co in self.co_consts_w:
+                if (isinstance(w_co, PyCode) and
+                        w_co.co_filename == lazy_consts.filename):
+                    w_co.co_filename = self.co_filename
+        if lazy_consts.remove_docstrings:
+            self.remove_docstrings(space)
+
     def new_code_hook(self):
         code_hook = self.space.fromcache(CodeHookCache)._code_hook
         if code_hook is not None:
@@ -252,6 +280,7 @@ class PyCode(eval.Code):
         return self.co_varnames
 
     def getdocstring(self, space):
+        self.load_lazy_consts()
         if self.co_consts_w:   # it is probably never empty
             w_first = self.co_consts_w[0]
             if space.isinstance_w(w_first, space.w_basestring):
@@ -259,6 +288,9 @@ class PyCode(eval.Code):
         return space.w_None
 
     def remove_docstrings(self, space):
+        if self._lazy_consts is not None:
+            self._lazy_consts.remove_docstrings = True
+            return
         if self.co_flags & CO_KILL_DOCSTRING:
             self.co_consts_w[0] = space.w_None
         for w_co in self.co_consts_w:
@@ -267,6 +299,7 @@ class PyCode(eval.Code):
 
     def _to_code(self):
         """For debugging only."""
+        self.load_lazy_consts()
         consts = [None] * len(self.co_consts_w)
         num = 0
         for w in self.co_consts_w:
@@ -303,6 +336,7 @@ class PyCode(eval.Code):
         dis.dis(co)
 
     def fget_co_consts(self, space):
+        self.load_lazy_consts()
         return space.newtuple(self.co_consts_w)
 
     def fget_co_names(self, space):
@@ -321,6 +355,8 @@ class PyCode(eval.Code):
         space = self.space
         if not isinstance(w_other, PyCode):
             return space.w_False
+        self.load_lazy_consts()
+        w_other.load_lazy_consts()
         areEqual = (self.co_name == w_other.co_name and
                     self.co_argcount == w_other.co_argcount and
                     self.co_nlocals == w_other.co_nlocals and
@@ -347,6 +383,7 @@ class PyCode(eval.Code):
 
     def descr_code__hash__(self):
         space = self.space
+        self.load_lazy_consts()
         result =  compute_hash(self.co_name)
         result ^= self.co_argcount
         result ^= self.co_nlocals
@@ -402,6 +439,7 @@ class PyCode(eval.Code):
         w_mod    = space.getbuiltinmodule('_pickle_support')
         mod      = space.interp_w(MixedModule, w_mod)
         new_inst = mod.get('code_new')
+        self.load_lazy_consts()
         tup      = [
             space.newint(self.co_argcount),
             space.newint(self.co_nlocals),
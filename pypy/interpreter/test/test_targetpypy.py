@@ -8,6 +8,17 @@ class TestTargetPyPy(object):
         entry_point = get_entry_point(config)[0]
         entry_point(['pypy-c' , '-S', '-c', 'print 3'])
 
+    def test_frozen_modules(self):
+        from pypy.module.imp.importing import FrozenModules
+        config = get_pypy_config(translating=False)
+        config.objspace.frozenmodules = 'UserDict,encodings'
+        entry_point = get_entry_point(config)[0]
+        space = get_entry_point.im_self.space
+        frozen = space.fromcache(FrozenModules).modules
+        assert sorted(frozen) == ['UserDict', 'encodings']
+        res = entry_point(['pypy-c' , '-S', '-c', 'import UserDict'])
+        assert res == 0
+
 def test_execute_source(space):
     _, d = create_entry_point(space, None)
     execute_source = d['pypy_execute_source']
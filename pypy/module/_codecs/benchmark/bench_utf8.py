@@ -0,0 +1,60 @@
+""" Throughput and memory benchmark for str.decode('utf-8') and
+unicode.encode('utf-8') on pure ASCII, mostly ASCII and non-ASCII text.
+Every case runs in a fresh interpreter, so that the reported maximum
+resident set size belongs to it alone.  The numbers are a baseline for
+a utf-8 based unicode object, see "Optimized Unicode Representation" in
+pypy/doc/project-ideas.rst.
+
+    pypy-c bench_utf8.py [size_in_kb [repeat]]
+"""
+
+import sys, subprocess
+
+TEXTS = {
+    'ascii': "u'hello world, ' * (size // 13)",
+    'mostly-ascii': "(u'hello world, ' * (size // 26)) + u'\\xe9' + "
+                    "(u'hello world, ' * (size // 26))",
+    'non-ascii': "u'\\u043f\\u0440\\u0438\\u0432\\u0435\\u0442 ' * "
+                 "(size // 13)",
+}
+
+SCRIPT = """
+import resource, time
+size = %(size)d
+u = %(text)s
+s = u.encode('utf-8')
+best_decode = best_encode = None
+for i in range(%(repeat)d):
+    t0 = time.time()
+    s.decode('utf-8')
+    t1 = time.time()
+    u.encode('utf-8')
+    t2 = time.time()
+    if best_decode is None or t1 - t0 < best_decode:
+        best_decode = t1 - t0
+    if best_encode is None or t2 - t1 < best_encode:
+        best_encode = t2 - t1
+print len(s), best_decode, best_encode, \\
+      resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+"""
+
+def run_case(text, size, repeat):
+    script = SCRIPT % {'size': size, 'text': text, 'repeat': repeat}
+    output = subprocess.check_output([sys.executable, '-c', script])
+    nbytes, t_decode, t_encode, maxrss = output.split()
+    return int(nbytes), float(t_decode), float(t_encode), int(maxrss)
+
+def main(size_in_kb=4096, repeat=20):
+    size = int(size_in_kb) * 1024
+    repeat = int(repeat)
+    print '%-14s %12s %12s %12s' % ('text', 'decode MB/s', 'encode MB/s',
+                                    'max RSS kB')
+    for name in ['ascii', 'mostly-ascii', 'non-ascii']:
+        nbytes, t_decode, t_encode, maxrss = run_case(TEXTS[name], size,
+                                                      repeat)
+        mb = nbytes / (1024.0 * 1024.0)
+        print '%-14s %12.1f %12.1f %12d' % (name, mb / t_decode,
+                                            mb / t_encode, maxrss)
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
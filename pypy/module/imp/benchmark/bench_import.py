@@ -0,0 +1,75 @@
+""" Startup benchmark for the import machinery: builds a large
+application (many packages and modules) behind a long sys.path, then
+times importing all of it in a fresh interpreter.  The first run
+compiles the modules and writes the .pyc files; the next ones load them.
+
+    pypy-c bench_import.py [num_packages [num_modules [num_path_entries]]]
+"""
+
+import os, sys, shutil, subprocess, tempfile, time
+
+def make_application(root, num_packages, num_modules):
+    names = []
+    for i in range(num_packages):
+        pkgname = 'benchpkg%d' % i
+        pkgdir = os.path.join(root, 'app', pkgname)
+        os.makedirs(pkgdir)
+        with open(os.path.join(pkgdir, '__init__.py'), 'w') as f:
+            f.write('# package\n')
+        for j in range(num_modules):
+            modname = 'mod%d' % j
+            with open(os.path.join(pkgdir, modname + '.py'), 'w') as f:
+                f.write('import os, sys, re\n')
+                if j > 0:
+                    f.write('from %s import mod%d\n' % (pkgname, j - 1))
+                f.write('X = %d\n' % j)
+            names.append('%s.%s' % (pkgname, modname))
+    return names
+
+def make_path(root, num_path_entries):
+    # the application comes last, after many directories that all
+    # have to be searched in vain
+    path = []
+    for i in range(num_path_entries):
+        d = os.path.join(root, 'path%d' % i)
+        os.makedirs(d)
+        for j in range(20):
+            with open(os.path.join(d, 'unrelated%d.py' % j), 'w') as f:
+                f.write('\n')
+        path.append(d)
+    path.append(os.path.join(root, 'app'))
+    return path
+
+def age_directories(root):
+    # recently modified directories are not cached by the import machinery
+    old = time.time() - 3600
+    for dirpath, dirnames, filenames in os.walk(root):
+        os.utime(dirpath, (old, old))
+
+def run_once(names, path):
+    script = ('import sys, time\n'
+              'sys.path[:0] = %r\n'
+              't0 = time.time()\n'
+              'for name in %r:\n'
+              '    __import__(name)\n'
+              'print time.time() - t0\n' % (path, names))
+    output = subprocess.check_output([sys.executable, '-c', script])
+    return float(output)
+
+def main(num_packages=50, num_modules=40, num_path_entries=40, runs=5):
+    root = tempfile.mkdtemp(prefix='bench_import')
+    try:
+        names = make_application(root, num_packages, num_modules)
+        path = make_path(root, num_path_entries)
+        print 'importing %d modules with %d sys.path entries' % (
+            len(names), len(path))
+        age_directories(root)
+        print 'from source: %f' % (run_once(names, path),)
+        age_directories(root)     # the .pyc files were just written
+        times = [run_once(names, path) for i in range(runs)]
+        print 'from .pyc:   min: %f  max: %f' % (min(times), max(times))
+    finally:
+        shutil.rmtree(root)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
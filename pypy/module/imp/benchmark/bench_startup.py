@@ -0,0 +1,34 @@
+""" Startup time benchmark: runs 'pypy -c pass' repeatedly and reports the
+best and average wall-clock time.  With a maximum time in seconds, exits
+with status 1 if the best run is slower, for use as a regression check.
+
+    bench_startup.py path/to/pypy-c [runs [max_seconds]]
+
+Translate with --frozen-modules (see objspace.frozenmodules) to compare.
+"""
+
+import subprocess, sys, time
+
+def run_once(executable, args):
+    t0 = time.time()
+    subprocess.check_call([executable] + args)
+    return time.time() - t0
+
+def main(executable, runs=20, max_seconds=None):
+    for args in [['-S', '-c', 'pass'], ['-c', 'pass']]:
+        run_once(executable, args)     # warm up the OS caches
+        times = [run_once(executable, args) for i in range(runs)]
+        print '%-20s best: %.4fs  avg: %.4fs' % (
+            ' '.join(args), min(times), sum(times) / len(times))
+    if max_seconds is not None and min(times) > max_seconds:
+        print 'startup slower than %.4fs' % (max_seconds,)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print __doc__
+        sys.exit(2)
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    max_seconds = float(sys.argv[3]) if len(sys.argv) > 3 else None
+    sys.exit(main(sys.argv[1], runs, max_seconds))
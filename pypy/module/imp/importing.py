@@ -2,7 +2,7 @@
 Implementation of the interpreter-level default import logic.
 """
 
-import sys, os, stat
+import sys, os, stat, time
 
 from pypy.interpreter.module import Module
 from pypy.interpreter.gateway import interp2app, unwrap_spec
@@ -78,9 +78,10 @@ def has_so_extension(space):
 def has_init_module(space, filepart):
     "Return True if the directory filepart qualifies as a package."
     init = os.path.join(filepart, "__init__")
-    if path_exists(init + ".py"):
+    if may_exist(space, init + ".py") and path_exists(init + ".py"):
         return True
-    if space.config.objspace.lonepycfiles and path_exists(init + ".pyc"):
+    if (space.config.objspace.lonepycfiles and
+            may_exist(space, init + ".pyc") and path_exists(init + ".pyc")):
         return True
     return False
 
@@ -91,13 +92,13 @@ def find_modtype(space, filepart):
     """
     # check the .py file
     pyfile = filepart + ".py"
-    if file_exists(pyfile):
+    if may_exist(space, pyfile) and file_exists(pyfile):
         return PY_SOURCE, ".py", "U"
 
     # on Windows, also check for a .pyw file
     if _WIN32:
         pyfile = filepart + ".pyw"
-        if file_exists(pyfile):
+        if may_exist(space, pyfile) and file_exists(pyfile):
             return PY_SOURCE, ".pyw", "U"
 
     # The .py file does not exist.  By default on PyPy, lonepycfiles
@@ -108,14 +109,14 @@ def find_modtype(space, filepart):
     # check the .pyc file
     if space.config.objspace.lonepycfiles:
         pycfile = filepart + ".pyc"
-        if file_exists(pycfile):
+        if may_exist(space, pycfile) and file_exists(pycfile):
             # existing .pyc file
             return PY_COMPILED, ".pyc", "rb"
 
     if has_so_extension(space):
         so_extension = get_so_extension(space)
         pydfile = filepart + so_extension
-        if file_exists(pydfile):
+        if may_exist(space, pydfile) and file_exists(pydfile):
             return C_EXTENSION, so_extension, "rb"
 
     return SEARCH_ERROR, None, None
@@ -518,6 +519,89 @@ W_NullImporter.typedef = TypeDef(
     find_module=interp2app(W_NullImporter.find_module_w),
     )
 
+
+# Directories modified less than this many seconds before we list them
+# are not cached: a file could be added to them later within the same
+# mtime granularity, without the mtime changing.
+DIRCACHE_RACY_DELAY = 2.0
+
+class DirectoryListingCache(object):
+    """Per-space cache of the listings of the directories searched by
+    find_module().  An import probes several names (package directory,
+    __init__.py, .py, .pyc, .so) in every entry of sys.path; with this
+    cache, a name missing from the listing costs no stat() at all.  The
+    names present in the listing are still checked as before.
+
+    A listing stays valid as long as the mtime of its directory does not
+    change, like importlib's FileFinder.  The mtime is checked at most
+    once per directory and per find_module().  Relative directories are
+    never cached, because their meaning depends on the current directory.
+    """
+
+    def __init__(self, space):
+        self.listings = {}    # {dirname: DirectoryListing}
+        self.generation = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def get_listing(self, dirname):
+        """Return the names in 'dirname' as a dict, or None if unknown."""
+        entry = self.listings.get(dirname, None)
+        if entry is not None and entry.generation == self.generation:
+            return entry.names
+        try:
+            mtime = os.stat(dirname).st_mtime
+        except OSError:
+            return None
+        if entry is not None and entry.mtime == mtime:
+            entry.generation = self.generation
+            return entry.names
+        try:
+            names = os.listdir(dirname)
+        except OSError:
+            return None
+        listing = {}
+        for name in names:
+            listing[name] = None
+        if time.time() - mtime >= DIRCACHE_RACY_DELAY:
+            self.listings[dirname] = DirectoryListing(mtime, listing,
+                                                      self.generation)
+        elif entry is not None:
+            del self.listings[dirname]
+        return listing
+
+    def clear(self):
+        self.listings.clear()
+
+class DirectoryListing(object):
+    def __init__(self, mtime, names, generation):
+        self.mtime = mtime
+        self.names = names
+        self.generation = generation
+
+def may_exist(space, path):
+    """Quick check done before the stat()s in find_module(): return False
+    only if 'path' is known not to exist according to the listing of its
+    directory.
+    """
+    if not os.path.isabs(path):
+        return True
+    index = path.rfind(os.sep)
+    if os.altsep is not None:
+        index = max(index, path.rfind(os.altsep))
+    if index < 0:
+        return True
+    dirname = path[:index + 1]
+    name = path[index + 1:]
+    if not name:
+        return True
+    listing = space.fromcache(DirectoryListingCache).get_listing(dirname)
+    if listing is None:
+        return True
+    return name in listing
+
+
 class FindInfo:
     def __init__(self, modtype, filename, stream,
                  suffix="", filemode="", w_loader=None):
@@ -545,6 +629,7 @@ def find_module(space, modulename, w_modulename, partname, w_path,
 
     delayed_builtin = None
     w_lib_extensions = None
+    space.fromcache(DirectoryListingCache).new_search()
 
     if w_path is None:
         # check the builtin modules
@@ -576,7 +661,8 @@ def find_module(space, modulename, w_modulename, partname, w_path,
             path = space.fsencode_w(w_pathitem)
             filepart = os.path.join(path, partname)
             log_pyverbose(space, 2, "# trying %s\n" % (filepart,))
-            if os.path.isdir(filepart) and case_ok(filepart):
+            if (may_exist(space, filepart) and
+                    os.path.isdir(filepart) and case_ok(filepart)):
                 if has_init_module(space, filepart):
                     return FindInfo(PKG_DIRECTORY, filepart, None)
                 else:
@@ -657,10 +743,15 @@ def load_module(space, w_modulename, find_info, reuse=False):
 
         try:
             if find_info.modtype == PY_SOURCE:
+                fd = find_info.stream.try_to_find_file_descriptor()
+                code_w = get_frozen_code(space, space.text_w(w_modulename),
+                                         find_info.filename, fd)
+                if code_w is not None:
+                    return load_frozen_module(space, w_modulename, w_mod,
+                                              find_info.filename, code_w)
                 return load_source_module(
                     space, w_modulename, w_mod,
-                    find_info.filename, find_info.stream.readall(),
-                    find_info.stream.try_to_find_file_descriptor())
+                    find_info.filename, find_info.stream.readall(), fd)
             elif find_info.modtype == PY_COMPILED:
                 magic = _r_long(find_info.stream)
                 timestamp = _r_long(find_info.stream)
@@ -916,6 +1007,97 @@ def exec_code_module(space, w_mod, code_w, w_modulename, check_afterwards=True):
     return w_mod
 
 
+# __________________________________________________________________
+#
+# Frozen modules: bytecode compiled at translation time
+
+class FrozenModules(object):
+    """The code objects of the modules listed in the 'frozenmodules'
+    option, compiled at translation time and stored in the prebuilt heap.
+    Importing one of these modules from its usual place in the stdlib
+    then skips reading its source, and reading and unmarshalling its .pyc
+    file.  The code object is only used if the source file still has the
+    same mtime and size as when it was compiled; otherwise the import
+    proceeds as usual.
+    """
+
+    def __init__(self, space):
+        self.modules = {}    # {modulename: FrozenModule}
+
+class FrozenModule(object):
+    def __init__(self, relpath, mtime, size, code_w):
+        self.relpath = relpath    # e.g. 'lib-python/2.7/os.py'
+        self.mtime = mtime
+        self.size = size
+        self.code_w = code_w
+
+def freeze_modules(space, modulenames, prefix):
+    """Compile the given modules, which are looked up in 'lib_pypy' and
+    'lib-python' under the directory 'prefix'.  Only for translation
+    time.
+    """
+    from pypy.module.sys.version import CPYTHON_VERSION
+    dirname = '%d.%d' % (CPYTHON_VERSION[0], CPYTHON_VERSION[1])
+    libdirs = ['lib_pypy', os.path.join('lib-python', dirname)]
+    frozen = space.fromcache(FrozenModules)
+    for modulename in modulenames:
+        partpath = os.path.join(*modulename.split('.'))
+        for relpath in [os.path.join(libdir, partpath, '__init__.py')
+                        for libdir in libdirs] + \
+                       [os.path.join(libdir, partpath + '.py')
+                        for libdir in libdirs]:
+            pathname = os.path.join(prefix, relpath)
+            if os.path.isfile(pathname):
+                break
+        else:
+            raise ValueError("frozen module %r not found in %s" %
+                             (modulename, prefix))
+        with open(pathname, 'rb') as f:
+            source = f.read()
+        code_w = parse_source_module(space, pathname, source)
+        st = os.stat(pathname)
+        frozen.modules[modulename] = FrozenModule(os.sep + relpath,
+                                                  int(st[stat.ST_MTIME]),
+                                                  int(st[stat.ST_SIZE]),
+                                                  code_w)
+
+def get_frozen_code(space, modulename, pathname, fd):
+    """Return the code object of 'modulename' compiled at translation
+    time if it was compiled from the same file as 'pathname', which is
+    open as 'fd', or None.  Only fstat()s the file, without reading it.
+    """
+    frozen = space.fromcache(FrozenModules).modules.get(modulename, None)
+    if frozen is None or fd < 0 or not pathname.endswith(frozen.relpath):
+        return None
+    src_stat = os.fstat(fd)
+    if (int(src_stat[stat.ST_MTIME]) != frozen.mtime or
+            src_stat[stat.ST_SIZE] != frozen.size):
+        return None
+    return frozen.code_w
+
+@jit.dont_look_inside
+def load_frozen_module(space, w_modulename, w_mod, pathname, code_w,
+                       check_afterwards=True):
+    """
+    Load a module from the code object that get_frozen_code() returned
+    for the source file 'pathname'.  Returns the result of
+    sys.modules[modulename], which must exist.
+    """
+    log_pyverbose(space, 1, "import %s # frozen from %s\n" %
+                  (space.text_w(w_modulename), pathname))
+
+    try:
+        optimize = space.sys.get_flag('optimize')
+    except RuntimeError:
+        # during bootstrapping
+        optimize = 0
+    if optimize >= 2:
+        code_w.remove_docstrings(space)
+
+    update_code_filenames(space, code_w, pathname)
+    return exec_code_module(space, w_mod, code_w, w_modulename,
+                            check_afterwards=check_afterwards)
+
 @jit.dont_look_inside
 def load_source_module(space, w_modulename, w_mod, pathname, source, fd,
                        write_pyc=True, check_afterwards=True):
@@ -1033,10 +1215,12 @@ def check_compiled_module(space, pycfilename, expected_mtime):
                        # Out of file descriptors.
 
 def read_compiled_module(space, cpathname, strbuf):
-    """ Read a code object from a file and check it for validity """
+    """ Read a code object from a file and check it for validity.  The
+    constants of the nested code objects are only unmarshalled when they
+    are first needed, see LazyCodeUnmarshaller. """
 
-    w_marshal = space.getbuiltinmodule('marshal')
-    w_code = space.call_method(w_marshal, 'loads', space.newbytes(strbuf))
+    from pypy.module.marshal.interp_marshal import LazyCodeUnmarshaller
+    w_code = LazyCodeUnmarshaller(space, strbuf).load_w_obj()
     if not isinstance(w_code, Code):
         raise oefmt(space.w_ImportError, "Non-code object in %s", cpathname)
     return w_code
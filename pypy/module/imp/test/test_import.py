@@ -957,6 +957,27 @@ class TestPycStuff:
         ret = space.int_w(w_ret)
         assert ret == 42
 
+    def test_load_compiled_module_lazily(self):
+        space = self.space
+        mtime = 12345
+        co = compile('def f():\n    return 42.5\n', '?', 'exec')
+        cpathname = _testfile(importing.get_pyc_magic(space), mtime, co)
+        w_modulename = space.wrap('somemodule')
+        stream = streamio.open_file_as_stream(cpathname, "rb")
+        try:
+            w_mod = space.wrap(Module(space, w_modulename))
+            magic = importing._r_long(stream)
+            timestamp = importing._r_long(stream)
+            _load_compiled_module(space, w_modulename, w_mod, cpathname,
+                                  magic, timestamp, stream.readall())
+        finally:
+            stream.close()
+        w_f = space.getattr(w_mod, space.wrap('f'))
+        code_f = w_f.code
+        assert code_f._lazy_consts is not None
+        assert space.float_w(space.call_function(w_f)) == 42.5
+        assert code_f._lazy_consts is None
+
     def test_parse_source_module(self):
         space = self.space
         pathname = _testfilesource()
@@ -1182,6 +1203,137 @@ class TestPycStuff:
                     stream.close()
 
 
+class TestDirectoryListingCache:
+    def test_listing_cached_until_mtime_changes(self):
+        space = self.space
+        cache = space.fromcache(importing.DirectoryListingCache)
+        d = udir.ensure('dircache1', dir=1)
+        d.join('foo.py').write('x = 1\n')
+        os.utime(str(d), (100000, 100000))
+        cache.new_search()
+        assert importing.may_exist(space, str(d.join('foo.py')))
+        assert not importing.may_exist(space, str(d.join('bar.py')))
+        assert str(d) + os.sep in cache.listings
+        # a file added without changing the mtime is not seen
+        d.join('bar.py').write('x = 2\n')
+        os.utime(str(d), (100000, 100000))
+        cache.new_search()
+        assert not importing.may_exist(space, str(d.join('bar.py')))
+        # changing the mtime invalidates the listing
+        os.utime(str(d), (200000, 200000))
+        cache.new_search()
+        assert importing.may_exist(space, str(d.join('bar.py')))
+
+    def test_recently_modified_not_cached(self):
+        space = self.space
+        cache = space.fromcache(importing.DirectoryListingCache)
+        d = udir.ensure('dircache2', dir=1)
+        d.join('foo.py').write('x = 1\n')
+        cache.new_search()
+        assert not importing.may_exist(space, str(d.join('bar.py')))
+        assert str(d) + os.sep not in cache.listings
+        d.join('bar.py').write('x = 2\n')
+        assert importing.may_exist(space, str(d.join('bar.py')))
+
+    def test_unknown_paths(self):
+        space = self.space
+        assert importing.may_exist(space, 'foo.py')
+        assert importing.may_exist(space, str(udir.join('nonexistent',
+                                                        'foo.py')))
+
+    def test_find_module_uses_listing(self):
+        space = self.space
+        d = udir.ensure('dircache3', dir=1)
+        d.join('dircachemod.py').write('x = 1\n')
+        d.ensure('dircachepkg', '__init__.py')
+        os.utime(str(d), (100000, 100000))
+        w_path = space.newlist([space.newtext(str(d))])
+        def find(name):
+            return importing.find_module(space, name, space.newtext(name),
+                                         name, w_path, use_loader=False)
+        find_info = find('dircachemod')
+        assert find_info.modtype == importing.PY_SOURCE
+        find_info.stream.close()
+        find_info = find('dircachepkg')
+        assert find_info.modtype == importing.PKG_DIRECTORY
+        assert find('dircachemissing') is None
+        d.join('dircachemissing.py').write('x = 2\n')
+        os.utime(str(d), (200000, 200000))
+        find_info = find('dircachemissing')
+        assert find_info.modtype == importing.PY_SOURCE
+        find_info.stream.close()
+
+
+class TestFrozenModules:
+    def setup_method(self, meth):
+        self.prefix = udir.ensure('frozen_%s' % meth.__name__, dir=1)
+        self.lib_pypy = self.prefix.ensure('lib_pypy', dir=1)
+        self.prefix.ensure('lib-python', '2.7', dir=1)
+
+    def import_module(self, modulename, read_source=True):
+        space = self.space
+        w_path = space.newlist([space.newtext(str(self.lib_pypy))])
+        w_modulename = space.newtext(modulename)
+        find_info = importing.find_module(space, modulename, w_modulename,
+                                          modulename, w_path,
+                                          use_loader=False)
+        if not read_source:
+            def readall():
+                raise AssertionError("the source should not be read")
+            find_info.stream.readall = readall
+        try:
+            return importing.load_module(space, w_modulename, find_info)
+        finally:
+            if find_info.stream is not None:
+                find_info.stream.close()
+
+    def test_frozen_module(self):
+        space = self.space
+        self.lib_pypy.join('frozenmod1.py').write('x = 42\n')
+        importing.freeze_modules(space, ['frozenmod1'], str(self.prefix))
+        frozen = space.fromcache(importing.FrozenModules)
+        assert frozen.modules['frozenmod1'].relpath == os.path.join(
+            os.sep + 'lib_pypy', 'frozenmod1.py')
+        w_mod = self.import_module('frozenmod1', read_source=False)
+        assert space.int_w(space.getattr(w_mod, space.newtext('x'))) == 42
+        # the prebuilt code object was used: no .pyc was written
+        assert not self.lib_pypy.join('frozenmod1.pyc').check()
+        w_file = space.getattr(w_mod, space.newtext('__file__'))
+        assert space.text_w(w_file) == str(self.lib_pypy.join('frozenmod1.py'))
+
+    def test_frozen_package(self):
+        space = self.space
+        self.lib_pypy.ensure('frozenpkg', '__init__.py').write('y = 5\n')
+        importing.freeze_modules(space, ['frozenpkg'], str(self.prefix))
+        w_mod = self.import_module('frozenpkg')
+        assert space.int_w(space.getattr(w_mod, space.newtext('y'))) == 5
+        assert not self.lib_pypy.join('frozenpkg', '__init__.pyc').check()
+
+    def test_source_changed(self):
+        space = self.space
+        self.lib_pypy.join('frozenmod2.py').write('x = 42\n')
+        importing.freeze_modules(space, ['frozenmod2'], str(self.prefix))
+        self.lib_pypy.join('frozenmod2.py').write('x = 43\n\n')
+        w_mod = self.import_module('frozenmod2')
+        assert space.int_w(space.getattr(w_mod, space.newtext('x'))) == 43
+
+    def test_same_mtime_and_size(self):
+        space = self.space
+        f = self.lib_pypy.join('frozenmod3.py')
+        f.write('x = 42\n')
+        importing.freeze_modules(space, ['frozenmod3'], str(self.prefix))
+        mtime = f.mtime()
+        f.write('x = 43\n')
+        f.setmtime(mtime)
+        # only the mtime and the size are checked
+        w_mod = self.import_module('frozenmod3', read_source=False)
+        assert space.int_w(space.getattr(w_mod, space.newtext('x'))) == 42
+
+    def test_not_found(self):
+        py.test.raises(ValueError, importing.freeze_modules, self.space,
+                       ['frozennonexistent'], str(self.prefix))
+
+
 def test_PYTHONPATH_takes_precedence(space):
     if sys.platform == "win32":
         py.test.skip("unresolved issues with win32 shell quoting rules")
@@ -3,7 +3,8 @@ from pypy.interpreter.gateway import WrappedDefault, unwrap_spec
 from rpython.rlib.rarithmetic import intmask
 from rpython.rlib import rstackovf
 from pypy.module._file.interp_file import W_File
-from pypy.objspace.std.marshal_impl import marshal, get_unmarshallers
+from pypy.objspace.std.marshal_impl import (
+    marshal, get_unmarshallers, skip_w_obj)
 
 
 Py_MARSHAL_VERSION = 2
@@ -338,6 +339,7 @@ class Unmarshaller(_Base):
         self.space = space
         self.reader = reader
         self.stringtable_w = []
+        self.code_depth = 0
 
     def get(self, n):
         assert n >= 0
@@ -437,6 +439,15 @@ class Unmarshaller(_Base):
     def get_list_w(self):
         return self.get_tuple_w()[:]
 
+    def get_code_consts_w(self):
+        """Read the tuple of constants of a code object.  Returns
+        (consts_w, lazy_consts): see LazyCodeUnmarshaller."""
+        self.code_depth += 1
+        try:
+            return self.get_tuple_w(), None
+        finally:
+            self.code_depth -= 1
+
     def _overflow(self):
         self.raise_exc('object too deeply nested to unmarshal')
 
@@ -498,3 +509,59 @@ class StringUnmarshaller(Unmarshaller):
             return x
         else:
             self.raise_exc('bad marshal data')
+
+
+class LazyCodeUnmarshaller(StringUnmarshaller):
+    """Unmarshaller used to load .pyc files.  The constants of the
+    nested code objects, which include the code objects of all the
+    functions defined in the module, are skipped over and only
+    unmarshalled when the code object is first executed: see
+    PyCode.load_lazy_consts().
+    """
+
+    def __init__(self, space, bufstr, bufpos=0, stringtable_w=None):
+        Unmarshaller.__init__(self, space, None)
+        self.bufstr = bufstr
+        self.bufpos = bufpos
+        self.limit = len(bufstr)
+        if stringtable_w is not None:
+            self.stringtable_w = stringtable_w
+
+    def get_code_consts_w(self):
+        if self.code_depth == 0:
+            # the top-level code object is executed immediately anyway
+            return Unmarshaller.get_code_consts_w(self)
+        num_strings = len(self.stringtable_w)
+        start = self.bufpos
+        lng = self.get_lng()
+        for i in range(lng):
+            skip_w_obj(self.space, self)
+        # keep a copy of only the marshalled constants, not the whole
+        # .pyc data, which can then be freed after the import
+        end = self.bufpos
+        assert 0 <= start <= end
+        lazy_consts = LazyConsts(self.bufstr[start:end], self.stringtable_w,
+                                 num_strings)
+        return [], lazy_consts
+
+
+class LazyConsts(object):
+    """The constants of a code object, still in marshalled form."""
+    filename = None       # the original co_filename of the code object
+    remove_docstrings = False
+
+    def __init__(self, bufstr, stringtable_w, num_strings):
+        self.bufstr = bufstr
+        # the strings interned before this point in the marshal data
+        self.stringtable_w = stringtable_w
+        self.num_strings = num_strings
+
+    def load(self, space):
+        u = LazyCodeUnmarshaller(space, self.bufstr, 0,
+                                 self.stringtable_w[:self.num_strings])
+        u.code_depth = 1
+        try:
+            return u.get_tuple_w()
+        except rstackovf.StackOverflow:
+            rstackovf.check_stack_overflow()
+            u._overflow()
@@ -91,3 +91,73 @@ def test_long_more(space):
         for i in range(100):
             _marshal_check(sign * ((1L << i) - 1L))
             _marshal_check(sign * (1L << i))
+
+
+def _nested_code(code):
+    from pypy.interpreter.pycode import PyCode
+    return [w for w in code.co_consts_w if isinstance(w, PyCode)][0]
+
+def test_lazy_code_consts(space):
+    source = '''if 1:
+        def f(x, y=1.5):
+            "doc of f"
+            def g():
+                return {x: (-10L**20, 2j, 0.25, u'abc', frozenset([3]),
+                            'interned', None, Ellipsis)}
+            return g
+        class A:
+            def m(self):
+                return 'interned'
+    '''
+    code = space.getexecutioncontext().compiler.compile(
+        source, 'x.py', 'exec', 0)
+    data = space.bytes_w(interp_marshal.dumps(space, code, space.newint(2)))
+    u = interp_marshal.LazyCodeUnmarshaller(space, data)
+    w_code = u.load_w_obj()
+    assert u.bufpos == len(data)
+    # the module-level code is loaded eagerly, but not 'f'
+    assert w_code._lazy_consts is None
+    code_f = _nested_code(w_code)
+    assert code_f._lazy_consts is not None
+    assert code_f.co_consts_w == []
+    # only the marshalled constants of 'f' are kept, not the whole data
+    lazy_bufstr = code_f._lazy_consts.bufstr
+    assert len(lazy_bufstr) < len(data) / 2
+    assert lazy_bufstr in data
+    assert code_f.co_varnames == _nested_code(code).co_varnames
+    assert space.eq_w(w_code, code)
+    assert code_f._lazy_consts is None
+    assert space.text_w(code_f.getdocstring(space)) == "doc of f"
+    #
+    w_code = interp_marshal.LazyCodeUnmarshaller(space, data).load_w_obj()
+    w_dict = space.newdict()
+    w_code.exec_code(space, w_dict, w_dict)
+    w_res = space.appexec([w_dict], """(d):
+        res = d['f'](5)()
+        return res, d['A']().m(), d['f'].__doc__
+    """)
+    w_expected = space.appexec([], """():
+        return ({5: (-10L**20, 2j, 0.25, u'abc', frozenset([3]),
+                     'interned', None, Ellipsis)}, 'interned', 'doc of f')
+    """)
+    assert space.eq_w(w_res, w_expected)
+
+def test_lazy_code_filename(space):
+    from pypy.module.imp.importing import update_code_filenames
+    source = '''if 1:
+        def f():
+            def g():
+                pass
+            return g
+    '''
+    code = space.getexecutioncontext().compiler.compile(
+        source, 'x.py', 'exec', 0)
+    data = space.bytes_w(interp_marshal.dumps(space, code, space.newint(2)))
+    w_code = interp_marshal.LazyCodeUnmarshaller(space, data).load_w_obj()
+    update_code_filenames(space, w_code, 'y.py')
+    code_f = _nested_code(w_code)
+    assert code_f.co_filename == 'y.py'
+    code_f.load_lazy_consts()
+    code_g = _nested_code(code_f)
+    assert code_g.co_filename == 'y.py'
+    assert code_g._lazy_consts is not None
@@ -0,0 +1,49 @@
+""" Cold import benchmark for zipimport: builds an archive with many
+entries (20000 by default, spread over packages), then times importing
+one module from each package in a fresh interpreter.  Every package
+gets its own zipimporter, so this mostly measures the cost of reading
+the archive's directory.
+
+    pypy-c bench_zipimport.py [num_entries [entries_per_package [runs]]]
+"""
+
+import os, sys, shutil, subprocess, tempfile, zipfile
+
+def make_archive(zipname, num_entries, entries_per_package):
+    packages = []
+    z = zipfile.ZipFile(zipname, 'w', zipfile.ZIP_STORED)
+    try:
+        for i in range(num_entries // entries_per_package):
+            pkgname = 'zpkg%d' % i
+            z.writestr(pkgname + '/__init__.py', '# package\n')
+            for j in range(entries_per_package - 1):
+                z.writestr('%s/mod%d.py' % (pkgname, j), 'X = %d\n' % j)
+            packages.append(pkgname)
+    finally:
+        z.close()
+    return packages
+
+def run_once(zipname, packages):
+    script = ('import sys, time\n'
+              'sys.path.insert(0, %r)\n'
+              't0 = time.time()\n'
+              'for name in %r:\n'
+              '    __import__(name + ".mod0")\n'
+              'print time.time() - t0\n' % (zipname, packages))
+    output = subprocess.check_output([sys.executable, '-c', script])
+    return float(output)
+
+def main(num_entries=20000, entries_per_package=100, runs=5):
+    tmpdir = tempfile.mkdtemp(prefix='bench_zipimport')
+    try:
+        zipname = os.path.join(tmpdir, 'app.zip')
+        packages = make_archive(zipname, num_entries, entries_per_package)
+        print 'importing %d modules from an archive of %d entries' % (
+            len(packages), num_entries)
+        times = [run_once(zipname, packages) for i in range(runs)]
+        print 'min: %f  max: %f' % (min(times), max(times))
+    finally:
+        shutil.rmtree(tmpdir)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -57,9 +57,11 @@ class W_ZipCache(W_Root):
         for key, info in w_zipimporter.zip_file.NameToInfo.iteritems():
             if ZIPSEP != os.path.sep:
                 key = key.replace(ZIPSEP, os.path.sep)
+            # like CPython, give the offset of the local header: the
+            # offset of the data would need to read it
             space.setitem(w_d, space.newtext(key), space.newtuple([
                 space.newtext(info.filename), space.newint(info.compress_type), space.newint(info.compress_size),
-                space.newint(info.file_size), space.newint(info.file_offset), space.newint(info.dostime),
+                space.newint(info.file_size), space.newint(info.header_offset), space.newint(info.dostime),
                 space.newint(info.dosdate), space.newint(info.CRC)]))
         return w_d
 
@@ -115,12 +117,16 @@ W_ZipCache.typedef = TypeDef(
 zip_cache = W_ZipCache()
 
 class W_ZipImporter(W_Root):
-    def __init__(self, space, name, filename, zip_file, prefix):
+    def __init__(self, space, name, filename, zip_file, prefix,
+                 zip_mtime, zip_size):
         self.space = space
         self.name = name
         self.filename = filename
         self.zip_file = zip_file
         self.prefix = prefix
+        # the archive's mtime and size when 'zip_file' was parsed
+        self.zip_mtime = zip_mtime
+        self.zip_size = zip_size
 
     def getprefix(self, space):
         if ZIPSEP == os.path.sep:
@@ -378,29 +384,40 @@ def descr_new_zipimporter(space, w_type, name):
     if not ok:
         raise oefmt(get_error(space), "Did not find %s to be a valid zippath",
                     name)
+    zip_file = None
     try:
         w_result = zip_cache.get(filename)
         if w_result is None:
             raise oefmt(get_error(space),
                         "Cannot import %s from zipfile, recursion detected or"
                         "already tried and failed", name)
+        # share the parsed directory of the archive with the existing
+        # importers (e.g. the ones of the packages inside the archive),
+        # unless the archive changed
+        assert isinstance(w_result, W_ZipImporter)
+        if (w_result.zip_mtime == s.st_mtime and
+                w_result.zip_size == s.st_size):
+            zip_file = w_result.zip_file
     except KeyError:
         zip_cache.cache[filename] = None
-    try:
-        zip_file = RZipFile(filename, 'r')
-    except (BadZipfile, OSError):
-        raise oefmt(get_error(space), "%s seems not to be a zipfile", filename)
-    except RZlibError as e:
-        # in this case, CPython raises the direct exception coming
-        # from the zlib module: let's do the same
-        raise zlib_error(space, e.msg)
+    if zip_file is None:
+        try:
+            zip_file = RZipFile(filename, 'r')
+        except (BadZipfile, OSError):
+            raise oefmt(get_error(space), "%s seems not to be a zipfile",
+                        filename)
+        except RZlibError as e:
+            # in this case, CPython raises the direct exception coming
+            # from the zlib module: let's do the same
+            raise zlib_error(space, e.msg)
 
     prefix = name[len(filename):]
     if prefix.startswith(os.path.sep) or prefix.startswith(ZIPSEP):
         prefix = prefix[1:]
     if prefix and not prefix.endswith(ZIPSEP) and not prefix.endswith(os.path.sep):
         prefix += ZIPSEP
-    w_result = W_ZipImporter(space, name, filename, zip_file, prefix)
+    w_result = W_ZipImporter(space, name, filename, zip_file, prefix,
+                             s.st_mtime, s.st_size)
     zip_cache.set(filename, w_result)
     return w_result
 
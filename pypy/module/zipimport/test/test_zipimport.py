@@ -367,6 +367,61 @@ def get_co_filename():
         raises(ValueError, __import__, 'x1test', None, None, [])
 
 
+class TestZipImporterCache:
+    spaceconfig = {
+        "usemodules": ['zipimport', 'time', 'struct', 'itertools', 'binascii'],
+    }
+
+    def write_zip(self, zipname, files):
+        from zipfile import ZipFile
+        z = ZipFile(zipname, 'w')
+        for filename, data in files:
+            z.writestr(filename, data)
+        z.close()
+
+    def test_directory_shared(self):
+        space = self.space
+        zipname = str(udir.join('test_directory_shared.zip'))
+        self.write_zip(zipname, [('x.py', ''), ('sub/__init__.py', '')])
+        w_zipimporter = space.getattr(space.getbuiltinmodule('zipimport'),
+                                      space.wrap('zipimporter'))
+        w_cache = space.getattr(space.getbuiltinmodule('zipimport'),
+                                space.wrap('_zip_directory_cache'))
+        space.call_method(w_cache, 'clear')
+        w_main = space.call_function(w_zipimporter, space.wrap(zipname))
+        w_sub = space.call_function(w_zipimporter,
+                                    space.wrap(zipname + os.sep + 'sub'))
+        assert w_main is not w_sub
+        assert w_main.zip_file is w_sub.zip_file
+        # the archive changed: parse it again
+        self.write_zip(zipname, [('x.py', ''), ('sub/__init__.py', ''),
+                                 ('y.py', '')])
+        w_new = space.call_function(w_zipimporter, space.wrap(zipname))
+        assert w_new.zip_file is not w_main.zip_file
+        assert 'y.py' in w_new.zip_file.NameToInfo
+        space.call_method(w_cache, 'clear')
+
+    def test_directory_cache_getitem_no_io(self):
+        space = self.space
+        zipname = str(udir.join('test_directory_cache_getitem.zip'))
+        self.write_zip(zipname, [('x.py', 'x = 1'), ('y.py', '')])
+        w_zipimporter = space.getattr(space.getbuiltinmodule('zipimport'),
+                                      space.wrap('zipimporter'))
+        w_cache = space.getattr(space.getbuiltinmodule('zipimport'),
+                                space.wrap('_zip_directory_cache'))
+        space.call_method(w_cache, 'clear')
+        w_main = space.call_function(w_zipimporter, space.wrap(zipname))
+        w_d = space.getitem(w_cache, space.wrap(zipname))
+        infos = w_main.zip_file.NameToInfo
+        for name in ['x.py', 'y.py']:
+            w_tuple = space.getitem(w_d, space.wrap(name))
+            offset = space.int_w(space.getitem(w_tuple, space.wrap(4)))
+            assert offset == infos[name].header_offset
+            # the local headers were not read
+            assert infos[name].file_offset == -1
+        space.call_method(w_cache, 'clear')
+
+
 if os.sep != '/':
     class AppTestNativePathSep(AppTestZipimport):
         pathsep = os.sep
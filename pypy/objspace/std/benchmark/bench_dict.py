@@ -45,8 +45,78 @@ def bench_simple_dict(SIZE = 10000):
     count_operation("Existing key access", lambda : rand_keys(lookup_keys))
     return test_d
 
+def bench_float_dict(SIZE = 10000):
+    keys = [random.random() for i in xrange(SIZE)]
+    lookup_keys = random.sample(keys, 1000)
+
+    def build():
+        d = {}
+        for key in keys:
+            d[key] = d.get(key, 0) + 1
+        return d
+
+    test_d = count_operation("Float key creation", build)
+
+    def lookup(keys):
+        for key in keys:
+            test_d[key]
+
+    count_operation("Float key access", lambda : lookup(lookup_keys))
+    count_operation("Float set creation", lambda : set(keys))
+    return test_d
+
+def bench_small_dicts(NUM = 100000):
+    keys = ["id", "name", "email", "active", "score"]
+
+    def build():
+        result = []
+        for i in xrange(NUM):
+            d = {}
+            for key in keys:
+                d[key] = i
+            result.append(d)
+        return result
+
+    dicts = count_operation("Small dict creation", build)
+
+    def lookup():
+        for d in dicts:
+            d["name"]
+            d.get("missing")
+
+    count_operation("Small dict access", lookup)
+    return dicts[0]
+
+def gc_memory():
+    import gc
+    gc.collect()
+    return gc.get_stats()._s.total_gc_memory
+
+def bench_small_dicts_memory(NUM = 100000):
+    # memory of small string-keyed dicts: compare a pypy-c translated
+    # with --withsmalldicts (SmallBytesDictStrategy) with one translated
+    # without it (BytesDictStrategy)
+    import __pypy__
+    keys = ["id", "name", "email", "active", "score"]
+
+    before = gc_memory()
+    dicts = []
+    for i in xrange(NUM):
+        d = {}
+        for key in keys:
+            d[key] = i
+        dicts.append(d)
+    after = gc_memory()
+    print "%-28s %6.1f bytes per dict" % (
+        __pypy__.strategy(dicts[0]), (after - before) / float(NUM))
+
 if __name__ == '__main__':
-    test_d = bench_simple_dict()
     import __pypy__
+    test_d = bench_float_dict()
+    print __pypy__.internal_repr(test_d)
+    test_d = bench_small_dicts()
+    print __pypy__.internal_repr(test_d)
+    bench_small_dicts_memory()
+    test_d = bench_simple_dict()
     print __pypy__.internal_repr(test_d)
     print __pypy__.internal_repr(test_d.iterkeys())
@@ -0,0 +1,73 @@
+""" benchmarks for instances with numeric attributes: attribute writes
+and memory per instance.  Compare a pypy-c translated with
+--withunboxedattributes with one translated without it.  The option
+mostly helps the interpreter, so run both with --jit off as well.
+"""
+
+import time
+
+def count_operation(name, function):
+    print name
+    t0 = time.time()
+    retval = function()
+    tk = time.time()
+    print name, " takes: %f" % (tk - t0)
+    return retval
+
+class Position(object):
+    def __init__(self, i):
+        self.count = i
+        self.price = i * 0.5
+        self.volume = i
+        self.average = 0.0
+
+def bench_attribute_write(NUM = 1000, LOOPS = 1000):
+    positions = [Position(i) for i in xrange(NUM)]
+
+    def update():
+        for j in xrange(LOOPS):
+            for p in positions:
+                p.count += 1
+                p.price = p.price * 1.0001
+                p.volume = p.volume + j
+                p.average = (p.average + p.price) * 0.5
+
+    count_operation("Int and float attribute writes", update)
+    return positions[0]
+
+def bench_attribute_read(NUM = 1000, LOOPS = 1000):
+    positions = [Position(i) for i in xrange(NUM)]
+
+    def read():
+        total = 0.0
+        for j in xrange(LOOPS):
+            for p in positions:
+                total += p.count + p.price + p.volume
+        return total
+
+    count_operation("Int and float attribute reads", read)
+    return positions[0]
+
+def gc_memory():
+    import gc
+    gc.collect()
+    return gc.get_stats()._s.total_gc_memory
+
+def bench_instance_memory(NUM = 100000):
+    before = gc_memory()
+    positions = [Position(i) for i in xrange(NUM)]
+    # bigger values, not prebuilt even with --withprebuiltint
+    for p in positions:
+        p.count += 1000
+        p.volume += 1000
+    after = gc_memory()
+    print "%6.1f bytes per instance with 4 numeric attributes" % (
+        (after - before) / float(NUM))
+    return positions[0]
+
+if __name__ == '__main__':
+    import __pypy__
+    p = bench_attribute_write()
+    print __pypy__.internal_repr(p)
+    bench_attribute_read()
+    bench_instance_memory()
@@ -0,0 +1,68 @@
+""" template-rendering style benchmarks for strings built by '+='.
+Compare a pypy-c translated with --withstrbuf with one translated
+without it, with and without --jit off.
+"""
+
+import time
+
+def count_operation(name, function):
+    print name
+    t0 = time.time()
+    retval = function()
+    tk = time.time()
+    print name, " takes: %f" % (tk - t0)
+    return retval
+
+def make_rows(NUM):
+    return [{'id': i, 'name': 'item%d' % i, 'price': i * 0.25,
+             'tags': ['a', 'b', 'c'][:i % 4]}
+            for i in xrange(NUM)]
+
+def render_table(rows):
+    # the way a naive template engine renders: one '+=' per piece
+    out = '<table>\n'
+    for row in rows:
+        out += '  <tr>'
+        out += '<td>' + str(row['id']) + '</td>'
+        out += '<td>' + row['name'] + '</td>'
+        out += '<td>%.2f</td>' % (row['price'],)
+        out += '<td>'
+        for tag in row['tags']:
+            out += '<span>' + tag + '</span>'
+        out += '</td></tr>\n'
+    out += '</table>\n'
+    return out
+
+def render_pages(rows, NUM_PAGES):
+    # many small pages: the strings stay short, nothing to gain
+    pages = []
+    for i in xrange(NUM_PAGES):
+        row = rows[i % len(rows)]
+        page = '<h1>'
+        page += row['name']
+        page += '</h1><p>'
+        page += str(row['id'])
+        page += '</p>'
+        pages.append(page)
+    return pages
+
+def bench_render_table(NUM = 20000, LOOPS = 10):
+    rows = make_rows(NUM)
+
+    def render():
+        for i in xrange(LOOPS):
+            result = render_table(rows)
+        return result
+
+    result = count_operation("Rendering a %d-row table" % (NUM,), render)
+    print len(result), "characters"
+    return result
+
+def bench_render_pages(NUM_PAGES = 200000):
+    rows = make_rows(100)
+    count_operation("Rendering %d small pages" % (NUM_PAGES,),
+                    lambda : render_pages(rows, NUM_PAGES))
+
+if __name__ == '__main__':
+    bench_render_table()
+    bench_render_pages()
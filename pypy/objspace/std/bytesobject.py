@@ -21,6 +21,10 @@ from pypy.objspace.std.unicodeobject import (
     unicode_from_string, getdefaultencoding)
 from pypy.objspace.std.util import IDTAG_SPECIAL, IDTAG_SHIFT
 
+# with 'withstrbuf', concatenations producing strings shorter than this
+# give a plain W_BytesObject instead of a W_StringBufferObject
+STRBUF_MIN_LENGTH = 64
+
 
 class W_AbstractBytesObject(W_Root):
     __slots__ = ()
@@ -73,9 +77,18 @@ class W_AbstractBytesObject(W_Root):
         Return a formatted version of S as described by format_spec.
         """
 
+    def descr_formatter_field_name_split(self, space):
+        ""
+
+    def descr_formatter_parser(self, space):
+        ""
+
     def descr_ge(self, space, w_other):
         """x.__ge__(y) <==> x>=y"""
 
+    def descr_getbuffer(self, space, w_flags):
+        ""
+
     def descr_getitem(self, space, w_index):
         """x.__getitem__(y) <==> x[y]"""
 
@@ -498,7 +511,7 @@ class W_BytesObject(W_AbstractBytesObject):
     @staticmethod
     def _use_rstr_ops(space, w_other):
         from pypy.objspace.std.unicodeobject import W_UnicodeObject
-        return (isinstance(w_other, W_BytesObject) or
+        return (isinstance(w_other, W_AbstractBytesObject) or
                 isinstance(w_other, W_UnicodeObject))
 
     @staticmethod
@@ -610,35 +623,52 @@ class W_BytesObject(W_AbstractBytesObject):
     def descr_rmod(self, space, w_values):
         return mod_format(space, w_values, self, do_unicode=False)
 
-    def descr_eq(self, space, w_other):
+    def _compare_value(self, space, w_other):
+        """The value to compare with in descr_eq() & co, or None if
+        'w_other' is not a str"""
+        if space.config.objspace.std.withstrbuf:
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            if isinstance(w_other, W_StringBufferObject):
+                return w_other.force()
         if not isinstance(w_other, W_BytesObject):
+            return None
+        return w_other._value
+
+    def descr_eq(self, space, w_other):
+        other = self._compare_value(space, w_other)
+        if other is None:
             return space.w_NotImplemented
-        return space.newbool(self._value == w_other._value)
+        return space.newbool(self._value == other)
 
     def descr_ne(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        other = self._compare_value(space, w_other)
+        if other is None:
             return space.w_NotImplemented
-        return space.newbool(self._value != w_other._value)
+        return space.newbool(self._value != other)
 
     def descr_lt(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        other = self._compare_value(space, w_other)
+        if other is None:
             return space.w_NotImplemented
-        return space.newbool(self._value < w_other._value)
+        return space.newbool(self._value < other)
 
     def descr_le(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        other = self._compare_value(space, w_other)
+        if other is None:
             return space.w_NotImplemented
-        return space.newbool(self._value <= w_other._value)
+        return space.newbool(self._value <= other)
 
     def descr_gt(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        other = self._compare_value(space, w_other)
+        if other is None:
             return space.w_NotImplemented
-        return space.newbool(self._value > w_other._value)
+        return space.newbool(self._value > other)
 
     def descr_ge(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        other = self._compare_value(space, w_other)
+        if other is None:
             return space.w_NotImplemented
-        return space.newbool(self._value >= w_other._value)
+        return space.newbool(self._value >= other)
 
     # auto-conversion fun
 
@@ -653,6 +683,22 @@ class W_BytesObject(W_AbstractBytesObject):
             from .bytearrayobject import W_BytearrayObject, _make_data
             self_as_bytearray = W_BytearrayObject(_make_data(self._value))
             return space.add(self_as_bytearray, w_other)
+        if (space.config.objspace.std.withstrbuf and
+                isinstance(w_other, W_AbstractBytesObject)):
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            try:
+                other = self._op_val(space, w_other)
+            except OperationError as e:
+                if e.match(space, space.w_TypeError):
+                    return space.w_NotImplemented
+                raise
+            if len(self._value) + len(other) < STRBUF_MIN_LENGTH:
+                # small results stay plain strings
+                return W_BytesObject(self._value + other)
+            builder = StringBuilder()
+            builder.append(self._value)
+            builder.append(other)
+            return W_StringBufferObject(builder)
         return self._StringMethods_descr_add(space, w_other)
 
     _StringMethods__startswith = _startswith
@@ -901,17 +947,18 @@ W_BytesObject.typedef = TypeDef(
     translate = interpindirect2app(W_AbstractBytesObject.descr_translate),
     upper = interpindirect2app(W_AbstractBytesObject.descr_upper),
     zfill = interpindirect2app(W_AbstractBytesObject.descr_zfill),
-    __buffer__ = interp2app(W_BytesObject.descr_getbuffer),
+    __buffer__ = interpindirect2app(W_AbstractBytesObject.descr_getbuffer),
 
-    format = interpindirect2app(W_BytesObject.descr_format),
-    __format__ = interpindirect2app(W_BytesObject.descr__format__),
-    __mod__ = interpindirect2app(W_BytesObject.descr_mod),
-    __rmod__ = interpindirect2app(W_BytesObject.descr_rmod),
+    format = interpindirect2app(W_AbstractBytesObject.descr_format),
+    __format__ = interpindirect2app(W_AbstractBytesObject.descr__format__),
+    __mod__ = interpindirect2app(W_AbstractBytesObject.descr_mod),
+    __rmod__ = interpindirect2app(W_AbstractBytesObject.descr_rmod),
     __getnewargs__ = interpindirect2app(
         W_AbstractBytesObject.descr_getnewargs),
-    _formatter_parser = interp2app(W_BytesObject.descr_formatter_parser),
-    _formatter_field_name_split =
-        interp2app(W_BytesObject.descr_formatter_field_name_split),
+    _formatter_parser = interpindirect2app(
+        W_AbstractBytesObject.descr_formatter_parser),
+    _formatter_field_name_split = interpindirect2app(
+        W_AbstractBytesObject.descr_formatter_field_name_split),
 )
 W_BytesObject.typedef.flag_sequence_bug_compat = True
 
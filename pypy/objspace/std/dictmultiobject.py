@@ -12,6 +12,7 @@ from pypy.interpreter.gateway import (
 from pypy.interpreter.mixedmodule import MixedModule
 from pypy.interpreter.signature import Signature
 from pypy.interpreter.typedef import TypeDef
+from pypy.objspace.std.floatobject import _is_float_key
 from pypy.objspace.std.util import negate
 
 
@@ -400,7 +401,7 @@ def _add_indirections():
                     length w_keys values items \
                     iterkeys itervalues iteritems \
                     listview_bytes listview_unicode listview_int \
-                    view_as_kwargs".split()
+                    listview_float view_as_kwargs".split()
 
     def make_method(method):
         def f(self, *args):
@@ -557,6 +558,9 @@ class DictStrategy(object):
     def listview_int(self, w_dict):
         return None
 
+    def listview_float(self, w_dict):
+        return None
+
     def view_as_kwargs(self, w_dict):
         return (None, None)
 
@@ -645,13 +649,18 @@ class EmptyDictStrategy(DictStrategy):
         w_type = self.space.type(w_key)
         if self.space.is_w(w_type, self.space.w_int):
             self.switch_to_int_strategy(w_dict)
+        elif _is_float_key(w_key):
+            self.switch_to_float_strategy(w_dict)
         elif w_type.compares_by_identity():
             self.switch_to_identity_strategy(w_dict)
         else:
             self.switch_to_object_strategy(w_dict)
 
     def switch_to_bytes_strategy(self, w_dict):
-        strategy = self.space.fromcache(BytesDictStrategy)
+        if self.space.config.objspace.std.withsmalldicts:
+            strategy = self.space.fromcache(SmallBytesDictStrategy)
+        else:
+            strategy = self.space.fromcache(BytesDictStrategy)
         storage = strategy.get_empty_storage()
         w_dict.set_strategy(strategy)
         w_dict.dstorage = storage
@@ -668,6 +677,12 @@ class EmptyDictStrategy(DictStrategy):
         w_dict.set_strategy(strategy)
         w_dict.dstorage = storage
 
+    def switch_to_float_strategy(self, w_dict):
+        strategy = self.space.fromcache(FloatDictStrategy)
+        storage = strategy.get_empty_storage()
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = storage
+
     def switch_to_identity_strategy(self, w_dict):
         from pypy.objspace.std.identitydict import IdentityDictStrategy
         strategy = self.space.fromcache(IdentityDictStrategy)
@@ -1194,6 +1209,207 @@ class BytesDictStrategy(AbstractTypedStrategy, DictStrategy):
 create_iterator_classes(BytesDictStrategy)
 
 
+SMALL_DICT_MAX_LENGTH = 8
+
+
+class SmallBytesDictStorage(object):
+    """The keys and values of a dict with the SmallBytesDictStrategy,
+    in insertion order.  The two lists are never resized but replaced,
+    so that they are plain arrays of the exact length after translation.
+    """
+    def __init__(self):
+        self.keys = []
+        self.values_w = []
+
+
+class SmallBytesItemsWithHash(object):
+    def __init__(self, storage):
+        self.storage = storage
+        self.i = 0
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        i = self.i
+        if i >= len(self.storage.keys):
+            raise StopIteration
+        self.i = i + 1
+        key = self.storage.keys[i]
+        return (key, self.storage.values_w[i], objectmodel.compute_hash(key))
+
+
+class SmallBytesDictStrategy(DictStrategy):
+    """A dict with at most SMALL_DICT_MAX_LENGTH string keys.  The keys,
+    unwrapped like in BytesDictStrategy, and the values are stored in two
+    lists in insertion order and searched linearly: for so few keys this
+    needs much less memory than a hash table.  The dict switches to
+    BytesDictStrategy when it grows larger.
+    """
+    erase, unerase = rerased.new_erasing_pair("smallbytes")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def get_empty_storage(self):
+        return self.erase(SmallBytesDictStorage())
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        return space.is_w(space.type(w_obj), space.w_bytes)
+
+    def _never_equal_to(self, w_lookup_type):
+        return _never_equal_to_string(self.space, w_lookup_type)
+
+    def wrapkey(space, key):
+        return space.newbytes(key)
+
+    @jit.look_inside_iff(lambda self, keys, key:
+            jit.isconstant(len(keys)) and jit.isconstant(key))
+    def _lookup(self, keys, key):
+        # return the index of the key in 'keys', or -1
+        for i in range(len(keys)):
+            if keys[i] == key:
+                return i
+        return -1
+
+    def length(self, w_dict):
+        return len(self.unerase(w_dict.dstorage).keys)
+
+    def getitem_str(self, w_dict, key):
+        storage = self.unerase(w_dict.dstorage)
+        i = self._lookup(storage.keys, key)
+        if i < 0:
+            return None
+        return storage.values_w[i]
+
+    def getitem(self, w_dict, w_key):
+        space = self.space
+        # -- This is called extremely often.  Hack for performance --
+        if type(w_key) is space.StringObjectCls:
+            return self.getitem_str(w_dict, w_key.unwrap(space))
+        # -- End of performance hack --
+        if self.is_correct_type(w_key):
+            return self.getitem_str(w_dict, space.bytes_w(w_key))
+        elif self._never_equal_to(space.type(w_key)):
+            return None
+        else:
+            self.switch_to_object_strategy(w_dict)
+            return w_dict.getitem(w_key)
+
+    def setitem(self, w_dict, w_key, w_value):
+        if self.is_correct_type(w_key):
+            self.setitem_str(w_dict, self.space.bytes_w(w_key), w_value)
+        else:
+            self.switch_to_object_strategy(w_dict)
+            w_dict.setitem(w_key, w_value)
+
+    def setitem_str(self, w_dict, key, w_value):
+        storage = self.unerase(w_dict.dstorage)
+        i = self._lookup(storage.keys, key)
+        if i >= 0:
+            storage.values_w[i] = w_value
+        elif len(storage.keys) >= SMALL_DICT_MAX_LENGTH:
+            self.switch_to_bytes_strategy(w_dict)
+            w_dict.setitem_str(key, w_value)
+        else:
+            storage.keys = storage.keys + [key]
+            storage.values_w = storage.values_w + [w_value]
+
+    def setdefault(self, w_dict, w_key, w_default):
+        if self.is_correct_type(w_key):
+            key = self.space.bytes_w(w_key)
+            w_result = self.getitem_str(w_dict, key)
+            if w_result is not None:
+                return w_result
+            self.setitem_str(w_dict, key, w_default)
+            return w_default
+        else:
+            self.switch_to_object_strategy(w_dict)
+            return w_dict.setdefault(w_key, w_default)
+
+    def delitem(self, w_dict, w_key):
+        space = self.space
+        if self.is_correct_type(w_key):
+            storage = self.unerase(w_dict.dstorage)
+            i = self._lookup(storage.keys, space.bytes_w(w_key))
+            if i < 0:
+                raise KeyError
+            storage.keys = storage.keys[:i] + storage.keys[i + 1:]
+            storage.values_w = storage.values_w[:i] + storage.values_w[i + 1:]
+        elif self._never_equal_to(space.type(w_key)):
+            raise KeyError
+        else:
+            self.switch_to_object_strategy(w_dict)
+            w_dict.delitem(w_key)
+
+    def w_keys(self, w_dict):
+        return self.space.newlist_bytes(self.listview_bytes(w_dict))
+
+    def values(self, w_dict):
+        return self.unerase(w_dict.dstorage).values_w[:]
+
+    def items(self, w_dict):
+        space = self.space
+        storage = self.unerase(w_dict.dstorage)
+        return [space.newtuple([space.newbytes(storage.keys[i]),
+                                storage.values_w[i]])
+                for i in range(len(storage.keys))]
+
+    def popitem(self, w_dict):
+        storage = self.unerase(w_dict.dstorage)
+        if not storage.keys:
+            raise KeyError
+        n = len(storage.keys) - 1
+        key = storage.keys[n]
+        w_value = storage.values_w[n]
+        storage.keys = storage.keys[:n]
+        storage.values_w = storage.values_w[:n]
+        return (self.space.newbytes(key), w_value)
+
+    def listview_bytes(self, w_dict):
+        return self.unerase(w_dict.dstorage).keys[:]
+
+    def view_as_kwargs(self, w_dict):
+        storage = self.unerase(w_dict.dstorage)
+        return storage.keys[:], storage.values_w[:]
+
+    def switch_to_bytes_strategy(self, w_dict):
+        storage = self.unerase(w_dict.dstorage)
+        strategy = self.space.fromcache(BytesDictStrategy)
+        new_storage = strategy.get_empty_storage()
+        d_new = strategy.unerase(new_storage)
+        for i in range(len(storage.keys)):
+            d_new[storage.keys[i]] = storage.values_w[i]
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = new_storage
+
+    def switch_to_object_strategy(self, w_dict):
+        space = self.space
+        storage = self.unerase(w_dict.dstorage)
+        strategy = space.fromcache(ObjectDictStrategy)
+        d_new = strategy.unerase(strategy.get_empty_storage())
+        for i in range(len(storage.keys)):
+            d_new[space.newbytes(storage.keys[i])] = storage.values_w[i]
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = strategy.erase(d_new)
+
+    # --------------- iterator interface -----------------
+
+    def getiterkeys(self, w_dict):
+        return iter(self.unerase(w_dict.dstorage).keys)
+
+    def getitervalues(self, w_dict):
+        return iter(self.unerase(w_dict.dstorage).values_w)
+
+    def getiteritems_with_hash(self, w_dict):
+        return SmallBytesItemsWithHash(self.unerase(w_dict.dstorage))
+
+    def getiterreversed(self, w_dict):
+        return reversed(self.unerase(w_dict.dstorage).keys)
+
+create_iterator_classes(SmallBytesDictStrategy)
+
+
 class UnicodeDictStrategy(AbstractTypedStrategy, DictStrategy):
     erase, unerase = rerased.new_erasing_pair("unicode")
     erase = staticmethod(erase)
@@ -1304,6 +1520,56 @@ class IntDictStrategy(AbstractTypedStrategy, DictStrategy):
 create_iterator_classes(IntDictStrategy)
 
 
+# ints in this range convert to floats exactly
+MAX_EXACT_INT_IN_FLOAT = 2 ** 53
+
+class FloatDictStrategy(AbstractTypedStrategy, DictStrategy):
+    erase, unerase = rerased.new_erasing_pair("float")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def wrap(self, unwrapped):
+        return self.space.newfloat(unwrapped)
+
+    def unwrap(self, wrapped):
+        return self.space.float_w(wrapped)
+
+    def get_empty_storage(self):
+        return self.erase({})
+
+    def is_correct_type(self, w_obj):
+        return _is_float_key(w_obj)
+
+    def _never_equal_to(self, w_lookup_type):
+        space = self.space
+        # XXX there are many more types
+        return (space.is_w(w_lookup_type, space.w_NoneType) or
+                space.is_w(w_lookup_type, space.w_bytes) or
+                space.is_w(w_lookup_type, space.w_unicode)
+                )
+
+    def getitem(self, w_dict, w_key):
+        from pypy.objspace.std.intobject import W_IntObject
+        if type(w_key) is W_IntObject:
+            # an int key is equal to the float key with the same value,
+            # as long as the conversion to float is exact
+            intval = self.space.int_w(w_key)
+            if -MAX_EXACT_INT_IN_FLOAT <= intval <= MAX_EXACT_INT_IN_FLOAT:
+                return self.unerase(w_dict.dstorage).get(float(intval), None)
+        return AbstractTypedStrategy.getitem(self, w_dict, w_key)
+
+    def listview_float(self, w_dict):
+        return self.unerase(w_dict.dstorage).keys()
+
+    def wrapkey(space, key):
+        return space.newfloat(key)
+
+    def w_keys(self, w_dict):
+        return self.space.newlist_float(self.listview_float(w_dict))
+
+create_iterator_classes(FloatDictStrategy)
+
+
 def update1(space, w_dict, w_data):
     if isinstance(w_data, W_DictMultiObject):    # optimization case only
         update1_dict_dict(space, w_dict, w_data)
@@ -702,6 +702,13 @@ Convert a string or number to a floating point number, if possible.''',
 )
 
 
+def _is_float_key(w_key):
+    # for the float strategies of dicts and sets.  NaNs are not equal to
+    # themselves, so they cannot be stored as unwrapped keys: such dicts
+    # and sets use the object strategy
+    return type(w_key) is W_FloatObject and not math.isnan(w_key.floatval)
+
+
 def _hash_float(space, v):
     if math.isnan(v):
         return 0
@@ -42,6 +42,11 @@ __all__ = ['W_ListObject', 'make_range_list', 'make_empty_list_with_size']
 
 UNROLL_CUTOFF = 5
 
+# slices of at least this many items, covering at least half of the list
+# they are taken from, share the items instead of copying them (see
+# BaseSliceViewListStrategy)
+SLICE_VIEW_MIN_LENGTH = 64
+
 
 def make_range_list(space, start, step, length):
     if length <= 0:
@@ -249,6 +254,14 @@ class W_ListObject(W_Root):
                 self.space, storage, strategy)
         return w_objectlist
 
+    def _copy_if_slice_view(self):
+        """If this list shares its items with another list, return a copy
+        of it that uses the underlying strategy; otherwise return self."""
+        strategy = self.strategy
+        if isinstance(strategy, BaseSliceViewListStrategy):
+            return strategy.materialized_copy(self)
+        return self
+
     def convert_to_cpy_strategy(self, space):
         from pypy.module.cpyext.sequence import CPyListStorage, CPyListStrategy
 
@@ -398,6 +411,8 @@ class W_ListObject(W_Root):
         """Sets the slice of the list from start to start+step*slicelength to
         the sequence sequence_w.
         Used by setslice and setitem."""
+        if not self.strategy.is_empty_strategy():
+            sequence_w = sequence_w._copy_if_slice_view()
         self.strategy.setslice(self, start, step, slicelength, sequence_w)
 
     def insert(self, index, w_item):
@@ -859,6 +874,8 @@ class ListStrategy(object):
         space = self.space
         if type(w_any) is W_ListObject or (isinstance(w_any, W_ListObject) and
                                            space._uses_list_iter(w_any)):
+            if not self.is_empty_strategy():
+                w_any = w_any._copy_if_slice_view()
             self._extend_from_list(w_list, w_any)
         elif space.is_generator(w_any):
             w_any.unpack_into_w(w_list)
@@ -1330,6 +1347,8 @@ class RangeListStrategy(BaseRangeListStrategy):
 
 
 class AbstractUnwrappedStrategy(object):
+    # the BaseSliceViewListStrategy subclass used for long slices, if any
+    _slice_view_cls = None
 
     def wrap(self, unwrapped):
         raise NotImplementedError
@@ -1423,6 +1442,11 @@ class AbstractUnwrappedStrategy(object):
 
     def getslice(self, w_list, start, stop, step, length):
         if step == 1 and 0 <= start <= stop:
+            if (self._slice_view_cls is not None and
+                    length >= SLICE_VIEW_MIN_LENGTH and
+                    length * 2 >= self.length(w_list) and
+                    self.space.config.objspace.std.withliststrategies):
+                return self._getslice_view(w_list, start, length)
             l = self.unerase(w_list.lstorage)
             assert start >= 0
             assert stop >= 0
@@ -1438,6 +1462,17 @@ class AbstractUnwrappedStrategy(object):
             return W_ListObject.from_storage_and_strategy(
                     self.space, storage, self)
 
+    def _getslice_view(self, w_list, start, length):
+        strategy = self.space.fromcache(self._slice_view_cls)
+        l = self.unerase(w_list.lstorage)
+        # from now on 'l' is shared, so w_list must not modify it in place
+        # either: turn it into a view of the whole of 'l'
+        w_list.strategy = strategy
+        w_list.lstorage = strategy.erase((l, 0, len(l)))
+        storage = strategy.erase((l, start, length))
+        return W_ListObject.from_storage_and_strategy(
+                self.space, storage, strategy)
+
     def _fill_in_with_sliced_items(self, subitems_w, l, start, step, length):
         for i in range(length):
             try:
@@ -2035,6 +2070,292 @@ class UnicodeListStrategy(ListStrategy):
     def getitems_unicode(self, w_list):
         return self.unerase(w_list.lstorage)
 
+
+class BaseSliceViewListStrategy(ListStrategy):
+    """Base class of the strategies used for long slices of lists.
+
+    The storage is a tuple (items, start, length): the list contains
+    items[start:start+length], where 'items' is the RPython list of the
+    underlying strategy.  Taking a slice of a list shares 'items' instead
+    of copying them, and turns the original list into a view of all of
+    'items' as well.  Since 'items' can be shared by several lists it is
+    never modified: like the range strategies, every mutating operation
+    first switches the list to the underlying strategy (with a copy of
+    its items) and then does the operation again.
+
+    The price is paid by the original list: after 'lst[a:b]', the first
+    append or setitem on 'lst' copies all of its items, where without
+    views only the slice would have been copied.  This is cheaper
+    overall when slices are taken more often than the sliced list is
+    modified afterwards, which is the case for 'lst[1:]' in recursive
+    algorithms and for 'for x in lst[a:b]'.
+    """
+
+    def materialize(self, w_list):
+        raise NotImplementedError
+
+    def materialized_copy(self, w_list):
+        raise NotImplementedError
+
+
+class AbstractSliceViewStrategy(object):
+    _base_cls = None
+
+    def __init__(self, space):
+        ListStrategy.__init__(self, space)
+        self.base = space.fromcache(self._base_cls)
+
+    @staticmethod
+    def unerase(storage):
+        raise NotImplementedError("abstract base class")
+
+    @staticmethod
+    def erase(obj):
+        raise NotImplementedError("abstract base class")
+
+    def _copy_items(self, w_list):
+        items, start, length = self.unerase(w_list.lstorage)
+        assert start >= 0
+        stop = start + length
+        assert stop >= 0
+        return items[start:stop]
+
+    def materialize(self, w_list):
+        base = self.base
+        items = self._copy_items(w_list)
+        w_list.strategy = base
+        w_list.lstorage = base.erase(items)
+
+    def materialized_copy(self, w_list):
+        base = self.base
+        storage = base.erase(self._copy_items(w_list))
+        return W_ListObject.from_storage_and_strategy(self.space, storage,
+                                                      base)
+
+    def init_from_list_w(self, w_list, list_w):
+        raise NotImplementedError
+
+    def clone(self, w_list):
+        storage = w_list.lstorage  # tuple is immutable, no need to copy
+        return W_ListObject.from_storage_and_strategy(self.space, storage,
+                                                      self)
+
+    def _resize_hint(self, w_list, hint):
+        assert hint >= 0
+
+    def copy_into(self, w_list, w_other):
+        w_other.strategy = self
+        w_other.lstorage = w_list.lstorage
+
+    def find(self, w_list, w_obj, start, stop):
+        base = self.base
+        if base.is_correct_type(w_obj):
+            obj = base.unwrap(w_obj)
+            items, offset, length = self.unerase(w_list.lstorage)
+            for i in range(start, min(stop, length)):
+                if items[offset + i] == obj:
+                    return i
+            raise ValueError
+        return ListStrategy.find(self, w_list, w_obj, start, stop)
+
+    def length(self, w_list):
+        _, _, length = self.unerase(w_list.lstorage)
+        return length
+
+    def getitem(self, w_list, index):
+        items, start, length = self.unerase(w_list.lstorage)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError
+        return self.base.wrap(items[start + index])
+
+    def getslice(self, w_list, start, stop, step, length):
+        items, offset, _ = self.unerase(w_list.lstorage)
+        # compare with the shared 'items', not with the length of this
+        # view: a small view must not keep a big buffer alive
+        if (step == 1 and length >= SLICE_VIEW_MIN_LENGTH and
+                length * 2 >= len(items)):
+            storage = self.erase((items, offset + start, length))
+            return W_ListObject.from_storage_and_strategy(
+                    self.space, storage, self)
+        base = self.base
+        subitems = [base._none_value] * length
+        index = offset + start
+        for i in range(length):
+            subitems[i] = items[index]
+            index += step
+        return W_ListObject.from_storage_and_strategy(
+                self.space, base.erase(subitems), base)
+
+    @jit.look_inside_iff(lambda self, w_list:
+            jit.loop_unrolling_heuristic(w_list, w_list.length(),
+                                         UNROLL_CUTOFF))
+    def getitems_copy(self, w_list):
+        base = self.base
+        return [base.wrap(item) for item in self._copy_items(w_list)]
+
+    @jit.unroll_safe
+    def getitems_unroll(self, w_list):
+        base = self.base
+        return [base.wrap(item) for item in self._copy_items(w_list)]
+
+    @jit.look_inside_iff(lambda self, w_list:
+            jit.loop_unrolling_heuristic(w_list, w_list.length(),
+                                         UNROLL_CUTOFF))
+    def getitems_fixedsize(self, w_list):
+        return self.getitems_unroll(w_list)
+
+    def getstorage_copy(self, w_list):
+        # tuple is immutable
+        return w_list.lstorage
+
+    def mul(self, w_list, times):
+        base = self.base
+        storage = base.erase(self._copy_items(w_list) * times)
+        return W_ListObject.from_storage_and_strategy(self.space, storage,
+                                                      base)
+
+    def _shrink(self, w_list, items, start, length):
+        w_list.lstorage = self.erase((items, start, length))
+        # like in getslice(): a small view must not keep a big buffer alive
+        if length < SLICE_VIEW_MIN_LENGTH or length * 2 < len(items):
+            self.materialize(w_list)
+
+    def pop_end(self, w_list):
+        items, start, length = self.unerase(w_list.lstorage)
+        if length == 0:
+            raise IndexError
+        self._shrink(w_list, items, start, length - 1)
+        return self.base.wrap(items[start + length - 1])
+
+    def pop(self, w_list, index):
+        items, start, length = self.unerase(w_list.lstorage)
+        if index == 0 and length > 0:
+            # popping from the front only moves the start of the view
+            self._shrink(w_list, items, start + 1, length - 1)
+            return self.base.wrap(items[start])
+        self.materialize(w_list)
+        return w_list.pop(index)
+
+    def append(self, w_list, w_item):
+        self.materialize(w_list)
+        w_list.append(w_item)
+
+    def inplace_mul(self, w_list, times):
+        self.materialize(w_list)
+        w_list.inplace_mul(times)
+
+    def deleteslice(self, w_list, start, step, slicelength):
+        self.materialize(w_list)
+        w_list.deleteslice(start, step, slicelength)
+
+    def setitem(self, w_list, index, w_item):
+        self.materialize(w_list)
+        w_list.setitem(index, w_item)
+
+    def setslice(self, w_list, start, step, slicelength, sequence_w):
+        self.materialize(w_list)
+        w_list.setslice(start, step, slicelength, sequence_w)
+
+    def insert(self, w_list, index, w_item):
+        self.materialize(w_list)
+        w_list.insert(index, w_item)
+
+    def extend(self, w_list, w_any):
+        self.materialize(w_list)
+        w_list.extend(w_any)
+
+    def reverse(self, w_list):
+        self.materialize(w_list)
+        w_list.reverse()
+
+    def sort(self, w_list, reverse):
+        space = self.space
+        self.materialize(w_list)
+        # not w_list.sort(): ObjectListStrategy has no sort() method
+        w_list.descr_sort(space, space.w_None, space.w_None, reverse)
+
+
+class ObjectSliceViewListStrategy(BaseSliceViewListStrategy):
+    import_from_mixin(AbstractSliceViewStrategy)
+
+    _base_cls = ObjectListStrategy
+
+    erase, unerase = rerased.new_erasing_pair("object_slice")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def find(self, w_list, w_obj, start, stop):
+        return ListStrategy.find(self, w_list, w_obj, start, stop)
+
+
+class IntegerSliceViewListStrategy(BaseSliceViewListStrategy):
+    import_from_mixin(AbstractSliceViewStrategy)
+
+    _base_cls = IntegerListStrategy
+
+    erase, unerase = rerased.new_erasing_pair("integer_slice")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def getitems_int(self, w_list):
+        return self._copy_items(w_list)
+
+
+class FloatSliceViewListStrategy(BaseSliceViewListStrategy):
+    import_from_mixin(AbstractSliceViewStrategy)
+
+    _base_cls = FloatListStrategy
+
+    erase, unerase = rerased.new_erasing_pair("float_slice")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def find(self, w_list, w_obj, start, stop):
+        if self.base.is_correct_type(w_obj):
+            # same semantics as FloatListStrategy._safe_find(), which
+            # finds NaNs by comparing their bits
+            return self.base._safe_find(self.materialized_copy(w_list),
+                                        self.base.unwrap(w_obj), start, stop)
+        return ListStrategy.find(self, w_list, w_obj, start, stop)
+
+    def getitems_float(self, w_list):
+        return self._copy_items(w_list)
+
+
+class BytesSliceViewListStrategy(BaseSliceViewListStrategy):
+    import_from_mixin(AbstractSliceViewStrategy)
+
+    _base_cls = BytesListStrategy
+
+    erase, unerase = rerased.new_erasing_pair("bytes_slice")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def getitems_bytes(self, w_list):
+        return self._copy_items(w_list)
+
+
+class UnicodeSliceViewListStrategy(BaseSliceViewListStrategy):
+    import_from_mixin(AbstractSliceViewStrategy)
+
+    _base_cls = UnicodeListStrategy
+
+    erase, unerase = rerased.new_erasing_pair("unicode_slice")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def getitems_unicode(self, w_list):
+        return self._copy_items(w_list)
+
+
+ObjectListStrategy._slice_view_cls = ObjectSliceViewListStrategy
+IntegerListStrategy._slice_view_cls = IntegerSliceViewListStrategy
+FloatListStrategy._slice_view_cls = FloatSliceViewListStrategy
+BytesListStrategy._slice_view_cls = BytesSliceViewListStrategy
+UnicodeListStrategy._slice_view_cls = UnicodeSliceViewListStrategy
+
 # _______________________________________________________
 
 init_signature = Signature(['sequence'], None, None)
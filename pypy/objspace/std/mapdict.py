@@ -1,7 +1,8 @@
 import weakref, sys
 
 from rpython.rlib import jit, objectmodel, debug, rerased
-from rpython.rlib.rarithmetic import intmask, r_uint
+from rpython.rlib.longlong2float import longlong2float, float2longlong
+from rpython.rlib.rarithmetic import intmask, r_uint, r_longlong
 
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.objspace.std.dictmultiobject import (
@@ -9,6 +10,8 @@ from pypy.objspace.std.dictmultiobject import (
     BaseValueIterator, BaseItemIterator, _never_equal_to_string,
     W_DictObject, BytesDictStrategy, UnicodeDictStrategy
 )
+from pypy.objspace.std.floatobject import W_FloatObject
+from pypy.objspace.std.intobject import W_IntObject
 from pypy.objspace.std.typeobject import MutableCell
 
 
@@ -29,6 +32,11 @@ NUM_DIGITS_POW2 = 1 << NUM_DIGITS
 # dict)
 LIMIT_MAP_ATTRIBUTES = 80
 
+# how the value of an attribute is stored, see UnboxedPlainAttribute
+BOXED = 0
+UNBOXED_INT = 1
+UNBOXED_FLOAT = 2
+
 
 class AbstractAttribute(object):
     _immutable_fields_ = ['terminator']
@@ -47,11 +55,12 @@ class AbstractAttribute(object):
         if (
             jit.isconstant(attr.storageindex) and
             jit.isconstant(obj) and
-            not attr.ever_mutated
+            not attr.ever_mutated and
+            not isinstance(attr, UnboxedPlainAttribute)
         ):
             return self._pure_mapdict_read_storage(obj, attr.storageindex)
         else:
-            return obj._mapdict_read_storage(attr.storageindex)
+            return attr._direct_read(obj)
 
     @jit.elidable
     def _pure_mapdict_read_storage(self, obj, storageindex):
@@ -63,7 +72,7 @@ class AbstractAttribute(object):
             return self.terminator._write_terminator(obj, name, index, w_value)
         if not attr.ever_mutated:
             attr.ever_mutated = True
-        obj._mapdict_write_storage(attr.storageindex, w_value)
+        attr._direct_write(obj, w_value)
         return True
 
     def delete(self, obj, name, index):
@@ -133,15 +142,31 @@ class AbstractAttribute(object):
     def search(self, attrtype):
         return None
 
+    def _find_unboxed_attr(self):
+        return None
+
+    def _get_storage_type(self, index, w_value):
+        # decide how an attribute with the value 'w_value' is stored
+        if index != DICT or not self.terminator.allow_unboxing:
+            return BOXED
+        if type(w_value) is W_IntObject:
+            return UNBOXED_INT
+        if type(w_value) is W_FloatObject:
+            return UNBOXED_FLOAT
+        return BOXED
+
     @jit.elidable
-    def _get_new_attr(self, name, index):
+    def _get_new_attr(self, name, index, storagetype):
         cache = self.cache_attrs
         if cache is None:
             cache = self.cache_attrs = {}
-        attr = cache.get((name, index), None)
+        attr = cache.get((name, index, storagetype), None)
         if attr is None:
-            attr = PlainAttribute(name, index, self)
-            cache[name, index] = attr
+            if storagetype == BOXED:
+                attr = PlainAttribute(name, index, self)
+            else:
+                attr = UnboxedPlainAttribute(name, index, self, storagetype)
+            cache[name, index, storagetype] = attr
         return attr
 
     def add_attr(self, obj, name, index, w_value):
@@ -155,7 +180,8 @@ class AbstractAttribute(object):
             oldattr._size_estimate = size_est
 
     def _add_attr_without_reordering(self, obj, name, index, w_value):
-        attr = self._get_new_attr(name, index)
+        storagetype = self._get_storage_type(index, w_value)
+        attr = self._get_new_attr(name, index, storagetype)
         attr._switch_map_and_write_storage(obj, w_value)
 
     @jit.unroll_safe
@@ -174,13 +200,13 @@ class AbstractAttribute(object):
 
 
     @jit.elidable
-    def _find_branch_to_move_into(self, name, index):
+    def _find_branch_to_move_into(self, name, index, storagetype):
         # walk up the map chain to find an ancestor with lower order that
         # already has the current name as a child inserted
         current_order = sys.maxint
         number_to_readd = 0
         current = self
-        key = (name, index)
+        key = (name, index, storagetype)
         while True:
             attr = None
             if current.cache_attrs is not None:
@@ -189,7 +215,7 @@ class AbstractAttribute(object):
                 # we reached the top, so we didn't find it anywhere,
                 # just add it to the top attribute
                 if not isinstance(current, PlainAttribute):
-                    return 0, self._get_new_attr(name, index)
+                    return 0, self._get_new_attr(name, index, storagetype)
 
             else:
                 return number_to_readd, attr
@@ -226,7 +252,9 @@ class AbstractAttribute(object):
         stack_index = 0
         while True:
             current = self
-            number_to_readd, attr = self._find_branch_to_move_into(name, index)
+            storagetype = self._get_storage_type(index, w_value)
+            number_to_readd, attr = self._find_branch_to_move_into(
+                    name, index, storagetype)
             # we found the attributes further up, need to save the
             # previous values of the attributes we passed
             if number_to_readd:
@@ -235,8 +263,7 @@ class AbstractAttribute(object):
                 current = self
                 for i in range(number_to_readd):
                     assert isinstance(current, PlainAttribute)
-                    w_self_value = obj._mapdict_read_storage(
-                            current.storageindex)
+                    w_self_value = current._direct_read(obj)
                     stack[stack_index] = erase_map(current)
                     stack[stack_index + 1] = erase_item(w_self_value)
                     stack_index += 2
@@ -268,11 +295,15 @@ class AbstractAttribute(object):
 
 
 class Terminator(AbstractAttribute):
-    _immutable_fields_ = ['w_cls']
+    _immutable_fields_ = ['w_cls', 'allow_unboxing?']
 
     def __init__(self, space, w_cls):
         AbstractAttribute.__init__(self, space, self)
         self.w_cls = w_cls
+        # cleared as soon as an unboxed attribute of an instance gets a
+        # value of a different type; from then on, attributes of the
+        # instances are stored boxed
+        self.allow_unboxing = space.config.objspace.std.withunboxedattributes
 
     def _read_terminator(self, obj, name, index):
         return None
@@ -386,6 +417,15 @@ class PlainAttribute(AbstractAttribute):
         self.ever_mutated = False
         self.order = len(back.cache_attrs) if back.cache_attrs else 0
 
+    def _direct_read(self, obj):
+        return obj._mapdict_read_storage(self.storageindex)
+
+    def _direct_write(self, obj, w_value):
+        obj._mapdict_write_storage(self.storageindex, w_value)
+
+    def _find_unboxed_attr(self):
+        return self.back._find_unboxed_attr()
+
     def _copy_attr(self, obj, new_obj):
         w_value = self.read(obj, self.name, self.index)
         new_obj._get_mapdict_map().add_attr(new_obj, self.name, self.index, w_value)
@@ -423,7 +463,7 @@ class PlainAttribute(AbstractAttribute):
         new_obj = self.back.materialize_r_dict(space, obj, dict_w)
         if self.index == DICT:
             w_attr = space.newtext(self.name)
-            dict_w[w_attr] = obj._mapdict_read_storage(self.storageindex)
+            dict_w[w_attr] = self._direct_read(obj)
         else:
             self._copy_attr(obj, new_obj)
         return new_obj
@@ -431,7 +471,7 @@ class PlainAttribute(AbstractAttribute):
     def materialize_str_dict(self, space, obj, str_dict):
         new_obj = self.back.materialize_str_dict(space, obj, str_dict)
         if self.index == DICT:
-            str_dict[self.name] = obj._mapdict_read_storage(self.storageindex)
+            str_dict[self.name] = self._direct_read(obj)
         else:
             self._copy_attr(obj, new_obj)
         return new_obj
@@ -445,6 +485,119 @@ class PlainAttribute(AbstractAttribute):
     def __repr__(self):
         return "<PlainAttribute %s %s %s %r>" % (self.name, self.index, self.storageindex, self.back)
 
+class UnboxedStorage(W_Root):
+    # the raw values of all the unboxed attributes of an instance, stored
+    # in a single item of the instance's storage; ints are stored as the
+    # float with the same bit pattern.  It is a W_Root only because the
+    # storage is a list of W_Roots: it has no typedef, so the gc module
+    # never returns it as an app-level object (like WeakrefLifeline)
+    typedef = None
+
+    def __init__(self, length):
+        self.values = [0.0] * length
+
+def _get_unboxed_storage(obj, storageindex):
+    w_storage = obj._mapdict_read_storage(storageindex)
+    assert isinstance(w_storage, UnboxedStorage)
+    return w_storage
+
+def _read_unboxed(space, obj, storageindex, listindex, storagetype):
+    value = _get_unboxed_storage(obj, storageindex).values[listindex]
+    if storagetype == UNBOXED_INT:
+        return space.newint(intmask(float2longlong(value)))
+    return space.newfloat(value)
+
+class UnboxedPlainAttribute(PlainAttribute):
+    """ An attribute whose value is an exact int or float, stored unboxed
+    in an UnboxedStorage.  The first unboxed attribute of a map chain adds
+    the UnboxedStorage to the storage, the following ones only add an item
+    to it.  If a value of another type is written, the instance switches to
+    a map with boxed attributes only, and so do all the later instances of
+    the same class. """
+    _immutable_fields_ = ['storagetype', 'listindex', 'firstunboxed',
+                          '_length']
+
+    def __init__(self, name, index, back, storagetype):
+        # don't call PlainAttribute.__init__: we compute a different length
+        AbstractAttribute.__init__(self, back.space, back.terminator)
+        self.name = name
+        self.index = index
+        self.back = back
+        self.storagetype = storagetype
+        prev = back._find_unboxed_attr()
+        if prev is None:
+            self.firstunboxed = True
+            self.storageindex = back.length()
+            self.listindex = 0
+            self._length = self.storageindex + 1
+        else:
+            self.firstunboxed = False
+            self.storageindex = prev.storageindex
+            self.listindex = prev.listindex + 1
+            self._length = back.length()
+        self._size_estimate = self.length() * NUM_DIGITS_POW2
+        self.ever_mutated = False
+        self.order = len(back.cache_attrs) if back.cache_attrs else 0
+
+    def length(self):
+        return self._length
+
+    def _find_unboxed_attr(self):
+        return self
+
+    def _get_unboxed_storage(self, obj):
+        return _get_unboxed_storage(obj, self.storageindex)
+
+    def _direct_read(self, obj):
+        return _read_unboxed(self.space, obj, self.storageindex,
+                             self.listindex, self.storagetype)
+
+    def _unbox(self, w_value):
+        if self.storagetype == UNBOXED_INT:
+            assert isinstance(w_value, W_IntObject)
+            return longlong2float(r_longlong(w_value.intval))
+        assert isinstance(w_value, W_FloatObject)
+        return w_value.floatval
+
+    def _can_store(self, w_value):
+        if self.storagetype == UNBOXED_INT:
+            return type(w_value) is W_IntObject
+        return type(w_value) is W_FloatObject
+
+    def _direct_write(self, obj, w_value):
+        if not self._can_store(w_value):
+            self._switch_to_boxed(obj)
+            obj._get_mapdict_map().write(obj, self.name, self.index, w_value)
+            return
+        self._get_unboxed_storage(obj).values[self.listindex] = (
+                self._unbox(w_value))
+
+    @jit.dont_look_inside
+    def _switch_to_boxed(self, obj):
+        self.terminator.allow_unboxing = False
+        new_obj = obj._get_mapdict_map().copy(obj)
+        obj._set_mapdict_storage_and_map(new_obj.storage, new_obj.map)
+
+    def _switch_map_and_write_storage(self, obj, w_value):
+        value = self._unbox(w_value)
+        if self.firstunboxed:
+            w_storage = UnboxedStorage(1)
+            PlainAttribute._switch_map_and_write_storage(self, obj, w_storage)
+        else:
+            obj._set_mapdict_map(self)
+            w_storage = self._get_unboxed_storage(obj)
+            if len(w_storage.values) <= self.listindex:
+                values = [0.0] * (self.listindex + 1)
+                for i in range(len(w_storage.values)):
+                    values[i] = w_storage.values[i]
+                w_storage.values = values
+        w_storage.values[self.listindex] = value
+
+    def __repr__(self):
+        return "<UnboxedPlainAttribute %s %s %s %s %r>" % (
+            self.name, self.index, self.storageindex, self.listindex,
+            self.back)
+
 class MapAttrCache(object):
     def __init__(self, space):
         SIZE = 1 << space.config.objspace.std.methodcachesizeexp
@@ -962,6 +1115,8 @@ class MapDictIteratorItems(BaseItemIterator):
 class CacheEntry(object):
     version_tag = None
     storageindex = 0
+    listindex = 0
+    storagetype = BOXED
     w_method = None # for callmethod
     success_counter = 0
     failure_counter = 0
@@ -994,7 +1149,8 @@ def init_mapdict_cache(pycode):
     pycode._mapdict_caches = [INVALID_CACHE_ENTRY] * num_entries
 
 @jit.dont_look_inside
-def _fill_cache(pycode, nameindex, map, version_tag, storageindex, w_method=None):
+def _fill_cache(pycode, nameindex, map, version_tag, storageindex, w_method=None,
+                listindex=0, storagetype=BOXED):
     if not pycode.space._side_effects_ok():
         return
     entry = pycode._mapdict_caches[nameindex]
@@ -1004,6 +1160,8 @@ def _fill_cache(pycode, nameindex, map, version_tag, storageindex, w_method=None
     entry.map_wref = weakref.ref(map)
     entry.version_tag = version_tag
     entry.storageindex = storageindex
+    entry.listindex = listindex
+    entry.storagetype = storagetype
     entry.w_method = w_method
     if pycode.space.config.objspace.std.withmethodcachecounter:
         entry.failure_counter += 1
@@ -1015,7 +1173,10 @@ def LOAD_ATTR_caching(pycode, w_obj, nameindex):
     map = w_obj._get_mapdict_map()
     if entry.is_valid_for_map(map) and entry.w_method is None:
         # everything matches, it's incredibly fast
-        return w_obj._mapdict_read_storage(entry.storageindex)
+        if entry.storagetype == BOXED:
+            return w_obj._mapdict_read_storage(entry.storageindex)
+        return _read_unboxed(pycode.space, w_obj, entry.storageindex,
+                             entry.listindex, entry.storagetype)
     return LOAD_ATTR_slowpath(pycode, w_obj, nameindex, map)
 LOAD_ATTR_caching._always_inline_ = True
 
@@ -1061,8 +1222,14 @@ def LOAD_ATTR_slowpath(pycode, w_obj, nameindex, map):
                     # Note that if map.terminator is a DevolvedDictTerminator
                     # or the class provides its own dict, not using mapdict, then:
                     # map.find_map_attr will always return None if index==DICT.
-                    _fill_cache(pycode, nameindex, map, version_tag, attr.storageindex)
-                    return w_obj._mapdict_read_storage(attr.storageindex)
+                    if isinstance(attr, UnboxedPlainAttribute):
+                        _fill_cache(pycode, nameindex, map, version_tag,
+                                    attr.storageindex, None, attr.listindex,
+                                    attr.storagetype)
+                    else:
+                        _fill_cache(pycode, nameindex, map, version_tag,
+                                    attr.storageindex)
+                    return attr._direct_read(w_obj)
     if space.config.objspace.std.withmethodcachecounter:
         INVALID_CACHE_ENTRY.failure_counter += 1
     return space.getattr(w_obj, w_name)
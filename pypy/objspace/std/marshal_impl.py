@@ -341,6 +341,7 @@ def marshal_pycode(space, w_pycode, m):
     m.start(TYPE_CODE)
     # see pypy.interpreter.pycode for the layout
     x = space.interp_w(PyCode, w_pycode)
+    x.load_lazy_consts()
     m.put_int(x.co_argcount)
     m.put_int(x.co_nlocals)
     m.put_int(x.co_stacksize)
@@ -380,7 +381,7 @@ def unmarshal_pycode(space, u, tc):
     flags       = u.get_int()
     code        = unmarshal_str(u)
     u.start(TYPE_TUPLE)
-    consts_w    = u.get_tuple_w()
+    consts_w, lazy_consts = u.get_code_consts_w()
     # copy in order not to merge it with anything else
     names       = unmarshal_strlist(u, TYPE_TUPLE)
     varnames    = unmarshal_strlist(u, TYPE_TUPLE)
@@ -390,9 +391,61 @@ def unmarshal_pycode(space, u, tc):
     name        = unmarshal_str(u)
     firstlineno = u.get_int()
     lnotab      = unmarshal_str(u)
+    if lazy_consts is not None:
+        lazy_consts.filename = filename
     return PyCode(space, argcount, nlocals, stacksize, flags,
                   code, consts_w[:], names, varnames, filename,
-                  name, firstlineno, lnotab, freevars, cellvars)
+                  name, firstlineno, lnotab, freevars, cellvars,
+                  lazy_consts=lazy_consts)
+
+
+def skip_w_obj(space, u):
+    """Skip over the next object in the marshal data without building it.
+    Only the interned strings are built, because the rest of the data
+    may refer to them.  Returns False if the object was a NULL.
+    """
+    tc = u.get1()
+    if tc == TYPE_NULL:
+        return False
+    elif tc in (TYPE_NONE, TYPE_FALSE, TYPE_TRUE, TYPE_STOPITER,
+                TYPE_ELLIPSIS):
+        pass
+    elif tc == TYPE_INT or tc == TYPE_STRINGREF:
+        u.get(4)
+    elif tc == TYPE_INT64 or tc == TYPE_BINARY_FLOAT:
+        u.get(8)
+    elif tc == TYPE_BINARY_COMPLEX:
+        u.get(16)
+    elif tc == TYPE_FLOAT:
+        u.get_pascal()
+    elif tc == TYPE_COMPLEX:
+        u.get_pascal()
+        u.get_pascal()
+    elif tc == TYPE_LONG:
+        lng = u.get_int()
+        if lng < 0:
+            lng = -lng
+        u.get(2 * lng)
+    elif tc == TYPE_STRING or tc == TYPE_UNICODE:
+        u.get_str()
+    elif tc == TYPE_INTERNED:
+        u.stringtable_w.append(space.new_interned_str(u.get_str()))
+    elif tc in (TYPE_TUPLE, TYPE_LIST, TYPE_SET, TYPE_FROZENSET):
+        lng = u.get_lng()
+        for i in range(lng):
+            skip_w_obj(space, u)
+    elif tc == TYPE_DICT:
+        while skip_w_obj(space, u):   # key
+            skip_w_obj(space, u)      # value
+    elif tc == TYPE_CODE:
+        u.get(16)                     # argcount, nlocals, stacksize, flags
+        for i in range(8):            # code, consts, ..., filename, name
+            skip_w_obj(space, u)
+        u.get(4)                      # firstlineno
+        skip_w_obj(space, u)          # lnotab
+    else:
+        u.raise_exc("bad marshal data (unknown type code)")
+    return True
 
 
 @marshaller(W_UnicodeObject)
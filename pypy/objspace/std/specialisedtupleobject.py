@@ -1,6 +1,10 @@
 from pypy.interpreter.error import oefmt
-from pypy.objspace.std.tupleobject import W_AbstractTupleObject
+from pypy.objspace.std.tupleobject import (
+    W_AbstractTupleObject, UNROLL_CUTOFF, _unroll_condition,
+    _unroll_condition_cmp)
 from pypy.objspace.std.util import negate
+from rpython.rlib import jit
+from rpython.rlib.debug import make_sure_not_resized
 from rpython.rlib.objectmodel import specialize
 from rpython.rlib.rarithmetic import intmask
 from rpython.rlib.unroll import unrolling_iterable
@@ -137,12 +141,113 @@ def make_specialised_class(typetuple):
     _specialisations.append(cls)
     return cls
 
+def make_homogeneous_class(typ):
+    """Build a tuple class of any length whose items are all of the
+    given type, stored unboxed in a fixed-size list.
+    """
+    if typ == int:
+        wrap = lambda space, x: space.newint(x)
+    elif typ == float:
+        wrap = lambda space, x: space.newfloat(x)
+    else:
+        assert 0
+
+    class cls(W_AbstractTupleObject):
+        _immutable_fields_ = ['values[*]']
+
+        def __init__(self, space, values):
+            make_sure_not_resized(values)
+            self.space = space
+            self.values = values
+
+        def length(self):
+            return len(self.values)
+
+        @jit.look_inside_iff(_unroll_condition)
+        def tolist(self):
+            values = self.values
+            list_w = [None] * len(values)
+            for i in range(len(values)):
+                list_w[i] = wrap(self.space, values[i])
+            return list_w
+
+        # same source code, but builds and returns a resizable list
+        getitems_copy = func_with_new_name(tolist, 'getitems_copy')
+
+        @jit.look_inside_iff(lambda self, _1: _unroll_condition(self))
+        def descr_hash(self, space):
+            # same algorithm as W_TupleObject, without boxing the items
+            from pypy.objspace.std.floatobject import _hash_float
+            from pypy.objspace.std.intobject import _hash_int
+            mult = 1000003
+            x = 0x345678
+            z = len(self.values)
+            for value in self.values:
+                if typ == float:
+                    y = _hash_float(space, value)
+                else:
+                    y = _hash_int(value)
+                x = (x ^ y) * mult
+                z -= 1
+                mult += 82520 + z + z
+            x += 97531
+            return space.newint(intmask(x))
+
+        def descr_eq(self, space, w_other):
+            if not isinstance(w_other, W_AbstractTupleObject):
+                return space.w_NotImplemented
+            if self.length() != w_other.length():
+                return space.w_False
+            if not isinstance(w_other, cls):
+                return self._descr_eq_generic(space, w_other)
+            return self._descr_eq_unboxed(space, w_other)
+
+        @jit.look_inside_iff(_unroll_condition_cmp)
+        def _descr_eq_generic(self, space, w_other):
+            items_w = w_other.tolist()
+            for i in range(len(self.values)):
+                w_value = wrap(self.space, self.values[i])
+                if not space.eq_w(w_value, items_w[i]):
+                    return space.w_False
+            return space.w_True
+
+        @jit.look_inside_iff(_unroll_condition_cmp)
+        def _descr_eq_unboxed(self, space, w_other):
+            values1 = self.values
+            values2 = w_other.values
+            for i in range(len(values1)):
+                myval = values1[i]
+                otherval = values2[i]
+                if myval != otherval:
+                    if typ == float:
+                        # issue with NaNs, which should be equal here
+                        if float2longlong(myval) == float2longlong(otherval):
+                            continue
+                    return space.w_False
+            return space.w_True
+
+        descr_ne = negate(descr_eq)
+
+        def getitem(self, space, index):
+            values = self.values
+            if index < 0:
+                index += len(values)
+            if not 0 <= index < len(values):
+                raise oefmt(space.w_IndexError, "tuple index out of range")
+            return wrap(self.space, values[index])
+
+    cls.__name__ = 'W_SpecialisedTupleObject_%ss' % (typ.__name__,)
+    _specialisations.append(cls)
+    return cls
+
 # ---------- current specialized versions ----------
 
 _specialisations = []
 Cls_ii = make_specialised_class((int, int))
 Cls_oo = make_specialised_class((object, object))
 Cls_ff = make_specialised_class((float, float))
+Cls_ints = make_homogeneous_class(int)
+Cls_floats = make_homogeneous_class(float)
 
 def makespecialisedtuple(space, list_w):
     from pypy.objspace.std.intobject import W_IntObject
@@ -156,8 +261,41 @@ def makespecialisedtuple(space, list_w):
             if type(w_arg2) is W_FloatObject:
                 return Cls_ff(space, space.float_w(w_arg1), space.float_w(w_arg2))
         return Cls_oo(space, w_arg1, w_arg2)
-    else:
-        raise NotSpecialised
+    elif len(list_w) > 2:
+        w_arg1 = list_w[0]
+        if type(w_arg1) is W_IntObject:
+            intlist = _unbox_all_ints(space, list_w)
+            if intlist is not None:
+                return Cls_ints(space, intlist)
+        elif type(w_arg1) is W_FloatObject:
+            floatlist = _unbox_all_floats(space, list_w)
+            if floatlist is not None:
+                return Cls_floats(space, floatlist)
+    raise NotSpecialised
+
+@jit.look_inside_iff(lambda space, list_w: jit.loop_unrolling_heuristic(
+        list_w, len(list_w), UNROLL_CUTOFF))
+def _unbox_all_ints(space, list_w):
+    from pypy.objspace.std.intobject import W_IntObject
+    result = [0] * len(list_w)
+    for i in range(len(list_w)):
+        w_item = list_w[i]
+        if type(w_item) is not W_IntObject:
+            return None
+        result[i] = space.int_w(w_item)
+    return result
+
+@jit.look_inside_iff(lambda space, list_w: jit.loop_unrolling_heuristic(
+        list_w, len(list_w), UNROLL_CUTOFF))
+def _unbox_all_floats(space, list_w):
+    from pypy.objspace.std.floatobject import W_FloatObject
+    result = [0.0] * len(list_w)
+    for i in range(len(list_w)):
+        w_item = list_w[i]
+        if type(w_item) is not W_FloatObject:
+            return None
+        result[i] = space.float_w(w_item)
+    return result
 
 # --------------------------------------------------
 # Special code based on list strategies to implement zip(),
@@ -0,0 +1,108 @@
+"""The 'withstrbuf' implementation of str: a string built by '+='"""
+
+import inspect
+
+import py
+
+from rpython.rlib.buffer import StringBuffer
+from rpython.rlib.rstring import StringBuilder
+
+from pypy.interpreter.buffer import SimpleView
+from pypy.interpreter.error import OperationError
+from pypy.objspace.std.bytesobject import (
+    W_AbstractBytesObject, W_BytesObject)
+
+
+class W_StringBufferObject(W_AbstractBytesObject):
+    """A str whose content is the first 'length' characters of 'builder'.
+
+    Several W_StringBufferObjects can share the same builder: adding to
+    the most recent one appends in-place to the builder, so a chain of
+    's += x' only copies every piece once.  The content is turned into a
+    regular W_BytesObject the first time an operation needs it.
+    """
+    w_str = None
+
+    def __init__(self, builder):
+        self.builder = builder             # StringBuilder
+        self.length = builder.getlength()
+
+    def force(self):
+        if self.w_str is None:
+            s = self.builder.build()
+            if self.length < len(s):
+                s = s[:self.length]
+            self.w_str = W_BytesObject(s)
+            return s
+        else:
+            return self.w_str._value
+
+    def force_w(self):
+        self.force()
+        return self.w_str
+
+    def __repr__(self):
+        """representation for debugging purposes"""
+        return "%s(%r[:%d])" % (
+            self.__class__.__name__, self.builder, self.length)
+
+    def unwrap(self, space):
+        return self.force()
+
+    def str_w(self, space):
+        return self.force()
+
+    def buffer_w(self, space, flags):
+        space.check_buf_flags(flags, True)
+        return SimpleView(StringBuffer(self.force()))
+
+    def readbuf_w(self, space):
+        return StringBuffer(self.force())
+
+    def descr_len(self, space):
+        return space.newint(self.length)
+
+    def descr_add(self, space, w_other):
+        if not isinstance(w_other, W_AbstractBytesObject):
+            return self.force_w().descr_add(space, w_other)
+        try:
+            other = W_BytesObject._op_val(space, w_other)
+        except OperationError as e:
+            if e.match(space, space.w_TypeError):
+                return space.w_NotImplemented
+            raise
+        if self.builder.getlength() != self.length:
+            # somebody else already appended to our builder: start a new one
+            builder = StringBuilder()
+            builder.append(self.force())
+        else:
+            builder = self.builder
+        builder.append(other)
+        return W_StringBufferObject(builder)
+
+    def descr_str(self, space):
+        # you cannot get subclasses of W_StringBufferObject here
+        assert type(self) is W_StringBufferObject
+        return self
+
+
+def _delegate_to_str(name):
+    func = getattr(W_AbstractBytesObject, name).im_func
+    args = inspect.getargs(func.func_code)
+    argspec = ', '.join(args.args[1:])
+    func_code = py.code.Source("""
+    def %(name)s(self, %(args)s):
+        return self.force_w().%(name)s(%(args)s)
+    """ % {'name': name, 'args': argspec})
+    d = {}
+    exec func_code.compile() in d
+    return d[name]
+
+# all the other methods are implemented by forcing the string first
+for _name in W_AbstractBytesObject.__dict__:
+    if (_name.startswith('descr_') and
+            _name not in W_StringBufferObject.__dict__):
+        setattr(W_StringBufferObject, _name, _delegate_to_str(_name))
+del _name
+
+W_StringBufferObject.typedef = W_BytesObject.typedef
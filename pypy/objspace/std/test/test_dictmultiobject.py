@@ -1157,6 +1157,58 @@ class AppTestStrategies(object):
         assert "IntDictStrategy" in self.get_strategy(d)
         assert d[1L] == "hi"
 
+    def test_empty_to_float(self):
+        d = {}
+        d[1.5] = "a"
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        d[-0.0] = "b"
+        assert d[0.0] == "b"
+        assert d[1.5] == "a"
+        assert d.get(2.5) is None
+        assert d.get(None) is None and d.get("x") is None
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        # ints can be looked up without leaving the strategy
+        d[3.0] = "c"
+        assert d[3] == "c"
+        assert d.get(4) is None
+        assert 0 in d
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert sorted(d.keys()) == [-0.0, 1.5, 3.0]
+        assert type(d.keys()[0]) is float
+        assert str(sorted(d)[0]) == "-0.0"
+        d[3] = "d"
+        assert d[3.0] == "d"
+        assert type(d.keys()[-1]) is float
+        d[7] = "e"
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d[7.0] == "e"
+
+    def test_float_nan(self):
+        nan = float('nan')
+        d = {1.5: 1}
+        d[nan] = 2
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d[nan] == 2
+        d = {}
+        d[nan] = 1
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        d = {1.5: 1}
+        assert d.get(nan) is None
+        assert d == {1.5: 1}
+
+    def test_float_large_int(self):
+        d = {float(2 ** 53): 1}
+        assert d[2 ** 53] == 1
+        assert (2 ** 53 + 1) not in d
+        assert float(2 ** 53 + 1) in d
+
+    def test_int_pair_key_identity(self):
+        k = (1, 2)
+        d = {k: 0}
+        assert next(iter(d)) is k
+        assert id(d.keys()[0]) == id(k)
+        assert d.items()[0][0] is k
+
     def test_iter_dict_length_change(self):
         d = {1: 2, 3: 4, 5: 6}
         it = d.iteritems()
@@ -1185,6 +1237,94 @@ class AppTestStrategies(object):
         raises(RuntimeError, list, it)
 
 
+class AppTestSmallDictObject(AppTest_DictMultiObject):
+    spaceconfig = {"objspace.std.withsmalldicts": True}
+
+
+class AppTestSmallDictStrategy(object):
+    spaceconfig = {"objspace.std.withsmalldicts": True}
+
+    def setup_class(cls):
+        if cls.runappdirect:
+            py.test.skip("__repr__ doesn't work on appdirect")
+
+    def w_get_strategy(self, obj):
+        import __pypy__
+        r = __pypy__.internal_repr(obj)
+        return r[r.find("(") + 1: r.find(")")]
+
+    def test_grow_to_bytes(self):
+        d = {}
+        for i in range(8):
+            d[str(i)] = i
+        assert "SmallBytesDictStrategy" in self.get_strategy(d)
+        d["0"] = -1
+        assert "SmallBytesDictStrategy" in self.get_strategy(d)
+        d["8"] = 8
+        assert "SmallBytesDictStrategy" not in self.get_strategy(d)
+        assert "BytesDictStrategy" in self.get_strategy(d)
+        assert sorted(d.items()) == [("0", -1)] + [(str(i), i)
+                                                   for i in range(1, 9)]
+
+    def test_other_keys(self):
+        d = {"a": 1}
+        assert "SmallBytesDictStrategy" in self.get_strategy(d)
+        assert d.get(1) is None
+        assert "SmallBytesDictStrategy" in self.get_strategy(d)
+        d[u"b"] = 2
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d == {"a": 1, u"b": 2}
+
+    def test_order(self):
+        from __pypy__ import reversed_dict
+        d = {}
+        d["x"] = 1
+        d["y"] = 2
+        d["z"] = 3
+        del d["y"]
+        d["y"] = 4
+        assert d.items() == [("x", 1), ("z", 3), ("y", 4)]
+        assert list(reversed_dict(d)) == ["y", "z", "x"]
+        assert d.popitem() == ("y", 4)
+        assert d.pop("x") == 1
+        assert d.pop("x", 5) == 5
+        raises(KeyError, d.pop, "x")
+        assert d.setdefault("z", 6) == 3
+        assert d.setdefault("w", 7) == 7
+        assert list(d.iteritems()) == [("z", 3), ("w", 7)]
+        assert "SmallBytesDictStrategy" in self.get_strategy(d)
+
+    def test_kwargs(self):
+        def f(**kwargs):
+            return kwargs
+        d = {"a": 1, "b": 2}
+        assert f(**d) == d
+        assert dict(d, c=3) == {"a": 1, "b": 2, "c": 3}
+        assert d.copy() == d
+
+    def test_keys_bytes_strategy(self):
+        d = {"a": 1, "b": 2}
+        keys = d.keys()
+        assert keys == ["a", "b"]
+        assert "BytesListStrategy" in self.get_strategy(keys)
+
+
+class TestSmallDictStrategy(object):
+    spaceconfig = {"objspace.std.withsmalldicts": True}
+
+    def test_setitem_str_keeps_keys_unwrapped(self):
+        from pypy.objspace.std.dictmultiobject import SmallBytesDictStrategy
+        space = self.space
+        w_d = space.newdict()
+        w_d.setitem_str("a", space.newint(1))
+        space.setitem(w_d, space.newbytes("b"), space.newint(2))
+        strategy = w_d.get_strategy()
+        assert isinstance(strategy, SmallBytesDictStrategy)
+        assert strategy.unerase(w_d.dstorage).keys == ["a", "b"]
+        assert space.unwrap(space.call_method(w_d, "items")) == [
+            ("a", 1), ("b", 2)]
+
+
 class FakeWrapper(object):
     hash_count = 0
     def unwrap(self, space):
@@ -1294,6 +1434,7 @@ class Config:
         class std:
             methodcachesizeexp = 11
             withmethodcachecounter = False
+            withunboxedattributes = False
 
 FakeSpace.config = Config()
 
@@ -858,6 +858,42 @@ class AppTestListObject(object):
         assert x[10:3:-2] == [9,7,5]
         assert x[1:5:-1] == []
 
+    def test_long_slices_are_independent(self):
+        for base in [range(200), [float(i) for i in range(200)],
+                     [str(i) for i in range(200)], [None] * 200]:
+            l = list(base)
+            a = l[10:]
+            b = l[:]
+            c = a[5:150]
+            assert a == base[10:]
+            assert c == base[15:160]
+            a[0] = 'x'
+            assert l == base
+            assert b == base
+            assert c == base[15:160]
+            l.append('y')
+            del b[100:]
+            assert l == base + ['y']
+            assert a == ['x'] + base[11:]
+            assert b == base[:100]
+            assert c == base[15:160]
+            c.sort(reverse=True)
+            assert c == sorted(base[15:160], reverse=True)
+            assert c.pop(0) == max(base[15:160])
+            assert c.pop() == min(base[15:160])
+            assert l[::-1][1:191] == base[::-1][:190]
+            assert l == base + ['y']
+
+    def test_long_slice_index(self):
+        l = [float(i) for i in range(100)] + [float('nan')]
+        nan = l[-1]
+        a = l[1:]
+        assert a.index(nan) == 99
+        assert a.index(50.0) == 49
+        assert 50 in a
+        assert a.count(50) == 1
+        assert 'x' not in a
+
     def test_delall(self):
         l = l0 = [1,2,3]
         del l[:]
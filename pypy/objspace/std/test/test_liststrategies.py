@@ -4,7 +4,9 @@ from pypy.objspace.std.listobject import (
     W_ListObject, EmptyListStrategy, ObjectListStrategy, IntegerListStrategy,
     FloatListStrategy, BytesListStrategy, RangeListStrategy,
     SimpleRangeListStrategy, make_range_list, UnicodeListStrategy,
-    IntOrFloatListStrategy)
+    IntOrFloatListStrategy, ObjectSliceViewListStrategy,
+    IntegerSliceViewListStrategy, FloatSliceViewListStrategy,
+    SLICE_VIEW_MIN_LENGTH)
 from pypy.objspace.std import listobject
 from pypy.objspace.std.test.test_listobject import TestW_ListObject
 
@@ -1051,6 +1053,134 @@ class TestW_ListStrategies(TestW_ListObject):
         assert isinstance(w_item, space.StringObjectCls)
 
 
+    def test_slice_view(self):
+        space = self.space
+        n = SLICE_VIEW_MIN_LENGTH * 2
+        w_l = W_ListObject(space, [space.wrap(i) for i in range(n)])
+        w_s = w_l.getslice(1, n, 1, n - 1)
+        assert isinstance(w_s.strategy, IntegerSliceViewListStrategy)
+        assert isinstance(w_l.strategy, IntegerSliceViewListStrategy)
+        items_l = w_l.strategy.unerase(w_l.lstorage)[0]
+        assert w_s.strategy.unerase(w_s.lstorage)[0] is items_l
+        assert space.int_w(w_s.getitem(0)) == 1
+        assert space.int_w(w_s.getitem(-1)) == n - 1
+        assert w_s.getitems_int() == range(1, n)
+        # a slice of a view shares the items too
+        w_t = w_s.getslice(1, n - 1, 1, n - 2)
+        assert w_t.strategy.unerase(w_t.lstorage)[0] is items_l
+        # mutating one list copies its items first
+        w_s.setitem(0, space.wrap(-1))
+        assert isinstance(w_s.strategy, IntegerListStrategy)
+        assert space.int_w(w_s.getitem(0)) == -1
+        assert space.int_w(w_l.getitem(1)) == 1
+        assert space.int_w(w_t.getitem(0)) == 2
+        w_l.append(space.wrap(n))
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        assert w_l.length() == n + 1
+        assert w_t.length() == n - 2
+
+    def test_slice_view_short_slices_are_copied(self):
+        space = self.space
+        n = SLICE_VIEW_MIN_LENGTH * 4
+        w_l = W_ListObject(space, [space.wrap(i) for i in range(n)])
+        w_s = w_l.getslice(0, SLICE_VIEW_MIN_LENGTH - 1, 1,
+                           SLICE_VIEW_MIN_LENGTH - 1)
+        assert isinstance(w_s.strategy, IntegerListStrategy)
+        # the slice must be at least half of the list
+        w_s = w_l.getslice(0, n // 2 - 1, 1, n // 2 - 1)
+        assert isinstance(w_s.strategy, IntegerListStrategy)
+        w_s = w_l.getslice(0, n - 2, 2, n // 2 - 1)
+        assert isinstance(w_s.strategy, IntegerListStrategy)
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+
+    def test_slice_view_short_slices_of_views_are_copied(self):
+        space = self.space
+        n = SLICE_VIEW_MIN_LENGTH * 4
+        w_l = W_ListObject(space, [space.wrap(i) for i in range(n)])
+        w_v = w_l.getslice(0, n, 1, n)
+        assert isinstance(w_v.strategy, IntegerSliceViewListStrategy)
+        # a small slice of the view must not keep the whole items alive
+        w_s = w_v.getslice(8, 8 + SLICE_VIEW_MIN_LENGTH,
+                           1, SLICE_VIEW_MIN_LENGTH)
+        assert isinstance(w_s.strategy, IntegerListStrategy)
+        assert w_s.getitems_int() == range(8, 8 + SLICE_VIEW_MIN_LENGTH)
+        # the same for a view over a part of the items
+        w_t = w_v.getslice(0, n // 2, 1, n // 2)
+        assert isinstance(w_t.strategy, IntegerSliceViewListStrategy)
+        w_u = w_t.getslice(0, n // 2 - 1, 1, n // 2 - 1)
+        assert isinstance(w_u.strategy, IntegerListStrategy)
+
+    def test_slice_view_pop(self):
+        space = self.space
+        n = SLICE_VIEW_MIN_LENGTH * 2
+        w_l = W_ListObject(space, [space.wrap(float(i)) for i in range(n)])
+        w_s = w_l.getslice(0, n, 1, n)
+        assert isinstance(w_s.strategy, FloatSliceViewListStrategy)
+        assert space.float_w(w_s.pop(0)) == 0.0
+        assert space.float_w(w_s.pop_end()) == n - 1.0
+        assert isinstance(w_s.strategy, FloatSliceViewListStrategy)
+        assert w_s.getitems_float() == [float(i) for i in range(1, n - 1)]
+        assert w_l.getitems_float() == [float(i) for i in range(n)]
+
+    def test_slice_view_pop_releases_items(self):
+        space = self.space
+        n = SLICE_VIEW_MIN_LENGTH * 4
+        w_l = W_ListObject(space, [space.wrap(i) for i in range(n)])
+        w_s = w_l.getslice(0, n, 1, n)
+        for i in range(n // 2):
+            assert space.int_w(w_s.pop(0)) == i
+            assert isinstance(w_s.strategy, IntegerSliceViewListStrategy)
+        # less than half of the items are left: stop sharing them
+        assert space.int_w(w_s.pop(0)) == n // 2
+        assert isinstance(w_s.strategy, IntegerListStrategy)
+        assert w_s.getitems_int() == range(n // 2 + 1, n)
+        while w_s.length() > 0:
+            w_s.pop_end()
+        assert w_l.getitems_int() == range(n)
+
+    def test_slice_view_mutate_source(self):
+        space = self.space
+        n = SLICE_VIEW_MIN_LENGTH * 2
+        w_l = W_ListObject(space, [space.wrap(i) for i in range(n)])
+        w_s = w_l.getslice(1, n, 1, n - 1)
+        # the source list is a view too: mutating it copies all its items
+        w_l.setitem(1, space.wrap(-1))
+        assert isinstance(w_l.strategy, IntegerListStrategy)
+        assert isinstance(w_s.strategy, IntegerSliceViewListStrategy)
+        assert space.int_w(w_l.getitem(1)) == -1
+        assert w_s.getitems_int() == range(1, n)
+        # mutating the slice afterwards leaves the source alone
+        w_s.setitem(1, space.wrap(-2))
+        assert isinstance(w_s.strategy, IntegerListStrategy)
+        assert w_s.getitems_int() == [1, -2] + range(3, n)
+        assert w_l.getitems_int() == [0, -1] + range(2, n)
+
+    def test_slice_view_extend(self):
+        space = self.space
+        n = SLICE_VIEW_MIN_LENGTH * 2
+        w_l = W_ListObject(space, [space.wrap(i) for i in range(n)])
+        w_s = w_l.getslice(0, n, 1, n)
+        w_other = W_ListObject(space, [space.wrap(-1)])
+        w_other.extend(w_s)
+        assert isinstance(w_other.strategy, IntegerListStrategy)
+        assert w_other.getitems_int() == [-1] + range(n)
+        w_other.setslice(0, 1, 1, w_l)
+        assert isinstance(w_other.strategy, IntegerListStrategy)
+        assert w_other.getitems_int() == range(n) + range(n)
+
+    def test_slice_view_object_sort(self):
+        space = self.space
+        n = SLICE_VIEW_MIN_LENGTH * 2
+        w_l = W_ListObject(space, [space.wrap(str(i)) for i in range(n)] +
+                                  [space.w_None])
+        w_s = w_l.getslice(0, n, 1, n)
+        assert isinstance(w_s.strategy, ObjectSliceViewListStrategy)
+        w_s.sort(True)
+        assert not isinstance(w_s.strategy, ObjectSliceViewListStrategy)
+        assert space.unwrap(w_s) == sorted([str(i) for i in range(n)],
+                                           reverse=True)
+        assert space.unwrap(w_l.getitem(0)) == "0"
+
 class TestW_ListStrategiesDisabled:
     spaceconfig = {"objspace.std.withliststrategies": False}
 
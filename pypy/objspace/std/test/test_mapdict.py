@@ -1,11 +1,13 @@
 from pypy.objspace.std.test.test_dictmultiobject import FakeSpace, W_DictObject
 from pypy.objspace.std.mapdict import *
+import sys
 
 class Config:
     class objspace:
         class std:
             methodcachesizeexp = 11
             withmethodcachecounter = False
+            withunboxedattributes = False
 
 space = FakeSpace()
 space.config = Config
@@ -72,7 +74,7 @@ def test_huge_chain():
 
 
 def test_search():
-    aa = PlainAttribute("b", DICT, PlainAttribute("a", DICT, Terminator(None, None)))
+    aa = PlainAttribute("b", DICT, PlainAttribute("a", DICT, Terminator(space, None)))
     assert aa.search(DICT) is aa
     assert aa.search(SLOTS_STARTING_FROM) is None
     assert aa.search(SPECIAL) is None
@@ -529,6 +531,135 @@ def test_size_prediction():
                 obj.setdictvalue(space, a, 50)
         assert c.terminator.size_estimate() in [(i + 10) // 2, (i + 11) // 2]
 
+# ___________________________________________________________
+# unboxed attributes
+
+from pypy.objspace.std.intobject import W_IntObject
+from pypy.objspace.std.floatobject import W_FloatObject
+
+class UnboxingConfig:
+    class objspace:
+        class std:
+            methodcachesizeexp = 11
+            withmethodcachecounter = False
+            withunboxedattributes = True
+
+class UnboxingSpace(FakeSpace):
+    config = UnboxingConfig
+    def newint(self, intval):
+        return W_IntObject(intval)
+    def newfloat(self, floatval):
+        return W_FloatObject(floatval)
+
+unboxing_space = UnboxingSpace()
+
+def test_unboxed_attributes():
+    cls = Class()
+    cls.terminator = DictTerminator(unboxing_space, cls)
+    obj = cls.instantiate(unboxing_space)
+    obj.setdictvalue(unboxing_space, "a", W_IntObject(-42))
+    obj.setdictvalue(unboxing_space, "b", "boxed")
+    obj.setdictvalue(unboxing_space, "c", W_FloatObject(1.5))
+    obj.setdictvalue(unboxing_space, "d", W_IntObject(sys.maxint))
+    # the three numbers share one UnboxedStorage
+    assert obj.map.length() == 2
+    assert isinstance(obj.map, UnboxedPlainAttribute)
+    assert len(obj.storage) == 2
+    w_storage = obj.storage[0]
+    assert isinstance(w_storage, UnboxedStorage)
+    assert len(w_storage.values) == 3
+    assert obj.storage[1] == "boxed"
+    #
+    def check(a, c, d):
+        w_a = obj.getdictvalue(unboxing_space, "a")
+        w_c = obj.getdictvalue(unboxing_space, "c")
+        w_d = obj.getdictvalue(unboxing_space, "d")
+        assert type(w_a) is W_IntObject and w_a.intval == a
+        assert type(w_c) is W_FloatObject and w_c.floatval == c
+        assert type(w_d) is W_IntObject and w_d.intval == d
+        assert obj.getdictvalue(unboxing_space, "b") == "boxed"
+    check(-42, 1.5, sys.maxint)
+    #
+    # writing values of the same type doesn't change the map
+    map = obj.map
+    obj.setdictvalue(unboxing_space, "a", W_IntObject(7))
+    obj.setdictvalue(unboxing_space, "c", W_FloatObject(-0.0))
+    assert obj.map is map
+    assert obj.storage[0] is w_storage
+    check(7, -0.0, sys.maxint)
+    #
+    # a second instance gets the same maps
+    obj2 = cls.instantiate(unboxing_space)
+    obj2.setdictvalue(unboxing_space, "a", W_IntObject(1))
+    obj2.setdictvalue(unboxing_space, "b", "boxed")
+    obj2.setdictvalue(unboxing_space, "c", W_FloatObject(2.5))
+    obj2.setdictvalue(unboxing_space, "d", W_IntObject(3))
+    assert obj2.map is map
+
+def test_unboxed_attributes_type_change():
+    cls = Class()
+    cls.terminator = DictTerminator(unboxing_space, cls)
+    obj = cls.instantiate(unboxing_space)
+    obj.setdictvalue(unboxing_space, "a", W_IntObject(1))
+    obj.setdictvalue(unboxing_space, "b", W_IntObject(2))
+    obj2 = cls.instantiate(unboxing_space)
+    obj2.setdictvalue(unboxing_space, "a", W_IntObject(3))
+    obj2.setdictvalue(unboxing_space, "b", W_IntObject(4))
+    assert obj.map is obj2.map
+    assert cls.terminator.allow_unboxing
+    #
+    # a float written to an int attribute: the object devolves to boxed
+    # storage, and the class stops unboxing
+    obj.setdictvalue(unboxing_space, "a", W_FloatObject(1.5))
+    assert not cls.terminator.allow_unboxing
+    assert type(obj.map) is PlainAttribute
+    assert type(obj.map.back) is PlainAttribute
+    assert obj.getdictvalue(unboxing_space, "a").floatval == 1.5
+    assert obj.getdictvalue(unboxing_space, "b").intval == 2
+    #
+    # the other existing instance keeps working
+    assert obj2.getdictvalue(unboxing_space, "a").intval == 3
+    obj2.setdictvalue(unboxing_space, "b", W_IntObject(5))
+    assert obj2.getdictvalue(unboxing_space, "b").intval == 5
+    obj2.setdictvalue(unboxing_space, "b", "x")
+    assert obj2.map is obj.map
+    assert obj2.getdictvalue(unboxing_space, "a").intval == 3
+    assert obj2.getdictvalue(unboxing_space, "b") == "x"
+    #
+    # new instances don't unbox any more
+    obj3 = cls.instantiate(unboxing_space)
+    obj3.setdictvalue(unboxing_space, "a", W_IntObject(6))
+    obj3.setdictvalue(unboxing_space, "b", W_IntObject(7))
+    assert obj3.map is obj.map
+
+def test_unboxed_attributes_delete_and_reorder():
+    cls = Class()
+    cls.terminator = DictTerminator(unboxing_space, cls)
+    obj = cls.instantiate(unboxing_space)
+    obj.setdictvalue(unboxing_space, "a", W_IntObject(1))
+    obj.setdictvalue(unboxing_space, "b", "b")
+    obj.setdictvalue(unboxing_space, "c", W_FloatObject(3.5))
+    obj2 = cls.instantiate(unboxing_space)
+    obj2.setdictvalue(unboxing_space, "c", W_FloatObject(4.5))
+    obj2.setdictvalue(unboxing_space, "a", W_IntObject(2))
+    obj2.setdictvalue(unboxing_space, "b", "bb")
+    # reordered into the same map
+    assert obj2.map is obj.map
+    assert obj2.getdictvalue(unboxing_space, "a").intval == 2
+    assert obj2.getdictvalue(unboxing_space, "c").floatval == 4.5
+    #
+    obj.deldictvalue(unboxing_space, "a")
+    assert obj.getdictvalue(unboxing_space, "a") is None
+    assert obj.getdictvalue(unboxing_space, "b") == "b"
+    assert obj.getdictvalue(unboxing_space, "c").floatval == 3.5
+    assert obj.map.find_map_attr("c", DICT).firstunboxed
+    #
+    d = {}
+    materialize_str_dict(unboxing_space, obj2, d)
+    assert d["a"].intval == 2
+    assert d["b"] == "bb"
+    assert d["c"].floatval == 4.5
+
 # ___________________________________________________________
 # dict tests
 
@@ -898,6 +1029,79 @@ class AppTestWithMapDict(object):
         assert list(__pypy__.reversed_dict(d)) == d.keys()[::-1]
 
 
+class AppTestWithUnboxedAttributes(object):
+    spaceconfig = {"objspace.std.withunboxedattributes": True}
+
+    def test_int_float_attributes(self):
+        import sys
+        class A(object):
+            def __init__(self, x, y):
+                self.x = x
+                self.y = y
+                self.name = "a"
+        a = A(1, 2.5)
+        for i in range(100):
+            a.x += 1
+            a.y *= 2.0
+        assert a.x == 101
+        assert a.y == 2.5 * 2.0 ** 100
+        assert a.name == "a"
+        a.x = -sys.maxint - 1
+        assert a.x == -sys.maxint - 1
+        a.y = float("nan")
+        assert a.y != a.y
+        a.y = float("-inf")
+        assert a.y == float("-inf")
+        assert a.__dict__ == {"x": -sys.maxint - 1, "y": float("-inf"),
+                              "name": "a"}
+
+    def test_type_change(self):
+        class A(object):
+            pass
+        a = A()
+        a.x = 1
+        b = A()
+        b.x = 2
+        a.x = 1.5
+        assert a.x == 1.5
+        assert b.x == 2
+        b.x = 2L
+        assert b.x == 2L and type(b.x) is long
+        class MyInt(int):
+            pass
+        b.x = MyInt(5)
+        assert type(b.x) is MyInt
+        a.x = True
+        assert a.x is True
+
+    def test_load_attr_cache(self):
+        class A(object):
+            pass
+        def f(a):
+            return a.x + a.y
+        a = A()
+        a.x = 40
+        a.y = 2
+        for i in range(10):
+            assert f(a) == 42
+        a.x = 40.0
+        for i in range(10):
+            assert f(a) == 42.0
+
+    def test_storage_not_visible_to_gc_module(self):
+        import gc
+        class A(object):
+            pass
+        a = A()
+        a.x = 12345
+        a.y = 2.5
+        for w_obj in gc.get_referents(a):
+            # the UnboxedStorage is skipped, like any W_Root without a
+            # typedef; type() of it would crash the interpreter
+            type(w_obj)
+        assert A in gc.get_referents(a)
+
+
 class AppTestWithMapDictAndCounters(object):
     spaceconfig = {"objspace.std.withmethodcachecounter": True}
 
@@ -81,7 +81,7 @@ class TestW_SetObject:
     def test_create_set_from_list(self):
         from pypy.interpreter.baseobjspace import W_Root
         from pypy.objspace.std.setobject import BytesSetStrategy, ObjectSetStrategy, UnicodeSetStrategy
-        from pypy.objspace.std.floatobject import W_FloatObject
+        from pypy.objspace.std.setobject import FloatSetStrategy
 
         w = self.space.wrap
         wb = self.space.newbytes
@@ -118,9 +118,8 @@ class TestW_SetObject:
         w_list = W_ListObject(self.space, [w(1.0), w(2.0), w(3.0)])
         w_set = W_SetObject(self.space)
         _initialize_set(self.space, w_set, w_list)
-        assert w_set.strategy is self.space.fromcache(ObjectSetStrategy)
-        for item in w_set.strategy.unerase(w_set.sstorage):
-            assert isinstance(item, W_FloatObject)
+        assert w_set.strategy is self.space.fromcache(FloatSetStrategy)
+        assert w_set.strategy.unerase(w_set.sstorage) == {1.0:None, 2.0:None, 3.0:None}
 
         # changed cached object, need to change it back for other tests to pass
         intstr.get_storage_from_list = tmp_func
@@ -1032,6 +1031,39 @@ class AppTestAppSetTest:
         s.intersection_update(set())
         assert strategy(s) == "EmptySetStrategy"
 
+    def test_float_strategy(self):
+        from __pypy__ import strategy
+        s = set()
+        s.add(1.5)
+        assert strategy(s) == "FloatSetStrategy"
+        s = set([1.5, 2.5, -0.0])
+        assert strategy(s) == "FloatSetStrategy"
+        assert 0.0 in s
+        assert 1.5 in s and 3.5 not in s
+        assert strategy(s) == "FloatSetStrategy"
+        assert len(s | set([0.0])) == 3
+        assert sorted(s & set([1.5, 7.5])) == [1.5]
+        assert s == set([1.5, 2.5, 0.0])
+        assert s != set(["1.5", 2.5, 0.0])
+        assert sorted(s) == [-0.0, 1.5, 2.5]
+        assert 1 not in s and 0 in s
+        assert strategy(s) == "ObjectSetStrategy"
+        #
+        nan = float('nan')
+        s = set([1.5, nan])
+        assert strategy(s) == "ObjectSetStrategy"
+        assert nan in s
+        s = set([1.5])
+        s.add(nan)
+        assert strategy(s) == "ObjectSetStrategy"
+        assert nan in s and len(s) == 2
+        #
+        s = set([1.0, 2.0])
+        assert set([1, 2]) == s
+        assert s == set([1, 2])
+        assert frozenset(s) == frozenset([1, 2])
+        assert not set(["a"]) & s
+
     def test_weird_exception_from_iterable(self):
         def f():
            raise ValueError
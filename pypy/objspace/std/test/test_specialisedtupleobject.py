@@ -19,6 +19,14 @@ class TestW_SpecialisedTupleObject():
         w_tuple = self.space.newtuple([self.space.wrap({})])
         assert not 'W_SpecialisedTupleObject' in type(w_tuple).__name__
 
+    def test_isspecialisedtupleobjectints(self):
+        w_tuple = self.space.newtuple([self.space.wrap(i) for i in range(5)])
+        assert isinstance(w_tuple, W_SpecialisedTupleObject_ints)
+        assert w_tuple.values == [0, 1, 2, 3, 4]
+        w_tuple = self.space.newtuple([self.space.wrap(1.5)] * 3)
+        assert isinstance(w_tuple, W_SpecialisedTupleObject_floats)
+        assert w_tuple.values == [1.5, 1.5, 1.5]
+
     def test_specialisedtupleclassname(self):
         w_tuple = self.space.newtuple([self.space.wrap(1), self.space.wrap(2)])
         assert w_tuple.__class__.__name__ == 'W_SpecialisedTupleObject_ii'
@@ -49,7 +57,11 @@ class TestW_SpecialisedTupleObject():
         hash_test([1, (1, 2)])
         hash_test([1, ('a', 2)])
         hash_test([1, ()])
-        hash_test([1, 2, 3], must_be_specialized=False)
+        hash_test([1, 2, 3])
+        hash_test([1.5, 2.5, 3.5])
+        hash_test([-1, -1, -1, -1])
+        hash_test([1 << 62, 0, -5])
+        hash_test([1, 2, 'a'], must_be_specialized=False)
         hash_test([1 << 62, 0])
 
     try:
@@ -101,9 +113,53 @@ class AppTestW_SpecialisedTupleObject:
         assert len(t) == 2
 
     def test_notspecialisedtuple(self):
-        assert not self.isspecialised((42, 43, 44, 45))
+        assert not self.isspecialised((42, 43, 44, 4.5))
+        assert not self.isspecialised(("a", "b", "c"))
         assert not self.isspecialised((1.5,))
 
+    def test_homogeneous(self):
+        assert self.isspecialised((42, 43, 44, 45), '_ints')
+        assert self.isspecialised(tuple(range(100)), '_ints')
+        assert self.isspecialised((1.5, 2.5, 3.5), '_floats')
+        t = tuple([i * 0.5 for i in range(20)])
+        assert self.isspecialised(t, '_floats')
+        assert len(t) == 20
+        assert t[3] == 1.5 and t[-1] == 9.5
+        raises(IndexError, "t[20]")
+        raises(IndexError, "t[-21]")
+        assert t[2:5] == (1.0, 1.5, 2.0)
+        assert list(t) == [i * 0.5 for i in range(20)]
+        assert 2.0 in t and 2.25 not in t
+        assert t.index(2.0) == 4
+
+    def test_homogeneous_eq_hash(self):
+        a = (1, 2, 3, 4)
+        b = tuple([1, 2, 3, 4])
+        assert a == b and not a != b
+        assert hash(a) == hash(b)
+        assert a == (1L, 2L, 3L, 4L) == (1.0, 2.0, 3.0, 4.0)
+        assert hash(a) == hash((1L, 2L, 3L, 4L)) == hash((1.0, 2.0, 3.0, 4.0))
+        assert hash(a) == hash((1, 2, 3, 4L))
+        assert a != (1, 2, 3) and a != (1, 2, 3, 5)
+        x = (-1, -1, -1)
+        assert hash(x) == hash(tuple([-1L, -1, -1]))
+        f = (0.5, -0.0, 1e100)
+        assert f == (0.5, 0.0, 1e100)
+        assert hash(f) == hash((0.5, 0.0, 1e100))
+        assert hash(f) == hash((0.5, 0, 1e100))
+        d = {a: 'a', f: 'f'}
+        assert d[(1, 2, 3, 4)] == 'a'
+        assert d[(1.0, 2, 3, 4)] == 'a'
+        assert d[(0.5, 0.0, 1e100)] == 'f'
+        assert (1, 2, 3) < (1, 2, 4) and (1.5, 2.5, 3.5) > (1.5, 2.5)
+
+    def test_homogeneous_nans(self):
+        N = float('nan')
+        T = (N, N, N)
+        assert N in T
+        assert T == (N, N, N)
+        assert T == tuple([N, N, N])
+
     def test_slicing_to_specialised(self):
         t = (1, 2, 3)
         assert self.isspecialised(t[0:2])
@@ -226,8 +282,8 @@ class AppTestW_SpecialisedTupleObject:
         assert a == (2.2,) + b
         assert not a != (2.2,) + b
         #
-        if not self.isspecialised((1, 2, 3)):
-            skip("don't have specialization for 3-tuples")
+        if not self.isspecialised((1, 2, '3')):
+            skip("don't have specialization for mixed 3-tuples")
         a = (1, 2.2, '333')
         assert self.isspecialised(a)
         assert len(a) == 3
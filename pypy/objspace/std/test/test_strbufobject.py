@@ -0,0 +1,98 @@
+from pypy.objspace.std.bytesobject import STRBUF_MIN_LENGTH
+from pypy.objspace.std.strbufobject import W_StringBufferObject
+from pypy.objspace.std.test import test_bytesobject
+
+
+class TestW_StringBufferObject:
+    spaceconfig = {"objspace.std.withstrbuf": True}
+
+    def test_small_results_stay_flat(self):
+        space = self.space
+        w_s = space.add(space.newbytes("a"), space.newbytes("b"))
+        assert not isinstance(w_s, W_StringBufferObject)
+        assert space.bytes_w(w_s) == "ab"
+
+    def test_shares_builder(self):
+        space = self.space
+        w_s = space.add(space.newbytes("x" * STRBUF_MIN_LENGTH),
+                        space.newbytes("y"))
+        assert isinstance(w_s, W_StringBufferObject)
+        w_t = space.add(w_s, space.newbytes("z"))
+        assert isinstance(w_t, W_StringBufferObject)
+        assert w_t.builder is w_s.builder
+        # the builder is already longer than w_s: adding to w_s again
+        # must not see the "z"
+        w_u = space.add(w_s, space.newbytes("w"))
+        assert w_u.builder is not w_s.builder
+        assert space.bytes_w(w_s) == "x" * STRBUF_MIN_LENGTH + "y"
+        assert space.bytes_w(w_t) == "x" * STRBUF_MIN_LENGTH + "yz"
+        assert space.bytes_w(w_u) == "x" * STRBUF_MIN_LENGTH + "yw"
+        assert space.len_w(w_t) == STRBUF_MIN_LENGTH + 2
+
+
+class AppTestStringObject(test_bytesobject.AppTestBytesObject):
+    spaceconfig = {"objspace.std.withstrbuf": True}
+
+    def test_basic(self):
+        import __pypy__
+        # cannot do "Hello, " + "World!" because cpy2.5 optimises this
+        # away on AST level
+        s = "Hello, " * 10
+        s += "World!"
+        assert type(s) is str
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(s)
+        assert s == "Hello, " * 10 + "World!"
+
+    def test_add_twice(self):
+        x = "a" * 100
+        y = x + "b"
+        c = x + "c"
+        assert c == "a" * 100 + "c"
+        assert y == "a" * 100 + "b"
+
+    def test_loop(self):
+        s = ""
+        for i in range(1000):
+            s += str(i)
+        assert s == "".join([str(i) for i in range(1000)])
+        assert len(s) == len("".join([str(i) for i in range(1000)]))
+
+    def test_compare(self):
+        a = "a" * 100
+        b = "a" * 99
+        b += "a"
+        c = "a" * 99
+        c += "b"
+        assert a == b
+        assert b == a
+        assert b == b
+        assert a != c
+        assert c != a
+        assert b < c
+        assert c > b
+        assert b <= b and b >= b
+        assert "a" + b == "a" * 101
+
+    def test_methods(self):
+        s = "hello world " * 10
+        s += "!"
+        assert s.upper() == ("hello world " * 10 + "!").upper()
+        assert s.count("o") == 20
+        assert s.endswith("!")
+        assert s[0] == "h"
+        assert s[-1] == "!"
+        assert hash(s) == hash("hello world " * 10 + "!")
+        assert {s: 42}["hello world " * 10 + "!"] == 42
+        assert "%s" % s == s
+        assert "{0}".format(s) == s
+        assert s.find("x") == -1
+        assert s in ("hello world " * 10 + "!x")
+
+    def test_add_other_types(self):
+        s = "x" * 100
+        s += "y"
+        assert s + u"z" == u"x" * 100 + u"yz"
+        assert type(s + u"z") is unicode
+        assert s + bytearray("z") == bytearray("x" * 100 + "yz")
+        raises(TypeError, "s + 42")
+        raises(TypeError, "s + buffer('z')")
@@ -66,6 +66,7 @@ class Bytecode:
         if hasattr(co, "co_consts"):
             return [repr(c) for c in co.co_consts]
 
+        co.load_lazy_consts()
         if space is None:
             return [repr(c) for c in co.co_consts_w]
         
@@ -20,6 +20,7 @@ from rpython.jit.backend.llsupport.descr import (
 from rpython.jit.backend.llsupport.memcpy import memset_fn
 from rpython.jit.backend.llsupport import asmmemmgr, codemap
 from rpython.rlib.unroll import unrolling_iterable
+from rpython.rlib.rarithmetic import intmask
 
 
 class AbstractLLCPU(AbstractCPU):
@@ -103,6 +104,9 @@ class AbstractLLCPU(AbstractCPU):
     def setup(self):
         pass
 
+    def get_code_size(self):
+        return intmask(self.asmmemmgr.get_stats()[1])
+
     def finish_once(self):
         if self.HAS_CODEMAP:
             self.codemap.finish_once()
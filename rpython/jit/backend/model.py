@@ -44,6 +44,12 @@ class AbstractCPU(object):
         """
         raise NotImplementedError
 
+    def get_code_size(self):
+        """ Return the number of bytes currently allocated for the machine
+        code and data of the compiled loops and bridges, or 0 if unknown.
+        """
+        return 0
+
     def set_debug(self, value):
         """ Enable or disable debugging info. Does nothing by default. Returns
         the previous setting.
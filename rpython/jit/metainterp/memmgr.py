@@ -2,6 +2,7 @@ import math
 from rpython.rlib.rarithmetic import r_int64
 from rpython.rlib.debug import debug_start, debug_print, debug_stop
 from rpython.rlib.objectmodel import we_are_translated
+from rpython.rlib import listsort
 
 #
 # Logic to decide which loops are old and not used any more.
@@ -19,6 +20,12 @@ from rpython.rlib.objectmodel import we_are_translated
 # 'generation' field is much smaller than the current generation, and
 # removed from the set.
 #
+# Additionally, if the 'max_code_size' parameter is set, we remove from
+# 'alive_loops' the loops that were entered the longest time ago as soon
+# as the backend reports more machine code than that.
+#
+
+GenerationSort = listsort.make_timsort_class()
 
 class MemoryManager(object):
 
@@ -38,6 +45,8 @@ class MemoryManager(object):
         self.current_generation = r_int64(1)
         self.next_check = r_int64(-1)
         self.alive_loops = {}
+        self.max_code_size = 0
+        self.next_code_size_check = r_int64(0)
 
     def set_max_age(self, max_age, check_frequency=0):
         if max_age <= 0:
@@ -49,11 +58,17 @@ class MemoryManager(object):
             self.check_frequency = check_frequency
             self.next_check = self.current_generation + 1
 
-    def next_generation(self):
+    def set_max_code_size(self, max_code_size):
+        self.max_code_size = max(max_code_size, 0)
+
+    def next_generation(self, code_size=0):
         self.current_generation += 1
         if self.current_generation == self.next_check:
             self._kill_old_loops_now()
             self.next_check = self.current_generation + self.check_frequency
+        if (self.max_code_size > 0 and code_size > self.max_code_size and
+                self.current_generation >= self.next_code_size_check):
+            self._kill_least_recently_entered_loops(code_size)
 
     def keep_loop_alive(self, looptoken):
         if looptoken.generation != self.current_generation:
@@ -81,3 +96,33 @@ class MemoryManager(object):
             # a single one is not enough for all tests :-(
             rgc.collect(); rgc.collect(); rgc.collect()
         debug_stop("jit-mem-collect")
+
+    def _kill_least_recently_entered_loops(self, code_size):
+        # We don't know how big each loop is, so we assume that they are
+        # all of the same size, and forget enough of the loops that were
+        # entered the longest time ago to go down to 3/4 of max_code_size.
+        # The memory is only released once the GC frees the loop tokens,
+        # so we don't check again before that many new loops and bridges
+        # have been compiled.
+        debug_start("jit-mem-collect")
+        oldtotal = len(self.alive_loops)
+        debug_print("Current generation:", self.current_generation)
+        debug_print("Code size:", code_size, "max:", self.max_code_size)
+        debug_print("Loop tokens before:", oldtotal)
+        target = self.max_code_size - self.max_code_size // 4
+        tokill = oldtotal - int(oldtotal * (float(target) / code_size))
+        if tokill > 0:
+            generations = [looptoken.generation
+                           for looptoken in self.alive_loops]
+            GenerationSort(generations).sort()
+            max_generation = generations[tokill - 1]
+            for looptoken in self.alive_loops.keys():
+                if (looptoken.generation <= max_generation or
+                    looptoken.invalidated):
+                    del self.alive_loops[looptoken]
+        newtotal = len(self.alive_loops)
+        debug_print("Loop tokens freed: ", oldtotal - newtotal)
+        debug_print("Loop tokens left:  ", newtotal)
+        self.next_code_size_check = (self.current_generation +
+                                     max(oldtotal - newtotal, 1))
+        debug_stop("jit-mem-collect")
@@ -1972,7 +1972,8 @@ class MetaInterpStaticData(object):
     def try_to_free_some_loops(self):
         # Increase here the generation recorded by the memory manager.
         if self.warmrunnerdesc is not None:       # for tests
-            self.warmrunnerdesc.memory_manager.next_generation()
+            self.warmrunnerdesc.memory_manager.next_generation(
+                self.cpu.get_code_size())
 
     # ---------------- logging ------------------------
 
@@ -2372,7 +2373,12 @@ class MetaInterp(object):
                     self.staticdata.logger_ops._make_log_operations(
                         self.box_names_memo),
                     self.history.trace.unpack()[1])
-            if self.aborted_tracing_jitdriver is not None:
+            if self.aborted_tracing_jitdriver is None:
+                # nothing was blamed for the abort: back off from
+                # tracing this loop again (see 'abort_backoff')
+                if isinstance(self.resumekey, compile.ResumeFromInterpDescr):
+                    jd_sd.warmstate.tracing_aborted(greenkey)
+            else:
                 jd_sd = self.aborted_tracing_jitdriver
                 greenkey = self.aborted_tracing_greenkey
                 if hooks.are_hooks_enabled():
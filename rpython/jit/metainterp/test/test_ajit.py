@@ -2871,6 +2871,38 @@ class BasicTests:
         finally:
             optimizeopt.optimize_trace = old_optimize_trace
 
+    def test_abort_backoff(self):
+        from rpython.jit.metainterp.optimize import InvalidLoop
+        from rpython.jit.metainterp import optimizeopt
+        myjitdriver = JitDriver(greens = [], reds = ['n', 'i'])
+        #
+        def f(n, backoff):
+            set_param(myjitdriver, 'threshold', 5)
+            set_param(myjitdriver, 'abort_backoff', backoff)
+            i = 0
+            while i < n:
+                myjitdriver.jit_merge_point(n=n, i=i)
+                print i
+                i += 1
+            return i
+        #
+        def my_optimize_trace(*args, **kwds):
+            raise InvalidLoop
+        old_optimize_trace = optimizeopt.optimize_trace
+        optimizeopt.optimize_trace = my_optimize_trace
+        try:
+            res = self.meta_interp(f, [100, 0])
+            assert res == 100
+            self.check_trace_count(0)
+            self.check_aborted_count(17)
+            #
+            res = self.meta_interp(f, [100, 2])
+            assert res == 100
+            self.check_trace_count(0)
+            self.check_aborted_count(6)
+        finally:
+            optimizeopt.optimize_trace = old_optimize_trace
+
     def test_max_unroll_loops_retry_without_unroll(self):
         from rpython.jit.metainterp.optimize import InvalidLoop
         from rpython.jit.metainterp import optimizeopt
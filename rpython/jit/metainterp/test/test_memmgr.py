@@ -78,6 +78,36 @@ class _TestMemoryManager:
             else:
                 assert tokens[i] in memmgr.alive_loops
 
+    def test_max_code_size(self):
+        memmgr = MemoryManager()
+        memmgr.set_max_age(0)
+        memmgr.set_max_code_size(1000)
+        tokens = [FakeLoopToken() for i in range(10)]
+        for token in tokens:
+            memmgr.keep_loop_alive(token)
+            memmgr.next_generation(800)
+        assert memmgr.alive_loops == dict.fromkeys(tokens)
+        memmgr.keep_loop_alive(tokens[0])
+        # too much code: forget the half of the loops that were entered
+        # the longest time ago
+        memmgr.next_generation(1500)
+        assert memmgr.alive_loops == dict.fromkeys([tokens[0]] + tokens[6:])
+        # the memory is not released yet, but we don't check again so soon
+        for i in range(4):
+            memmgr.next_generation(1500)
+        assert len(memmgr.alive_loops) == 5
+        memmgr.next_generation(1500)
+        assert memmgr.alive_loops == dict.fromkeys([tokens[0]] + tokens[9:])
+
+    def test_max_code_size_disabled(self):
+        memmgr = MemoryManager()
+        memmgr.set_max_age(0)
+        tokens = [FakeLoopToken() for i in range(10)]
+        for token in tokens:
+            memmgr.keep_loop_alive(token)
+            memmgr.next_generation(10**9)
+        assert memmgr.alive_loops == dict.fromkeys(tokens)
+
 
 class _TestIntegration(LLJitMixin):
     # See comments in TestMemoryManager.  To get temporarily the normal
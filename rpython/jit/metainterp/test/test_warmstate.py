@@ -212,3 +212,16 @@ def test_make_jitdriver_callbacks_5():
     state.make_jitdriver_callbacks()
     res = state.can_never_inline(5, 42.5)
     assert res is True
+
+def test_backed_off_jitcell_is_kept():
+    from rpython.jit.metainterp.warmstate import BaseJitCell
+    class FakeToken:
+        invalidated = False
+    cell = BaseJitCell()
+    cell.trace_aborts = 2
+    assert not cell.should_remove_jitcell()
+    token = FakeToken()
+    cell.set_procedure_token(token)
+    assert not cell.should_remove_jitcell()
+    del token
+    assert cell.should_remove_jitcell()
@@ -5,7 +5,7 @@ from rpython.jit.codewriter import support, heaptracker, longlong
 from rpython.jit.metainterp import resoperation, history, jitexc
 from rpython.rlib.debug import debug_start, debug_stop, debug_print
 from rpython.rlib.debug import have_debug_prints_for
-from rpython.rlib.jit import PARAMETERS
+from rpython.rlib.jit import PARAMETERS, Counters
 from rpython.rlib.rjitlog import rjitlog as jl
 from rpython.rlib.nonconst import NonConstant
 from rpython.rlib.objectmodel import specialize, we_are_translated, r_dict
@@ -184,8 +184,16 @@ class BaseJitCell(object):
         this particular function.  (We only set this flag when aborting
         due to a trace too long, so we use the same flag as a hint to
         also mean "please trace from here as soon as possible".)
+
+    Additionally, 'trace_aborts' counts how many times tracing from this
+    greenkey was aborted (up to the 'abort_backoff' parameter).  As long
+    as the JitCell is around, the JitCounter is ticked with an increment
+    divided by 2**trace_aborts, so that we don't keep paying for tracing
+    a loop that always aborts.  Such a JitCell is kept until a loop is
+    compiled from it, otherwise removing it would reset the backoff.
     """
     flags = 0     # JC_xxx flags
+    trace_aborts = 0
     wref_procedure_token = None
     next = None
 
@@ -220,6 +228,9 @@ class BaseJitCell(object):
             # we no longer have one, then remove me.  this prevents this
             # JitCell from being immortal.
             return self.has_seen_a_procedure_token()     # i.e. dead weakref
+        if self.trace_aborts > 0:
+            # same logic: keep the backoff until we get a procedure_token
+            return self.has_seen_a_procedure_token()
         return True   # Other JitCells can be removed.
 
 # ____________________________________________________________
@@ -289,6 +300,15 @@ class WarmEnterState(object):
             self.warmrunnerdesc.memory_manager is not None):   # all for tests
             self.warmrunnerdesc.memory_manager.set_max_age(value)
 
+    def set_param_max_code_size(self, value):
+        # note: it's a global parameter, not a per-jitdriver one
+        if (self.warmrunnerdesc is not None and
+            self.warmrunnerdesc.memory_manager is not None):   # all for tests
+            self.warmrunnerdesc.memory_manager.set_max_code_size(value)
+
+    def set_param_abort_backoff(self, value):
+        self.abort_backoff = value
+
     def set_param_retrace_limit(self, value):
         if self.warmrunnerdesc:
             if self.warmrunnerdesc.memory_manager:
@@ -318,6 +338,15 @@ class WarmEnterState(object):
     def set_param_vec_cost(self, ivalue):
         self.vec_cost = ivalue
 
+    def tracing_aborted(self, greenkey):
+        """Tracing from 'greenkey' was aborted for one of the ABORT_xxx
+        reasons, with nothing else done about it: raise the threshold of
+        that loop, up to 'abort_backoff' times."""
+        cell = self.JitCell.get_jit_cell_at_key(greenkey)
+        if cell is not None and cell.trace_aborts < self.abort_backoff:
+            cell.trace_aborts += 1
+            self.profiler.count(Counters.ABORT_BACKOFF)
+
     def disable_noninlinable_function(self, greenkey):
         cell = self.JitCell.ensure_jit_cell_at_key(greenkey)
         cell.flags |= JC_DONT_TRACE_HERE
@@ -480,6 +509,14 @@ class WarmEnterState(object):
                         if tick:
                             bound_reached(hash, cell, *args)
                         return
+                if (cell.trace_aborts > 0 and
+                        not cell.has_seen_a_procedure_token()):
+                    # tracing from here was aborted before: count with
+                    # a smaller increment
+                    n = min(cell.trace_aborts, self.abort_backoff)
+                    if jitcounter.tick(hash, increment_threshold / (1 << n)):
+                        bound_reached(hash, cell, *args)
+                    return
                 # it was an aborted compilation, or maybe a weakref that
                 # has been freed
                 jitcounter.cleanup_chain(hash)
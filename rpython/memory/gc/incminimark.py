@@ -9,12 +9,24 @@ Environment variables can be used to fine-tune the following parameters:
  PYPY_GC_NURSERY_DEBUG   If set to non-zero, will fill nursery with garbage,
                          to help debugging.
 
+ PYPY_GC_NURSERY_MIN     If set, the nursery is resized at runtime: it grows
+ PYPY_GC_NURSERY_MAX     when a large fraction of it survives minor
+                         collections and shrinks when very little does,
+                         staying between these two bounds.  Each one
+                         defaults to the PYPY_GC_NURSERY size.
+
  PYPY_GC_INCREMENT_STEP  The size of memory marked during the marking step.
                          Default is size of nursery * 2. If you mark it too high
                          your GC is not incremental at all. The minimum is set
                          to size that survives minor collection * 1.5 so we
                          reclaim anything all the time.
 
+ PYPY_GC_MAX_PAUSE_MS    If set, the target duration in milliseconds of a
+                         single marking step.  The size of the step is then
+                         recomputed after every step from the measured
+                         marking speed, starting from PYPY_GC_INCREMENT_STEP.
+                         Try values like '5' or '0.5'.
+
  PYPY_GC_MAJOR_COLLECT   Major collection memory factor.  Default is '1.82',
                          which means trigger a major collection when the
                          memory consumed equals 1.82 times the memory
@@ -276,6 +288,8 @@ class IncrementalMiniMarkGC(MovingGCBase):
     def __init__(self, config,
                  read_from_env=False,
                  nursery_size=32*WORD,
+                 nursery_min_size=0,
+                 nursery_max_size=0,
                  nursery_cleanup=9*WORD,
                  page_size=16*WORD,
                  arena_size=64*WORD,
@@ -291,6 +305,10 @@ class IncrementalMiniMarkGC(MovingGCBase):
         assert small_request_threshold % WORD == 0
         self.read_from_env = read_from_env
         self.nursery_size = nursery_size
+        # bounds for resizing the nursery at runtime, see
+        # _adjust_nursery_size(); if they are equal, it is never resized
+        self.nursery_min_size = nursery_min_size or nursery_size
+        self.nursery_max_size = nursery_max_size or nursery_size
 
         self.small_request_threshold = small_request_threshold
         self.major_collection_threshold = major_collection_threshold
@@ -300,6 +318,7 @@ class IncrementalMiniMarkGC(MovingGCBase):
         self.max_heap_size = 0.0
         self.max_heap_size_already_raised = False
         self.max_delta = float(r_uint(-1))
+        self.max_pause = 0.0       # in seconds; 0.0 means no pause target
         self.max_number_of_pinned_objects = 0      # computed later
         #
         self.card_page_indices = card_page_indices
@@ -444,6 +463,7 @@ class IncrementalMiniMarkGC(MovingGCBase):
             defaultsize = self.nursery_size
             minsize = 2 * (self.nonlarge_max + 1)
             self.nursery_size = minsize
+            self.nursery_min_size = self.nursery_max_size = minsize
             self.allocate_nursery()
             #
             # From there on, the GC is fully initialized and the code
@@ -464,6 +484,16 @@ class IncrementalMiniMarkGC(MovingGCBase):
                 self.debug_tiny_nursery = newsize & ~(WORD-1)
                 newsize = minsize
             #
+            nursery_min = env.read_from_env('PYPY_GC_NURSERY_MIN')
+            nursery_max = env.read_from_env('PYPY_GC_NURSERY_MAX')
+            if self.debug_tiny_nursery >= 0 or nursery_min <= 0:
+                nursery_min = newsize
+            if self.debug_tiny_nursery >= 0 or nursery_max <= 0:
+                nursery_max = newsize
+            nursery_min = max(nursery_min & ~(WORD-1), minsize)
+            nursery_max = max(nursery_max & ~(WORD-1), nursery_min)
+            newsize = min(max(newsize, nursery_min), nursery_max)
+            #
             major_coll = env.read_float_from_env('PYPY_GC_MAJOR_COLLECT')
             if major_coll > 1.0:
                 self.major_collection_threshold = major_coll
@@ -495,6 +525,10 @@ class IncrementalMiniMarkGC(MovingGCBase):
             else:
                 self.gc_increment_step = newsize * 4
             #
+            max_pause_ms = env.read_float_from_env('PYPY_GC_MAX_PAUSE_MS')
+            if max_pause_ms > 0.0:
+                self.max_pause = max_pause_ms / 1000.0
+            #
             nursery_debug = env.read_uint_from_env('PYPY_GC_NURSERY_DEBUG')
             if nursery_debug > 0:
                 self.gc_nursery_debug = True
@@ -503,6 +537,8 @@ class IncrementalMiniMarkGC(MovingGCBase):
             self._minor_collection()    # to empty the nursery
             llarena.arena_free(self.nursery)
             self.nursery_size = newsize
+            self.nursery_min_size = nursery_min
+            self.nursery_max_size = nursery_max
             self.allocate_nursery()
         #
         env_max_number_of_pinned_objects = os.environ.get('PYPY_GC_MAX_PINNED')
@@ -529,8 +565,9 @@ class IncrementalMiniMarkGC(MovingGCBase):
         return self.enabled
 
     def _nursery_memory_size(self):
+        # always reserve room for the largest nursery size we can resize to
         extra = self.nonlarge_max + 1
-        return self.nursery_size + extra
+        return max(self.nursery_size, self.nursery_max_size) + extra
 
     def _alloc_nursery(self):
         # the start of the nursery: we actually allocate a bit more for
@@ -1708,6 +1745,13 @@ class IncrementalMiniMarkGC(MovingGCBase):
         # '_trace_drag_out()'.
         any_pinned_object_from_earlier = self.any_pinned_object_kept
         self.pinned_objects_in_nursery = 0
+        #
+        # How much of the nursery was used.  When called from
+        # collect_and_reserve(), 'nursery_free' is NULL and it was full.
+        if self.nursery_free:
+            nursery_used = self.nursery_free - self.nursery
+        else:
+            nursery_used = self.nursery_size
         self.any_pinned_object_kept = False
         #
         # Before everything else, remove from 'old_objects_pointing_to_young'
@@ -1863,6 +1907,11 @@ class IncrementalMiniMarkGC(MovingGCBase):
         else:
             llarena.arena_reset(prev, self.nursery + self.nursery_size - prev, 0)
         #
+        # resize the nursery, unless there are pinned objects in it
+        if (self.nursery_max_size > self.nursery_min_size and
+                not nursery_barriers.non_empty()):
+            self._adjust_nursery_size(nursery_used)
+        #
         # always add the end of the nursery to the list
         nursery_barriers.append(self.nursery + self.nursery_size)
         #
@@ -1896,7 +1945,36 @@ class IncrementalMiniMarkGC(MovingGCBase):
         self.hooks.fire_gc_minor(
             duration=duration,
             total_memory_used=total_memory_used,
-            pinned_objects=self.pinned_objects_in_nursery)
+            pinned_objects=self.pinned_objects_in_nursery,
+            nursery_size=self.nursery_size)
+
+    # if more than this fraction of the nursery survives a minor
+    # collection, double the nursery size; if less than the other
+    # fraction survives, halve it
+    NURSERY_GROW_RATIO = 0.10
+    NURSERY_SHRINK_RATIO = 0.01
+
+    def _adjust_nursery_size(self, nursery_used):
+        # Called at the end of a minor collection, when the nursery is
+        # empty.  The memory for 'nursery_max_size' bytes is always
+        # allocated, so we only need to move the end of the nursery.
+        # If many objects survive, a bigger nursery gives them more time
+        # to die before we copy them out; if almost nothing survives, a
+        # smaller nursery is friendlier to the CPU caches.
+        if nursery_used < self.nursery_size // 2:
+            return    # forced minor collection: not a meaningful ratio
+        ratio = float(self.nursery_surviving_size) / float(nursery_used)
+        if ratio > self.NURSERY_GROW_RATIO:
+            newsize = min(self.nursery_size * 2, self.nursery_max_size)
+        elif ratio < self.NURSERY_SHRINK_RATIO:
+            newsize = max(self.nursery_size // 2, self.nursery_min_size)
+        else:
+            return
+        newsize &= ~(WORD-1)
+        if newsize != self.nursery_size:
+            debug_print("resizing nursery from", self.nursery_size,
+                        "to", newsize)
+            self.nursery_size = newsize
 
     def _reset_flag_old_objects_pointing_to_pinned(self, obj, ignore):
         ll_assert(self.header(obj).tid & GCFLAG_PINNED_OBJECT_PARENT_KNOWN != 0,
@@ -2345,6 +2423,9 @@ class IncrementalMiniMarkGC(MovingGCBase):
         #
         self.threshold_objects_made_old += r_uint(self.nursery_size // 2)
 
+        # number of bytes marked by a plain marking step, used with
+        # PYPY_GC_MAX_PAUSE_MS to calibrate 'gc_increment_step'
+        marked = 0
 
         if self.gc_state == STATE_SCANNING:
             # starting a major GC cycle: reset these two counters
@@ -2367,6 +2448,7 @@ class IncrementalMiniMarkGC(MovingGCBase):
                 estimate = estimate_from_nursery
             estimate = intmask(estimate)
             remaining = self.visit_all_objects_step(estimate)
+            marked = estimate - remaining
             #
             if remaining >= estimate // 2:
                 if self.more_objects_to_trace.non_empty():
@@ -2379,6 +2461,7 @@ class IncrementalMiniMarkGC(MovingGCBase):
                     self.objects_to_trace = self.more_objects_to_trace
                     self.more_objects_to_trace = swap
                     self.visit_all_objects()
+                    marked = 0
 
             # XXX A simplifying assumption that should be checked,
             # finalizers/weak references are rare and short which means that
@@ -2546,11 +2629,31 @@ class IncrementalMiniMarkGC(MovingGCBase):
         debug_stop("gc-collect-step")
         duration = time.time() - start
         self.total_gc_time += duration
+        if (self.max_pause > 0.0 and marked > 0 and
+                self.gc_state == STATE_MARKING):
+            self.adjust_increment_step(marked, duration)
         self.hooks.fire_gc_collect_step(
             duration=duration,
             oldstate=oldstate,
             newstate=self.gc_state)
 
+    def adjust_increment_step(self, marked, duration):
+        # Called after a marking step that marked 'marked' bytes in
+        # 'duration' seconds.  Pick the size of the next marking step
+        # such that, at the same speed, it takes 'max_pause' seconds.
+        # We shrink the step at once if it was too long, but only let
+        # it grow by a factor 2 at a time, because a single step that
+        # happened to run quickly should not give a very long next step.
+        # Note that the step is still at least 'nursery_surviving_size * 2'
+        # in major_collection_step(), otherwise the major collection
+        # might never finish.
+        if duration > 0.0:
+            new_step = float(marked) * (self.max_pause / duration)
+        else:
+            new_step = float(marked) * 2.0
+        new_step = min(new_step, float(self.gc_increment_step) * 2.0)
+        self.gc_increment_step = max(int(new_step), self.nonlarge_max + 1)
+
     def _sweep_old_objects_pointing_to_pinned(self, obj, new_list):
         if self.header(obj).tid & GCFLAG_VISITED:
             new_list.append(obj)
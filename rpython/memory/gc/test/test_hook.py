@@ -1,5 +1,6 @@
 from rpython.rtyper.lltypesystem import lltype, llmemory
 from rpython.memory.gc.hook import GcHooks
+from rpython.memory.gc.incminimark import WORD
 from rpython.memory.gc.test.test_direct import BaseDirectGCTest, S
 
 
@@ -27,11 +28,13 @@ class MyGcHooks(GcHooks):
         self.collects = []
         self.durations = []
 
-    def on_gc_minor(self, duration, total_memory_used, pinned_objects):
+    def on_gc_minor(self, duration, total_memory_used, pinned_objects,
+                    nursery_size):
         self.durations.append(duration)
         self.minors.append({
             'total_memory_used': total_memory_used,
-            'pinned_objects': pinned_objects})
+            'pinned_objects': pinned_objects,
+            'nursery_size': nursery_size})
 
     def on_gc_collect_step(self, duration, oldstate, newstate):
         self.durations.append(duration)
@@ -68,7 +71,8 @@ class TestIncMiniMarkHooks(BaseDirectGCTest):
         self.malloc(S)
         self.gc._minor_collection()
         assert self.gc.hooks.minors == [
-            {'total_memory_used': 0, 'pinned_objects': 0}
+            {'total_memory_used': 0, 'pinned_objects': 0,
+             'nursery_size': self.gc.nursery_size}
             ]
         assert self.gc.hooks.durations[0] > 0.
         self.gc.hooks.reset()
@@ -78,7 +82,8 @@ class TestIncMiniMarkHooks(BaseDirectGCTest):
         self.stackroots.append(self.malloc(S))
         self.gc._minor_collection()
         assert self.gc.hooks.minors == [
-            {'total_memory_used': self.size_of_S*2, 'pinned_objects': 0}
+            {'total_memory_used': self.size_of_S*2, 'pinned_objects': 0,
+             'nursery_size': self.gc.nursery_size}
             ]
 
     def test_on_gc_collect(self):
@@ -117,9 +122,89 @@ class TestIncMiniMarkHooks(BaseDirectGCTest):
              'rawmalloc_bytes_before': 0}
             ]
 
+    def test_nursery_resize(self):
+        self.gc.hooks._gc_minor_enabled = True
+        assert self.gc.nursery_size == 32*WORD
+        #
+        # almost everything survives: the nursery doubles up to its max
+        for i in range(40):
+            self.stackroots.append(self.malloc(S))
+        sizes = [minor['nursery_size'] for minor in self.gc.hooks.minors]
+        assert sizes[0] == 64*WORD
+        assert sizes[-1] == 128*WORD
+        assert max(sizes) == 128*WORD
+        assert sizes == sorted(sizes)
+        #
+        # nothing survives: the nursery shrinks back down to its min
+        del self.stackroots[:]
+        self.gc.hooks.reset()
+        for i in range(400):
+            self.malloc(S)
+        sizes = [minor['nursery_size'] for minor in self.gc.hooks.minors]
+        assert sizes[-1] == 16*WORD
+        assert min(sizes) == 16*WORD
+        assert sizes == sorted(sizes, reverse=True)
+        #
+        # a collection forced before the nursery is full doesn't count
+        self.gc.hooks.reset()
+        self.gc._minor_collection()
+        assert self.gc.hooks.minors[0]['nursery_size'] == 16*WORD
+    test_nursery_resize.GC_PARAMS = {'nursery_min_size': 16*WORD,
+                                     'nursery_max_size': 128*WORD}
+
     def test_hook_disabled(self):
         self.gc._minor_collection()
         self.gc.collect()
         assert self.gc.hooks.minors == []
         assert self.gc.hooks.steps == []
         assert self.gc.hooks.collects == []
+
+    def test_max_pause(self, monkeypatch):
+        from rpython.memory.gc import incminimark as m
+        from rpython.rlib import rgc
+        #
+        # a fake clock: every object visited by the marker costs 1ms
+        class FakeTime(object):
+            now = 0.0
+            def time(self):
+                return self.now
+        fake_time = FakeTime()
+        monkeypatch.setattr(m, 'time', fake_time)
+        orig_visit = self.gc.visit
+        def visit(obj):
+            fake_time.now += 0.001
+            return orig_visit(obj)
+        self.gc.visit = visit
+        #
+        # a long chain of old objects, so that marking needs many steps
+        head = self.malloc(S)
+        self.stackroots.append(head)
+        for i in range(300):
+            obj = self.malloc(S)
+            self.write(obj, 'next', self.stackroots[-1])
+            self.stackroots[-1] = obj
+        self.gc.collect()
+        #
+        # without a target, every marking step visits the same
+        # number of objects, which takes much more than 5ms
+        assert self.gc.gc_increment_step // self.size_of_S > 10
+        #
+        self.gc.max_pause = 0.005
+        self.gc.hooks._gc_collect_step_enabled = True
+        while True:
+            val = self.gc.collect_step()
+            if rgc.is_done(val):
+                break
+        marking = [self.gc.hooks.durations[i]
+                   for i, step in enumerate(self.gc.hooks.steps)
+                   if step['oldstate'] == step['newstate'] == m.STATE_MARKING]
+        assert len(marking) > 10
+        #
+        # histogram of the marking pauses, in ms: only the first step,
+        # done before anything was measured, is above the target
+        histogram = {}
+        for d in marking:
+            ms = int(round(d * 1000))
+            histogram[ms] = histogram.get(ms, 0) + 1
+        assert sum([n for ms, n in histogram.items() if ms > 5]) == 1
+        assert max(histogram) > 10
@@ -549,7 +549,10 @@ PARAMETER_DOCS = {
     'trace_limit': 'number of recorded operations before we abort tracing with ABORT_TOO_LONG',
     'inlining': 'inline python functions or not (1/0)',
     'loop_longevity': 'a parameter controlling how long loops will be kept before being freed, an estimate',
+    'max_code_size': 'number of bytes of machine code above which the least recently entered loops are freed (0=unlimited)',
     'retrace_limit': 'how many times we can try retracing before giving up',
+    'abort_backoff': 'how many times the threshold of a loop is doubled after '
+                     'its tracing was aborted (0=never)',
     'max_retrace_guards': 'number of extra guards a retrace can cause',
     'max_unroll_loops': 'number of extra unrollings a loop can cause',
     'disable_unrolling': 'after how many operations we should not unroll',
@@ -570,7 +573,9 @@ PARAMETERS = {'threshold': 1039, # just above 1024, prime
               'trace_limit': 6000,
               'inlining': 1,
               'loop_longevity': 1000,
+              'max_code_size': 0,
               'retrace_limit': 0,
+              'abort_backoff': 4,
               'max_retrace_guards': 15,
               'max_unroll_loops': 0,
               'disable_unrolling': 200,
@@ -1324,6 +1329,7 @@ class Counters(object):
     ABORT_BAD_LOOP
     ABORT_ESCAPE
     ABORT_FORCE_QUASIIMMUT
+    ABORT_BACKOFF
     NVIRTUALS
     NVHOLES
     NVREUSED
@@ -90,6 +90,23 @@ KARATSUBA_SQUARE_CUTOFF = 2 * KARATSUBA_CUTOFF
 
 FIVEARY_CUTOFF = 8
 
+# For long division, use the O(N**2) school algorithm unless both the
+# divisor and the quotient contain more than DIV_LIMIT digits.  In that
+# case, use the recursive algorithm of Burnikel and Ziegler, which turns a
+# division into multiplications of half the size (and so profits from
+# Karatsuba).  This also makes str() of huge numbers subquadratic, as
+# _format() splits them with divmod().
+if SHIFT > 31:
+    DIV_LIMIT = 64
+else:
+    DIV_LIMIT = 128
+
+# When converting a string to a number, every group of digits that fits in
+# an rbigint digit is a limb; numbers of more than PARSE_LIMBS_LIMIT limbs
+# are converted by splitting them in two halves instead of multiplying
+# and adding one limb at a time.
+PARSE_LIMBS_LIMIT = 64
+
 @specialize.argtype(0)
 def _mask_digit(x):
     return UDIGIT_MASK(x & MASK)
@@ -2047,6 +2064,8 @@ def _divrem(a, b):
     if size_b == 1:
         z, urem = _divrem1(a, b.digit(0))
         rem = rbigint([_store_digit(urem)], int(urem != 0), 1)
+    elif size_b > DIV_LIMIT and size_a - size_b > DIV_LIMIT:
+        z, rem = _divrem_big(a, b)
     else:
         z, rem = _x_divrem(a, b)
     # Set the signs.
@@ -2059,6 +2078,103 @@ def _divrem(a, b):
         rem.sign = - rem.sign
     return z, rem
 
+def _extract_digits(x, start, end):
+    """Return the digits start to end (excluded) of |x| as a new, normalized
+    rbigint, i.e. (|x| >> (start * SHIFT)) % 2 ** ((end - start) * SHIFT).
+    """
+    size = x.numdigits()
+    if end > size:
+        end = size
+    while end > start and x._digits[end - 1] == NULLDIGIT:
+        end -= 1
+    if end <= start:
+        return NULLRBIGINT
+    assert start >= 0
+    return rbigint(x._digits[start:end], 1, end - start)
+
+def _concat_digits(hi, lo, n):
+    """Return |hi| * 2 ** (n * SHIFT) + |lo|, where |lo| has at most n
+    digits."""
+    if hi.sign == 0:
+        return lo
+    size_hi = hi.numdigits()
+    z = rbigint([NULLDIGIT] * (n + size_hi), 1, n + size_hi)
+    if lo.sign != 0:
+        size_lo = lo.numdigits()
+        assert size_lo <= n
+        for i in range(size_lo):
+            z._digits[i] = lo._digits[i]
+    for i in range(size_hi):
+        z._digits[n + i] = hi._digits[i]
+    return z
+
+def _div2n1n(a, b, n):
+    """Divide a by b, where b has n digits and is normalized (its top
+    digit is >= BASE/2) and a < b * 2 ** (n * SHIFT).  This is algorithm 1
+    of Burnikel and Ziegler, "Fast Recursive Division" (1998)."""
+    if n <= DIV_LIMIT:
+        return _divrem(a, b)
+    pad = n & 1
+    if pad:
+        a = _concat_digits(a, NULLRBIGINT, 1)
+        b = _concat_digits(b, NULLRBIGINT, 1)
+        n += 1
+    half_n = n >> 1
+    b1 = _extract_digits(b, half_n, n)
+    b2 = _extract_digits(b, 0, half_n)
+    q1, r = _div3n2n(_extract_digits(a, n, a.numdigits()),
+                     _extract_digits(a, half_n, n), b, b1, b2, half_n)
+    q2, r = _div3n2n(r, _extract_digits(a, 0, half_n), b, b1, b2, half_n)
+    if pad:
+        r = _extract_digits(r, 1, r.numdigits())
+    return _concat_digits(q1, q2, half_n), r
+
+def _div3n2n(a12, a3, b, b1, b2, n):
+    """Helper for _div2n1n: divide a12 * 2 ** (n * SHIFT) + a3 by b,
+    where b = b1 * 2 ** (n * SHIFT) + b2 has 2n digits (algorithm 2)."""
+    if _extract_digits(a12, n, a12.numdigits()).eq(b1):
+        q = rbigint([_store_digit(MASK)] * n, 1, n)
+        r = a12.sub(_concat_digits(b1, NULLRBIGINT, n)).add(b1)
+    else:
+        q, r = _div2n1n(a12, b1, n)
+    r = _concat_digits(r, a3, n).sub(q.mul(b2))
+    # the estimate of q is at most two too large
+    while r.sign < 0:
+        q = q.int_sub(1)
+        r = r.add(b)
+    return q, r
+
+def _divrem_big(a, b):
+    """Unsigned division of |a| by |b|, where |b| has more than DIV_LIMIT
+    digits.  |a| is split into pieces of the size of |b|, and every step
+    of the long division by |b| is done with the recursive _div2n1n()."""
+    d = SHIFT - bits_in_digit(b.digit(b.numdigits() - 1))
+    b = b.abs().lshift(d)
+    a = a.abs().lshift(d)
+    n = b.numdigits()
+    size_a = a.numdigits()
+    nchunks = (size_a + n - 1) // n
+    size_z = nchunks * n
+    z = rbigint([NULLDIGIT] * size_z, 1, size_z)
+    r = NULLRBIGINT
+    i = nchunks - 1
+    while i >= 0:
+        start = i * n
+        q, r = _div2n1n(
+            _concat_digits(r, _extract_digits(a, start, start + n), n), b, n)
+        if q.sign != 0:
+            for j in range(q.numdigits()):
+                z._digits[start + j] = q._digits[j]
+        i -= 1
+    z._normalize()
+    r = r.rshift(d)
+    if r.sign != 0:
+        # make sure not to return a number shared with the arguments
+        r = rbigint(r._digits[:r.numdigits()], 1, r.numdigits())
+    else:
+        r = rbigint()
+    return z, r
+
 # ______________ conversions to double _______________
 
 def _AsScaledDouble(v):
@@ -2752,6 +2868,34 @@ BASE_MAX = [0, 1] + [digits_max_for_base(_base) for _base in range(2, 37)]
 DEC_MAX = digits_max_for_base(10)
 assert DEC_MAX == BASE_MAX[10]
 
+def _limbs_to_bigint(limbs, limbmax):
+    """Return the number whose digits in base 'limbmax' are the ints in
+    'limbs', most significant first."""
+    if len(limbs) <= PARSE_LIMBS_LIMIT:
+        return _limbs_to_bigint_simple(limbs, 0, len(limbs), limbmax)
+    return _limbs_to_bigint_rec(limbs, 0, len(limbs), limbmax, {})
+
+def _limbs_to_bigint_simple(limbs, start, end, limbmax):
+    a = rbigint()
+    for i in range(start, end):
+        a = _muladd1(a, limbmax, limbs[i])
+    return a
+
+def _limbs_to_bigint_rec(limbs, start, end, limbmax, powers):
+    # divide-and-conquer: hi * limbmax ** len(lo) + lo
+    if end - start <= PARSE_LIMBS_LIMIT:
+        return _limbs_to_bigint_simple(limbs, start, end, limbmax)
+    n_lo = (end - start) >> 1
+    mid = end - n_lo
+    hi = _limbs_to_bigint_rec(limbs, start, mid, limbmax, powers)
+    lo = _limbs_to_bigint_rec(limbs, mid, end, limbmax, powers)
+    if n_lo in powers:
+        power = powers[n_lo]
+    else:
+        power = rbigint.fromint(limbmax).pow(rbigint.fromint(n_lo))
+        powers[n_lo] = power
+    return hi.mul(power).add(lo)
+
 def _decimalstr_to_bigint(s):
     # a string that has been already parsed to be decimal and valid,
     # is turned into a bigint
@@ -2764,7 +2908,7 @@ def _decimalstr_to_bigint(s):
     elif s[p] == '+':
         p += 1
 
-    a = rbigint()
+    limbs = []
     tens = 1
     dig = 0
     ord0 = ord('0')
@@ -2772,10 +2916,11 @@ def _decimalstr_to_bigint(s):
         dig = dig * 10 + ord(s[p]) - ord0
         p += 1
         tens *= 10
-        if tens == DEC_MAX or p == lim:
-            a = _muladd1(a, tens, dig)
+        if tens == DEC_MAX and p < lim:
+            limbs.append(dig)
             tens = 1
             dig = 0
+    a = _muladd1(_limbs_to_bigint(limbs, DEC_MAX), tens, dig)
     if sign and a.sign == 1:
         a.sign = -1
     return a
@@ -2785,20 +2930,21 @@ def parse_digit_string(parser):
     base = parser.base
     if (base & (base - 1)) == 0 and base >= 2:
         return parse_string_from_binary_base(parser)
-    a = rbigint()
     digitmax = BASE_MAX[base]
+    limbs = []
     tens, dig = 1, 0
     while True:
         digit = parser.next_digit()
-        if tens == digitmax or digit < 0:
-            a = _muladd1(a, tens, dig)
-            if digit < 0:
-                break
+        if digit < 0:
+            break
+        if tens == digitmax:
+            limbs.append(dig)
             dig = digit
             tens = base
         else:
             dig = dig * base + digit
             tens *= base
+    a = _muladd1(_limbs_to_bigint(limbs, digitmax), tens, dig)
     a.sign *= parser.sign
     return a
 
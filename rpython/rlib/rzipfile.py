@@ -221,24 +221,41 @@ class RZipFile(object):
         x = endrec.filesize - size_cd
         concat = x - offset_cd
         self.start_dir = offset_cd + concat
+        # read the whole central directory at once and parse it from
+        # memory; the local file headers are only read when a member is
+        # read, see _get_file_offset()
         fp.seek(self.start_dir, 0)
+        cdir = fp.read(size_cd)
+        if len(cdir) < size_cd:
+            raise BadZipfile("Truncated central directory")
         total = 0
         while total < size_cd:
-            centdir = fp.read(46)
-            total = total + 46
-            if centdir[0:4] != stringCentralDir:
+            if total + 46 > size_cd:
+                raise BadZipfile("Truncated central directory")
+            if cdir[total:total+4] != stringCentralDir:
                 raise BadZipfile("Bad magic number for central directory")
-            centdir = runpack(structCentralDir, centdir)
-            filename = fp.read(centdir[_CD_FILENAME_LENGTH])
+            centdir = runpack(structCentralDir, cdir[total:total+46])
+            total += 46
+            filename_length = centdir[_CD_FILENAME_LENGTH]
+            extra_length = centdir[_CD_EXTRA_FIELD_LENGTH]
+            comment_length = centdir[_CD_COMMENT_LENGTH]
+            assert filename_length >= 0
+            assert extra_length >= 0
+            assert comment_length >= 0
+            end = total + filename_length
             # Create ZipInfo instance to store file information
-            x = RZipInfo(filename)
-            x.extra = fp.read(centdir[_CD_EXTRA_FIELD_LENGTH])
-            x.comment = fp.read(centdir[_CD_COMMENT_LENGTH])
-            total = (total + centdir[_CD_FILENAME_LENGTH]
-                     + centdir[_CD_EXTRA_FIELD_LENGTH]
-                     + centdir[_CD_COMMENT_LENGTH])
+            x = RZipInfo(cdir[total:end])
+            total = end
+            end = total + extra_length
+            x.extra = cdir[total:end]
+            total = end
+            end = total + comment_length
+            x.comment = cdir[total:end]
+            total = end
+            if total > size_cd:
+                raise BadZipfile("Truncated central directory")
             x.header_offset = centdir[_CD_LOCAL_HEADER_OFFSET] + concat
-            # file_offset must be computed below...
+            x.file_offset = -1    # computed by _get_file_offset()
             (x.create_version, x.create_system, x.extract_version, x.reserved,
                 x.flag_bits, x.compress_type, t, d,
                 crc, x.compress_size, x.file_size) = centdir[1:12]
@@ -251,24 +268,36 @@ class RZipFile(object):
                                      t>>11, (t>>5)&0x3F, (t&0x1F) * 2 )
             self.filelist.append(x)
             self.NameToInfo[x.filename] = x
-        for data in self.filelist:
-            fp.seek(data.header_offset, 0)
+
+    def _get_file_offset(self, fp, zinfo):
+        if zinfo.file_offset < 0:
+            fp.seek(zinfo.header_offset, 0)
             fheader = fp.read(30)
             if fheader[0:4] != stringFileHeader:
                 raise BadZipfile("Bad magic number for file header")
             fheader = runpack(structFileHeader, fheader)
+            fname = fp.read(fheader[_FH_FILENAME_LENGTH])
+            if fname != zinfo.orig_filename:
+                raise BadZipfile('File name in directory "%s" and '
+                    'header "%s" differ.' % (zinfo.orig_filename, fname))
             # file_offset is computed here, since the extra field for
             # the central directory and for the local file header
             # refer to different fields, and they can have different
             # lengths
-            data.file_offset = (data.header_offset + 30
-                                + fheader[_FH_FILENAME_LENGTH]
-                                + fheader[_FH_EXTRA_FIELD_LENGTH])
-            fname = fp.read(fheader[_FH_FILENAME_LENGTH])
-            if fname != data.orig_filename:
-                raise BadZipfile('File name in directory "%s" and '
-                    'header "%s" differ.' % (data.orig_filename, fname))
-        fp.seek(self.start_dir, 0)
+            zinfo.file_offset = (zinfo.header_offset + 30
+                                 + fheader[_FH_FILENAME_LENGTH]
+                                 + fheader[_FH_EXTRA_FIELD_LENGTH])
+        return zinfo.file_offset
+
+    def get_file_offset(self, zinfo):
+        """Return the offset of the data of 'zinfo' in the archive."""
+        if zinfo.file_offset >= 0:
+            return zinfo.file_offset
+        fp = self.get_fp()
+        try:
+            return self._get_file_offset(fp, zinfo)
+        finally:
+            fp.close()
 
     def getinfo(self, filename):
         """Return the instance of ZipInfo given 'filename'."""
@@ -278,10 +307,8 @@ class RZipFile(object):
         zinfo = self.getinfo(filename)
         fp = self.get_fp()
         try:
-            filepos = fp.tell()
-            fp.seek(zinfo.file_offset, 0)
+            fp.seek(self._get_file_offset(fp, zinfo), 0)
             bytes = fp.read(intmask(zinfo.compress_size))
-            fp.seek(filepos, 0)
             if zinfo.compress_type == ZIP_STORED:
                 pass
             elif zinfo.compress_type == ZIP_DEFLATED and rzlib is not None:
@@ -278,6 +278,18 @@ class Test_rbigint(object):
         assert x.tolong() == 0
         assert x.tobool() is False
 
+    def test_fromdecimalstr_long(self):
+        # more than PARSE_LIMBS_LIMIT limbs: divide-and-conquer conversion
+        s = "".join([str(i) for i in range(2000)])
+        assert rbigint.fromdecimalstr(s).tolong() == long(s)
+        assert rbigint.fromdecimalstr("-" + s).tolong() == -long(s)
+        s = "1" + "0" * 3000
+        assert rbigint.fromdecimalstr(s).tolong() == long(s)
+        assert rbigint.fromstr(s).tolong() == long(s)
+        s = "1" + "0" * 3000 + "1"
+        assert rbigint.fromstr(s, 7).tolong() == long(s, 7)
+        assert rbigint.fromstr("-" + s, 36).tolong() == -long(s, 36)
+
     def test_fromstr(self):
         from rpython.rlib.rstring import ParseStringError
         assert rbigint.fromstr('123L').tolong() == 123
@@ -864,6 +876,35 @@ class TestInternalFunctions(object):
         assert rem.tolong() == _rem
 
 
+    def test__divrem_big(self):
+        seed(42)
+        bits = lobj.DIV_LIMIT * SHIFT
+        for i in range(20):
+            y = long(randint(1 << bits, 1 << (3 * bits)))
+            x = long(randint(y << bits, y << (4 * bits)))
+            for x1 in [x, x // y * y, x // y * y - 1]:
+                div, rem = lobj._divrem_big(rbigint.fromlong(x1),
+                                            rbigint.fromlong(y))
+                assert (div.tolong(), rem.tolong()) == divmod(x1, y)
+        # the quotient digits of the recursive steps can all be MASK
+        y = (1 << (5 * bits)) - 1
+        x = (y << (2 * bits)) - 1
+        div, rem = lobj._divrem_big(rbigint.fromlong(x), rbigint.fromlong(y))
+        assert (div.tolong(), rem.tolong()) == divmod(x, y)
+
+    def test_divmod_big(self):
+        bits = lobj.DIV_LIMIT * SHIFT
+        x = 3 ** (4 * bits) + 12345
+        y = 7 ** bits
+        for sx, sy in (1, 1), (1, -1), (-1, -1), (-1, 1):
+            div, rem = rbigint.fromlong(sx * x).divmod(rbigint.fromlong(sy * y))
+            assert (div.tolong(), rem.tolong()) == divmod(sx * x, sy * y)
+
+    def test_str_big(self):
+        x = 7 ** (lobj.DIV_LIMIT * SHIFT * 2)
+        assert rbigint.fromlong(x).str() == str(x)
+        assert rbigint.fromlong(-x).repr() == repr(-x)
+
     # testing Karatsuba stuff
     def test__v_iadd(self):
         f1 = bigint([lobj.MASK] * 10, 1)
@@ -369,6 +369,11 @@ class TestUTF8Decoding(UnicodeTests):
         for s in ["\xd7\x90", "\xd6\x96", "\xeb\x96\x95", "\xf0\x90\x91\x93"]:
             self.checkdecode(s, "utf-8")
 
+    def test_ascii_runs_utf8(self):
+        for s in ["abc\xd7\x90def", "\xd7\x90abc", "abc\xeb\x96\x95",
+                  "a" * 50 + "\xf0\x90\x91\x93" + "b" * 50]:
+            self.checkdecode(s, "utf-8")
+
     def test_utf8_surrogate(self):
         # surrogates used to be allowed by python 2.x, and on narrow builds
         if runicode.MAXUNICODE < 65536:
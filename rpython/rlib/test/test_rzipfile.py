@@ -43,6 +43,15 @@ class BaseTestRZipFile(BaseRtypingTest):
         assert one()
         assert self.interpret(one, [])
 
+    def test_file_offset_computed_lazily(self):
+        rzip = RZipFile(self.zipname, "r", self.compression)
+        info = rzip.getinfo('three')
+        assert info.file_offset == -1
+        assert rzip.read('three') == 'hello, world'
+        expected = ZipFile(self.zipname).getinfo('three').header_offset + 35
+        assert info.file_offset == expected
+        assert rzip.get_file_offset(rzip.getinfo('one')) == 30 + 3
+
 class TestRZipFile(BaseTestRZipFile):
     compression = ZIP_STORED
 
@@ -250,6 +250,33 @@ def entry_point(argv):
     _time = time() - t
     sumTime += _time
     print "v = v + v", _time
+
+    t = time()
+    v4 = rbigint.pow(rbigint.fromint(7), rbigint.fromint(200000))
+    for n in xrange(20):
+        v4.str()
+
+    _time = time() - t
+    sumTime += _time
+    print "str(7**200000)", _time
+
+    t = time()
+    s = "7" * 150000
+    for n in xrange(20):
+        rbigint.fromstr(s)
+
+    _time = time() - t
+    sumTime += _time
+    print "long('7' * 150000)", _time
+
+    t = time()
+    by = rbigint.pow(rbigint.fromint(3), rbigint.fromint(100000))
+    for n in xrange(20):
+        rbigint.divmod(v4, by)
+
+    _time = time() - t
+    sumTime += _time
+    print "Div 7**200000 by 3**100000", _time
     
     print "Sum: ", sumTime
     